@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks for the CLI subcommands in src/main.py.
+
+Every (command, size) case runs in a fresh subprocess against a synthetic repo served by
+the offline fake backend, and reports wall time, GitHub calls (per request kind),
+peak RSS and a per-phase breakdown (time spent per API request kind vs. local work).
+
+    python3 benchmarks/bench_cli.py --sizes 100,1000
+    python3 benchmarks/bench_cli.py --save-baseline main
+    python3 benchmarks/bench_cli.py --compare main --tolerance 0.2
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import REPO_ROOT, compare, report_regressions, save_baseline
+
+REPO = "bench/synthetic"
+COMMANDS = ["scaffold", "import", "sync", "launch", "status"]
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+
+def prepare(command, size, workdir):
+    """Writes the fixture and input files for one case. Returns the CLI argv."""
+    from src.connectors.fake import generate_fixture
+
+    fixture = generate_fixture(repo=REPO, issues=size, seed=size)
+    issues = fixture["repos"][REPO]["issues"]
+    fixture_path = os.path.join(workdir, "repo.json")
+    common = ["--repo", REPO, "--transport", "fake", "--fixture", fixture_path]
+
+    if command == "scaffold":
+        argv = ["scaffold", "--req", "Build a CRM with REST API, React UI and OAuth login", "--out", os.path.join(workdir, "req.md")]
+    elif command == "import":
+        # Requirements are ~10% of a repo: import that many new tasks
+        path = os.path.join(workdir, "import.md")
+        with open(path, "w") as f:
+            for n in range(max(1, size // 10)):
+                f.write(f"- [ ] New requirement {n} (type:requirement, domain:api)\n")
+        argv = ["import", "--file", path] + common
+    elif command == "sync":
+        # One line per remote issue; a few local ticks and remote closures to reconcile
+        rnd = random.Random(size)
+        path = os.path.join(workdir, "tasks.md")
+        with open(path, "w") as f:
+            for issue in issues:
+                checked = "x" if issue["state"] == "closed" or rnd.random() < 0.02 else " "
+                if rnd.random() < 0.05:
+                    checked = " "
+                suffix = f" #{issue['number']}" if rnd.random() < 0.9 else ""
+                f.write(f"- [{checked}] {issue['title']}{suffix}\n")
+        argv = ["sync", "--file", path] + common
+    elif command == "launch":
+        # Close every requirement so the gate passes and the full transition runs
+        for issue in issues:
+            if any(l["name"] == "type:requirement" for l in issue["labels"]):
+                issue["state"] = "closed"
+        argv = ["launch", "--from", "requirement", "--to", "design"] + common
+    else:
+        argv = ["status", "--out", os.path.join(workdir, "REPORT.md")] + common
+
+    with open(fixture_path, "w") as f:
+        json.dump(fixture, f)
+    return argv
+
+def worker(argv):
+    """Runs one CLI invocation in this process and prints its metrics as JSON."""
+    started = time.perf_counter()
+    import src.main
+    logging.getLogger().setLevel(logging.WARNING)
+    import_s = time.perf_counter() - started
+
+    connector = src.main.main(argv)
+    wall = time.perf_counter() - started
+
+    transport = getattr(connector, "transport", None) if connector else None
+    calls = dict(getattr(transport, "calls", {}))
+    phases = {"import_s": round(import_s, 4)}
+    api_total = 0.0
+    for kind, seconds in sorted(getattr(transport, "timings", {}).items()):
+        phases[f"api {kind}"] = round(seconds, 4)
+        api_total += seconds
+    phases["local_s"] = round(max(wall - import_s - api_total, 0.0), 4)
+
+    print(json.dumps({
+        "wall_s": round(wall, 4),
+        "calls": sum(calls.values()),
+        "calls_by_kind": calls,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "phases": phases,
+    }))
+
+def run_case(command, size):
+    with tempfile.TemporaryDirectory(prefix="pm-bench-") as workdir:
+        argv = prepare(command, size, workdir)
+        # Run from the temp dir so no real team/config/cache files leak into the numbers
+        res = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", json.dumps(argv)],
+            cwd=workdir, capture_output=True, text=True
+        )
+    if res.returncode != 0:
+        raise RuntimeError(f"{command}@{size} failed:\n{res.stderr.strip()}")
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end CLI benchmarks against the fake GitHub backend")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated issue counts")
+    parser.add_argument("--commands", default=",".join(COMMANDS), help="Comma-separated subcommands")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Store results as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against baselines/NAME.json")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown (default 0.2)")
+    parser.add_argument("--json", metavar="PATH", help="Also write raw results to PATH")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(json.loads(args.worker))
+        return 0
+
+    results = {}
+    print(f"{'case':<22}{'wall (s)':>10}{'calls':>8}{'peak RSS (MB)':>15}")
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        for command in [c for c in args.commands.split(",") if c]:
+            # scaffold does not touch GitHub, so its size does not matter
+            if command == "scaffold" and size != int(args.sizes.split(",")[0]):
+                continue
+            case = f"{command}@{size}"
+            metrics = run_case(command, size)
+            results[case] = metrics
+            print(f"{case:<22}{metrics['wall_s']:>10.3f}{metrics['calls']:>8}{metrics['peak_rss_kb'] / 1024:>15.1f}")
+            for phase, seconds in metrics["phases"].items():
+                print(f"    {phase:<44}{seconds:>8.3f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+    if args.compare:
+        return report_regressions(compare(args.compare, results, args.tolerance))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
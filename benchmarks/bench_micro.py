@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for hot paths: skill matching (single, batch and optimal), the sync line handler and Gantt rendering.
+
+    python3 benchmarks/bench_micro.py
+    python3 benchmarks/bench_micro.py --save-baseline micro
+    python3 benchmarks/bench_micro.py --compare micro
+"""
+import argparse
+import logging
+import random
+import sys
+import timeit
+
+from common import compare, report_regressions, save_baseline
+
+from src.connectors.fake import generate_fixture
+from src.connectors.issue import Issue
+from src.core.resource import ResourceManager
+from src.core.journal import SyncJournal
+from src.core.sync import FilePass, SyncManager
+from src.reports.report import ReportGenerator
+
+# Per-call times below this are within timer and scheduling noise; they are reported, not compared
+MIN_WALL_S = 2e-6
+
+SKILLS = ["python", "java", "react", "ui", "api", "db", "sql", "security", "ops", "docker", "manage", "review"]
+
+def make_resource_manager(members):
+    rnd = random.Random(members)
+    mgr = ResourceManager(config_path="/nonexistent/team.json", logger=logging.getLogger("bench"))
+    mgr.max_active = None  # Repeated calls pile up load; keep every run on the skill-match path
+    mgr.team = {"members": [
+        {"id": f"dev-{n}", "role": "Dev", "skills": rnd.sample(SKILLS, 3), "status": "active"}
+        for n in range(members)
+    ]}
+    return mgr
+
+def fresh_batch(mgr, batch, solver="greedy"):
+    """Runs a batch from zero load, so every repeat times the same assignment."""
+    mgr.workload = {}
+    return mgr.assign_batch(batch, solver=solver)
+
+def bench(stmt, number=None, repeat=5):
+    """
+    Best-of-`repeat` time per call, in microseconds. Without `number`, each repeat makes
+    enough calls to run for at least 0.2 s, so fast cases are not timed on a handful of calls.
+    """
+    timer = timeit.Timer(stmt)
+    if number is None:
+        number, _elapsed = timer.autorange()
+    return min(timer.repeat(number=number, repeat=repeat)) / number * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks for resource matching, sync line handling and Gantt rendering")
+    parser.add_argument("--save-baseline", metavar="NAME", help="Store results as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against baselines/NAME.json")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown (default 0.2)")
+    args = parser.parse_args()
+
+    # The code under test logs on every call; keep the numbers about the code, not the logger
+    logging.disable(logging.CRITICAL)
+    results = {}
+
+    for members in (10, 200, 2000):
+        mgr = make_resource_manager(members)
+        tags = ["type:dev", "domain:api", "Build REST endpoint"]
+        results[f"find_best_assignee@{members}"] = bench(lambda: mgr.find_best_assignee(tags))
+
+    # A 500-task launch against a 2,000-person team
+    mgr = make_resource_manager(2000)
+    batch = [["type:dev", f"domain:{SKILLS[n % len(SKILLS)]}"] for n in range(500)]
+    results["assign_batch@500x2000"] = bench(lambda: fresh_batch(mgr, batch))
+
+    # A 1,000-task launch against a 500-person team, solved for total skill coverage
+    mgr = make_resource_manager(500)
+    batch = [[f"type:{('dev', 'design', 'test')[n % 3]}", f"domain:{SKILLS[n % len(SKILLS)]}", f"{SKILLS[n * 7 % len(SKILLS)]} task"]
+             for n in range(1000)]
+    results["assign_optimal@1000x500"] = bench(lambda: fresh_batch(mgr, batch, "optimal"), number=1, repeat=3)
+
+    # The same launch with varied tags (3 of 60 skills per member and per task): ~1,000 task classes x ~500 member classes
+    rnd = random.Random(60)
+    domains = [f"skill{n}" for n in range(60)]
+    mgr = make_resource_manager(500)
+    for member in mgr.team["members"]:
+        member["skills"] = rnd.sample(domains, 3)
+    batch = [[f"domain:{d}" for d in rnd.sample(domains, 3)] for _ in range(1000)]
+    results["assign_optimal_varied@1000x500"] = bench(lambda: fresh_batch(mgr, batch, "optimal"), number=1, repeat=3)
+
+    # SyncManager._process_line over a 10,000-line file, as one FilePass: a first sync (every line
+    # resolved against the remote issues, half of them backfilled with an #id), then a re-sync of
+    # the rewritten file against the resulting journal (every line on the unchanged fast path)
+    repo = "demo/synthetic"
+    lines = [f"- [{'x' if n % 3 else ' '}] Task number {n} (type:dev, domain:api){' #' + str(n) if n % 2 else ''}\n" for n in range(10000)]
+    remote = {str(n): Issue(n, title=f"Task number {n} (type:dev, domain:api)", state="closed" if n % 4 else "open",
+                            updated_at="2026-01-01T00:00:00Z") for n in range(10000)}
+    sync = SyncManager(connector=None, resource_mgr=None, repo_name=repo)
+
+    def sync_pass(journal, lines):
+        file_pass = FilePass("tasks.md", journal, remote)
+        return file_pass, [sync._process_line(line, file_pass) for line in lines]
+
+    results["sync_process_line@10000"] = bench(lambda: sync_pass(SyncJournal(None, repo), lines), repeat=10)
+    file_pass, synced = sync_pass(SyncJournal(None, repo), lines)
+    journal = SyncJournal(None, repo, {"entries": file_pass.entries})
+    results["sync_process_line_unchanged@10000"] = bench(lambda: sync_pass(journal, synced), repeat=10)
+
+    for size in (1000, 10000):
+        raw = generate_fixture(issues=size, seed=size)["repos"]["demo/synthetic"]["issues"]
+        issues = [Issue.from_dict(i) for i in raw]
+        gen = ReportGenerator(connector=None, resource_mgr=None, repo_name="demo/synthetic")
+        results[f"generate_gantt@{size}"] = bench(lambda: gen.generate_gantt(issues))
+
+    logging.disable(logging.NOTSET)
+    print(f"{'case':<36}{'time/call (us)':>16}")
+    for case, micros in results.items():
+        print(f"{case:<36}{micros:>16.1f}")
+
+    # Stored in the same shape as the CLI baselines: {case: {metric: value}}
+    results = {case: {"wall_s": round(micros / 1e6, 9)} for case, micros in results.items()}
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+    if args.compare:
+        return report_regressions(compare(args.compare, results, args.tolerance, min_wall_s=MIN_WALL_S))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
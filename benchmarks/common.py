@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the benchmark scripts: JSON baselines and regression checks.
+"""
+import json
+import os
+import sys
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add the repository root to sys.path so that 'src' can be imported
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Metrics compared against baselines; lower is better for all of them
+COMPARED_METRICS = ("wall_s", "calls", "peak_rss_kb")
+
+def baseline_path(name):
+    if os.sep in name or name.endswith(".json"):
+        return name
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+def save_baseline(name, results):
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"Baseline saved to {path}")
+
+def compare(name, results, tolerance=0.2, min_wall_s=0.05):
+    """
+    Compares `results` ({case: {metric: value}}) with a saved baseline.
+    Returns a list of regression messages. Wall times below `min_wall_s` are ignored as noise.
+    """
+    with open(baseline_path(name), "r") as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for case, metrics in sorted(results.items()):
+        base = baseline.get(case)
+        if not base:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            if metric == "wall_s" and max(old, new) < min_wall_s:
+                continue
+            if new > old * (1 + tolerance) and new - old > 0:
+                regressions.append(f"{case}: {metric} {old} -> {new} (+{(new / old - 1) * 100 if old else 100:.0f}%)")
+    return regressions
+
+def report_regressions(regressions):
+    if not regressions:
+        print("No regressions against baseline.")
+        return 0
+    print("REGRESSIONS:")
+    for r in regressions:
+        print(f"  - {r}")
+    return 1
@@ -9,6 +9,14 @@ import os
 import re
 import shutil
 
+# Shared GitHub connector (rate-limit-aware request scheduler) from the modular package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.connectors.github import GitHubConnector
+from src.core import analytics
+from src.core.analytics import IssueColumns
+from src.core.title_index import TitleIndex
+from src.utils.files import rewrite_lines
+
 # Color codes for output
 GREEN = '\033[92m'
 YELLOW = '\033[93m'
@@ -123,30 +131,34 @@ def update_local_file(path, tasks_to_update):
     except Exception as e:
         log(f"更新本地文件失败: {e}", "ERROR")
 
+_CONNECTOR = None
+
+def get_connector():
+    # 进程内共享连接器: 限流调度与查询规划器 (多个来源共用一次仓库拉取)
+    global _CONNECTOR
+    if _CONNECTOR is None:
+        _CONNECTOR = GitHubConnector()
+    return _CONNECTOR
+
 def fetch_github_tasks(repo, labels=None):
     try:
         # P1 Fix: explicitly ask for state=all to handle phase transitions correctly
-        cmd = ["gh", "issue", "list", "--repo", repo, "--state", "all", "--json", "number,title,state,assignees,createdAt,milestone,labels", "--limit", "50"]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        issues = json.loads(result.stdout)
+        # 每个来源都按标签在内存中过滤同一份全量快照，只产生一次远程请求
+        issues = get_connector().fetch_issues(repo, state="all")
         normalized = []
         for i in issues:
-            assignee = i['assignees'][0]['login'] if i['assignees'] else "Unassigned"
-            i_labels = [l['name'] for l in i.get('labels', [])]
-            
-            milestone = i.get('milestone')
-            due_date = None
-            if milestone and milestone.get('dueOn'):
-                due_date = milestone.get('dueOn').split('T')[0]
-                
+            assignee = i.assignees[0] if i.assignees else "Unassigned"
+            i_labels = list(i.labels)
+            due_date = i.due_date.isoformat() if i.due_date else None
+
             if labels and not any(l in i_labels for l in labels):
                 continue
             
-            detailed_status = normalize_status(i['state'].lower(), i_labels)
+            detailed_status = normalize_status(i.state, i_labels)
             normalized.append({
-                "id": i['number'],
-                "title": i['title'],
-                "state": i['state'].lower(),
+                "id": i.number,
+                "title": i.title,
+                "state": i.state,
                 "status_detailed": detailed_status,
                 "assignee": assignee,
                 "due_date": due_date,
@@ -176,15 +188,28 @@ def get_all_tasks(repo):
             t['phase'] = 'general'
     return all_tasks
 
+_TASK_METRICS = (None, None)
+
+def task_metrics(tasks):
+    """任务列表的统计指标 (一次列式计算, 同一任务列表在各报告分节间复用)."""
+    global _TASK_METRICS
+    if _TASK_METRICS[0] is not tasks:
+        columns = IssueColumns()
+        for t in tasks:
+            due = None
+            if t.get('due_date'):
+                try: due = datetime.date.fromisoformat(t['due_date']).toordinal()
+                except ValueError: pass
+            assignee = t.get('assignee', 'Unassigned')
+            columns.append(t['state'] == 'closed', t.get('phase', 'general'),
+                           [] if assignee == 'Unassigned' else [assignee],
+                           due=due, done=t['status_detailed'] == 'done')
+        _TASK_METRICS = (tasks, analytics.compute(columns))
+    return _TASK_METRICS[1]
+
 def check_dependencies(tasks):
-    phases = {}
-    for t in tasks:
-        p = t.get('phase', 'general')
-        if p not in phases: phases[p] = {'total': 0, 'done': 0}
-        phases[p]['total'] += 1
-        if t['status_detailed'] == 'done':
-            phases[p]['done'] += 1
-    phase_status = {p: (d['done'] == d['total'] and d['total'] > 0) for p, d in phases.items()}
+    metrics = task_metrics(tasks)
+    phase_status = {p: (metrics.phase_done[p] == total and total > 0) for p, total in metrics.phase_totals.items()}
     gate_rules = CONFIG.get('gate_rules', {
         'design': 'requirements',
         'development': 'design',
@@ -427,32 +452,39 @@ def plan_project(repo, requirement_text):
 
 def remind_issue(repo, issue_id, message):
     try:
+        connector = get_connector()
         # 优化：增强正则匹配，支持前后中文标点或空格
         # 匹配模式：@后跟GitHub用户名(支持连字符)，忽略紧随其后的标点符号
         assignee_match = re.search(r'@([a-zA-Z0-9-]+)(?:\s|$|[，。！？\.,!?])', message)
         
+        # 指派与评论互不依赖，交给调度器并发执行
+        assign_future = None
         if assignee_match:
             assignee = assignee_match.group(1)
             log(f"识别到负责人: {assignee}，正在尝试指派...")
-            
-            # 尝试指派
-            assign_cmd = ["gh", "issue", "edit", str(issue_id), "--repo", repo, "--add-assignee", assignee]
-            assign_res = subprocess.run(assign_cmd, check=False, capture_output=True, text=True)
-            
-            if assign_res.returncode == 0:
+            assign_future = connector.scheduler.submit(
+                connector.api, "POST", f"repos/{repo}/issues/{issue_id}/assignees", {"assignees": [assignee]})
+
+        # 发送评论
+        comment_future = connector.scheduler.submit(
+            connector.api, "POST", f"repos/{repo}/issues/{issue_id}/comments", {"body": message})
+
+        if assign_future:
+            assign_res = assign_future.result()
+            assigned = assign_res.ok and any(a.get('login') == assignee for a in (assign_res.data or {}).get('assignees', []))
+            if assigned:
                 log(f"✅ 已成功指派给 {assignee}")
             else:
                 # 明确输出错误信息
-                err_msg = assign_res.stderr.strip()
-                log(f"⚠️ 指派失败: {err_msg}", "ERROR")
+                log(f"⚠️ 指派失败: {assign_res.error_message()}", "ERROR")
                 print(f"{YELLOW}提示: 请确认 '{assignee}' 是该仓库的 Collaborator。{RESET}")
 
-        # 发送评论
-        subprocess.run(["gh", "issue", "comment", str(issue_id), "--repo", repo, "--body", message], check=True, capture_output=True)
-        log(f"成功向 Issue #{issue_id} 发送提醒。")
+        comment_res = comment_future.result()
+        if comment_res.ok:
+            log(f"成功向 Issue #{issue_id} 发送提醒。")
+        else:
+            log(f"GitHub API 调用失败: {comment_res.error_message()}", "ERROR")
         
-    except subprocess.CalledProcessError as e:
-        log(f"GitHub CLI 调用失败: {e}", "ERROR")
     except Exception as e:
         log(f"无法发送提醒: {str(e)}", "ERROR")
 
@@ -480,44 +512,41 @@ def process_meeting_notes(repo, content):
         print(f"- {task['title']} [@{task['assignee'] or '未分配'}]")
     confirm = input("\n是否创建 GitHub Issues? (y/n): ")
     if confirm.lower() != 'y': return
-    for task in actions:
-        try:
-            cmd = ["gh", "issue", "create", "--repo", repo, "--title", task['title'], "--body", f"From Meeting Notes.", "--label", "type:action"]
-            if task['assignee']: cmd.extend(["--assignee", task['assignee']])
-            subprocess.run(cmd, check=True, capture_output=True)
-            log(f"成功创建任务: {task['title']}")
-        except: log(f"创建失败", "WARNING")
+    # 批量创建 (GraphQL 批处理 + 限流调度)
+    payloads = [{
+        "title": task['title'],
+        "body": "From Meeting Notes.",
+        "labels": ["type:action"],
+        "assignees": [task['assignee']] if task['assignee'] else []
+    } for task in actions]
+    for result in get_connector().create_issues(repo, payloads):
+        if result['ok']:
+            log(f"成功创建任务: {result['title']}")
+        else:
+            log(f"创建失败: {result['title']} ({result['error']})", "WARNING")
 
 def analyze_risk(tasks):
     risks = []
     today = datetime.date.today()
-    grace_period = CONFIG['thresholds'].get('overdue_grace_period_days', 0)
-    for t in tasks:
-        if t['state'] == 'open' and t.get('due_date'):
-            try:
-                due_date = datetime.datetime.strptime(t['due_date'], "%Y-%m-%d").date()
-                if due_date < today:
-                    days_over = (today - due_date).days
-                    risks.append(f"⚠️ 任务超时: {t['title']} (逾期 {days_over} 天) @{t['assignee']}")
-                elif (due_date - today).days <= 2:
-                    risks.append(f"⏰ 即将到期: {t['title']} (剩余 {(due_date - today).days} 天) @{t['assignee']}")
-            except: pass
-    
+    metrics = task_metrics(tasks)
+    # 逾期与即将到期 (按任务顺序)
+    for row in sorted(metrics.overdue_rows + metrics.due_soon_rows):
+        t = tasks[row]
+        days = (datetime.date.fromisoformat(t['due_date']) - today).days
+        if days < 0:
+            risks.append(f"⚠️ 任务超时: {t['title']} (逾期 {-days} 天) @{t['assignee']}")
+        else:
+            risks.append(f"⏰ 即将到期: {t['title']} (剩余 {days} 天) @{t['assignee']}")
+
     # Check workload
-    assignee_counts = {}
-    for t in tasks:
-        if t['state'] == 'open':
-            assignee = t.get('assignee', 'Unassigned')
-            assignee_counts[assignee] = assignee_counts.get(assignee, 0) + 1
-            
     max_tasks = CONFIG['thresholds'].get('max_active_tasks_per_person', 3)
-    for assignee, count in assignee_counts.items():
-        if count > max_tasks and assignee != 'Unassigned':
+    for assignee, count in metrics.assignee_load.items():
+        if count > max_tasks:
             risks.append(f"🔥 资源过载: {assignee} 当前有 {count} 个活跃任务 (阈值: {max_tasks})")
     
     # Check for Unassigned tasks in active phases
-    if assignee_counts.get('Unassigned', 0) > 0:
-        risks.append(f"⚠️ 发现 {assignee_counts['Unassigned']} 个未分配任务 (Unassigned)，请尽快指派负责人。")
+    if metrics.unassigned > 0:
+        risks.append(f"⚠️ 发现 {metrics.unassigned} 个未分配任务 (Unassigned)，请尽快指派负责人。")
             
     return risks
 
@@ -627,29 +656,82 @@ def generate_mermaid_gantt(tasks, blocked_tasks={}):
     return mermaid_code
 
 def generate_phase_report(issues, blocked_tasks={}):
-    report = "### 📑 阶段状态总览 (Phase Status)\n"
+    """阶段状态总览, 逐行生成 (yield)."""
+    yield "### 📑 阶段状态总览 (Phase Status)\n"
+    metrics = task_metrics(issues)
     phases = {}
     for i in issues:
         p = i.get('phase', 'general')
         if p not in phases: phases[p] = []
         phases[p].append(i)
     for phase_name, tasks in phases.items():
-        done = len([t for t in tasks if t['state'] == 'closed'])
-        pct = int((done / len(tasks)) * 100)
-        report += f"- **{phase_name.capitalize()}:** {pct}% ({done}/{len(tasks)})\n"
+        done, total = metrics.phase_closed[phase_name], metrics.phase_totals[phase_name]
+        pct = int((done / total) * 100)
+        yield f"- **{phase_name.capitalize()}:** {pct}% ({done}/{total})\n"
         for t in tasks:
              icon = '✅' if t['status_detailed'] == 'done' else ('⛔' if str(t['id']) in blocked_tasks else '⏳')
-             report += f"  - {icon} {t['title']}\n"
-    return report + "\n"
+             yield f"  - {icon} {t['title']}\n"
+    yield "\n"
 
 def generate_markdown_table(issues, blocked_tasks={}):
-    table = "| ID | 阶段 | 状态 | 标题 | 负责人 | 截止日期 |\n|---|---|---|---|---|---|\n"
+    """任务明细表, 逐行生成 (yield)."""
+    yield "| ID | 阶段 | 状态 | 标题 | 负责人 | 截止日期 |\n|---|---|---|---|---|---|\n"
     for t in issues:
         status = "✅ 已完成" if t['status_detailed'] == 'done' else ("⛔ 阻塞" if str(t['id']) in blocked_tasks else "⏳ 进行中")
-        table += f"| {t['id']} | {t.get('phase','')} | {status} | {t['title']} | {t['assignee']} | {t.get('due_date','') or ''} |\n"
-    return table
+        yield f"| {t['id']} | {t.get('phase','')} | {status} | {t['title']} | {t['assignee']} | {t.get('due_date','') or ''} |\n"
+
+# 报告分节 (status --sections), 按文档顺序
+REPORT_SECTIONS = ("stats", "risks", "phases", "tasks", "gantt")
+
+def parse_report_sections(spec):
+    if not spec: return list(REPORT_SECTIONS)
+    names = [n.strip() for n in spec.split(",") if n.strip()]
+    unknown = [n for n in names if n not in REPORT_SECTIONS]
+    if unknown:
+        raise ValueError(f"未知报告分节: {', '.join(unknown)} (可选: {', '.join(REPORT_SECTIONS)})")
+    return [n for n in REPORT_SECTIONS if n in names]
+
+def status_report(repo, tasks, prs, ci_status, blocked_tasks, sections):
+    """
+    逐节生成状态报告 (yield 文本片段), 边计算边输出, 不在内存中拼接整份文档.
+    """
+    yield f"\n# 📊 项目跟踪表: {repo}\n日期: {datetime.date.today()}\n\n"
+    # P1: CI Status Display
+    if ci_status:
+        yield f"### 🚦 构建状态: {ci_status['icon']} {ci_status['conclusion'].upper()} ({ci_status['branch']})\n"
+
+    def stats():
+        metrics = task_metrics(tasks)
+        yield f"## 1. 核心指标\n- **进度:** {metrics.progress}%\n- **任务:** {metrics.total}\n- **PR:** {len(prs)}\n\n"
+        # Burndown Chart
+        burndown = analyze_trends_chart(repo)
+        if burndown: yield burndown + "\n"
+
+    def risks():
+        yield "## 2. 风险预警\n\n"
+        if blocked_tasks: yield f"- ⛔ 流程阻塞: {len(blocked_tasks)} 个任务被拦截。\n"
+        for r in analyze_risk(tasks): yield f"- {r}\n"
+        pr_report = analyze_pr_health(prs)
+        if pr_report: yield pr_report + "\n"
+
+    def phases():
+        yield from generate_phase_report(tasks, blocked_tasks)
+        yield "\n"
+
+    def task_table():
+        yield "### 📋 任务明细表\n"
+        yield from generate_markdown_table(tasks, blocked_tasks)
+        yield "\n"
+
+    def gantt():
+        yield "\n### 📅 进度时间线\n```mermaid\n" + generate_mermaid_gantt(tasks, blocked_tasks) + "```\n\n"
+
+    builders = {"stats": stats, "risks": risks, "phases": phases, "tasks": task_table, "gantt": gantt}
+    for name in sections:
+        yield from builders[name]()
 
-def export_report(repo, content):
+def export_report(repo, chunks):
+    """边输出到终端边写入导出文件, 完成后打包."""
     export_path = CONFIG['export'].get('path', 'reports')
     os.makedirs(export_path, exist_ok=True)
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H%M")
@@ -657,7 +739,10 @@ def export_report(repo, content):
     filename = f"{export_path}/Report_{safe_repo}_{timestamp}.md"
     zip_filename = f"{export_path}/Package_{safe_repo}_{timestamp}.zip"
     try:
-        with open(filename, "w") as f: f.write(content)
+        with open(filename, "w") as f:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+                f.write(chunk)
         subprocess.run(["zip", "-j", zip_filename, filename, HISTORY_FILE], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         log(f"导出包已创建: {zip_filename}")
         print(f"\n📦 **导出就绪:** `{zip_filename}`")
@@ -866,9 +951,6 @@ def import_requirements(file_path, repo):
 
     print(f"\n📥 **开始导入需求清单: {file_path}**")
     
-    with open(file_path, "r") as f:
-        lines = f.readlines()
-    
     tasks = []
     task_indices = []
     
@@ -880,7 +962,10 @@ def import_requirements(file_path, repo):
     # Group 4: #IssueID (Optional - ignore for creation)
     pattern = re.compile(r'- \[([ x])\] (.*?)(?: (@[\w-]+))?(?: #(\d+))?$')
     
-    for idx, line in enumerate(lines):
+    with open(file_path, "r") as f:
+        task_lines = [(idx, line) for idx, line in enumerate(f) if pattern.search(line.strip())]
+
+    for idx, line in task_lines:
         match = pattern.search(line.strip())
         if match:
             is_checked = match.group(1) == 'x'
@@ -895,12 +980,35 @@ def import_requirements(file_path, repo):
                 
             tasks.append({
                 "line_idx": idx,
+                "line": line,
                 "title": title,
                 "assignee": assignee,
                 "is_checked": is_checked
             })
             task_indices.append(idx)
 
+    # 关联标题相近的已有 Issue (忽略标点、括号标签和 @责任人), 避免重复创建
+    if tasks:
+        try:
+            title_index = TitleIndex.build(get_connector().iter_issues(repo, state="all"))
+        except Exception as e:
+            log(f"获取已有 Issue 失败, 跳过去重: {e}", "WARNING")
+            title_index = None
+        if title_index is not None:
+            linked_lines = {}
+            remaining = []
+            for task in tasks:
+                existing, score = title_index.match(task['title'])
+                if existing:
+                    print(f"  [关联] {task['title']} -> #{existing.number} {existing.title} (相似度 {score:.2f})")
+                    linked_lines[task['line_idx']] = f"{task['line'].rstrip()} #{existing.number}\n"
+                else:
+                    remaining.append(task)
+            tasks = remaining
+            if linked_lines:
+                rewrite_lines(file_path, lambda idx, line: linked_lines.get(idx, line))
+                print(f"已关联 {len(linked_lines)} 个已有 Issue，并回写至 {file_path}")
+
     if not tasks:
         print("未发现新的待导入需求。")
         return
@@ -933,7 +1041,7 @@ def import_requirements(file_path, repo):
         return
 
     # 批量创建并回写
-    new_lines = lines.copy()
+    id_lines = {}  # 行号 -> 回写后的行
     created_count = 0
     
     for task in tasks:
@@ -959,12 +1067,12 @@ def import_requirements(file_path, repo):
             print(f" ✅ #{issue_number}")
             
             # 回写 Markdown: 在行尾追加 #ID
-            original_line = new_lines[task['line_idx']].rstrip()
+            original_line = task['line'].rstrip()
             # 如果之前没有责任人但现在指派了，也补上
             if task['assignee'] and task['assignee'] not in original_line:
                 original_line += f" {task['assignee']}"
             
-            new_lines[task['line_idx']] = f"{original_line} #{issue_number}\n"
+            id_lines[task['line_idx']] = f"{original_line} #{issue_number}\n"
             created_count += 1
             
         except subprocess.CalledProcessError as e:
@@ -972,10 +1080,9 @@ def import_requirements(file_path, repo):
         except Exception as e:
             print(f" ❌ 错误: {e}")
 
-    # 保存回写后的 Markdown
+    # 保存回写后的 Markdown (流式写入临时文件后原子替换)
     if created_count > 0:
-        with open(file_path, "w") as f:
-            f.writelines(new_lines)
+        rewrite_lines(file_path, lambda idx, line: id_lines.get(idx, line))
         print(f"\n✅ 已成功导入 {created_count} 个需求，并回写至 {file_path}")
     else:
         print("\n⚠️ 未能导入任何需求。")
@@ -1126,9 +1233,8 @@ def generate_retrospective(repo, output_file="RETROSPECTIVE.md"):
         return
 
     # 1. 基础统计
-    total = len(tasks)
-    closed = len([t for t in tasks if t['state'] == 'closed'])
-    open_count = total - closed
+    metrics = task_metrics(tasks)
+    total, closed, open_count = metrics.total, metrics.closed, metrics.open
     
     # 2. 贡献者统计
     contributors = {}
@@ -1243,6 +1349,7 @@ def main():
     sp = subparsers.add_parser("status")
     sp.add_argument("--repo", required=True)
     sp.add_argument("--export", action='store_true')
+    sp.add_argument("--sections", help=f"只输出指定分节, 逗号分隔 ({','.join(REPORT_SECTIONS)})")
     
     rp = subparsers.add_parser("risk")
     rp.add_argument("--repo", required=True)
@@ -1321,35 +1428,23 @@ def main():
     elif args.command == "archive":
         generate_retrospective(args.repo, args.out)
     elif args.command == "status":
+        try:
+            sections = parse_report_sections(args.sections)
+        except ValueError as e:
+            print(f"{RED}错误: {e}{RESET}")
+            sys.exit(1)
         tasks = get_all_tasks(args.repo)
         save_history(args.repo, tasks)
         prs = fetch_pull_requests(args.repo)
         ci_status = fetch_ci_status(args.repo) # P1 Integration
         blocked_tasks = check_dependencies(tasks)
-        buffer = []
-        def p(x): print(x); buffer.append(str(x))
-        p(f"\n# 📊 项目跟踪表: {args.repo}\n日期: {datetime.date.today()}\n")
-        
-        # P1: CI Status Display
-        if ci_status:
-            p(f"### 🚦 构建状态: {ci_status['icon']} {ci_status['conclusion'].upper()} ({ci_status['branch']})")
-        
-        p(f"## 1. 核心指标\n- **进度:** {int((len([t for t in tasks if t['state']=='closed'])/len(tasks))*100) if tasks else 0}%\n- **任务:** {len(tasks)}\n- **PR:** {len(prs)}\n")
-        
-        # Burndown Chart
-        burndown = analyze_trends_chart(args.repo)
-        if burndown: p(burndown)
-
-        risks = analyze_risk(tasks)
-        p(f"## 2. 风险预警\n")
-        if blocked_tasks: p(f"- ⛔ 流程阻塞: {len(blocked_tasks)} 个任务被拦截。")
-        for r in risks: p(f"- {r}")
-        pr_report = analyze_pr_health(prs)
-        if pr_report: p(pr_report)
-        p(generate_phase_report(tasks, blocked_tasks))
-        p("### 📋 任务明细表\n" + generate_markdown_table(tasks, blocked_tasks))
-        p("\n### 📅 进度时间线\n```mermaid\n" + generate_mermaid_gantt(tasks, blocked_tasks) + "```\n")
-        if args.export: export_report(args.repo, "\n".join(buffer))
+        chunks = status_report(args.repo, tasks, prs, ci_status, blocked_tasks, sections)
+        if args.export:
+            export_report(args.repo, chunks)
+        else:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            sys.stdout.flush()
     elif args.command == "plan": plan_project(args.repo, args.req)
     elif args.command == "remind": remind_issue(args.repo, args.id, args.msg)
     elif args.command == "risk":
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Generates a synthetic GitHub repo fixture for the offline fake backend.
+
+    python3 scripts/synth_repo.py --issues 10000 --out /tmp/repo.json
+    python3 scripts/project_control.py status --repo demo/synthetic --transport fake --fixture /tmp/repo.json
+"""
+import argparse
+import json
+import os
+import sys
+
+# Add the repository root to sys.path so that 'src' can be imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.connectors.fake import generate_fixture
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic repo fixture for --transport fake")
+    parser.add_argument("--out", required=True, help="Output fixture path (JSON)")
+    parser.add_argument("--repo", default="demo/synthetic", help="Repository name (owner/repo)")
+    parser.add_argument("--issues", type=int, default=1000, help="Number of issues")
+    parser.add_argument("--members", type=int, default=20, help="Number of team members (assignees)")
+    parser.add_argument("--milestones", type=int, default=6, help="Number of milestones")
+    parser.add_argument("--closed-ratio", type=float, default=0.6, help="Share of closed issues")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Simulated latency per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 502/403")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same repo)")
+    args = parser.parse_args()
+
+    fixture = generate_fixture(
+        repo=args.repo, issues=args.issues, seed=args.seed, members=args.members,
+        milestones=args.milestones, closed_ratio=args.closed_ratio,
+        latency_ms=args.latency_ms, error_rate=args.error_rate
+    )
+    with open(args.out, "w") as f:
+        json.dump(fixture, f)
+    print(f"Wrote {args.issues} issues for {args.repo} to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+class IssueCache:
+    """
+    SQLite-backed local issue store with a per-repo `updatedAt` high-water mark.
+    Issues are kept as their normalized JSON payload plus indexed state/label columns.
+    """
+    # Bumped when the stored payload changes (2: issue bodies); older caches are rebuilt
+    VERSION = 2
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS issues (
+            repo TEXT NOT NULL,
+            number INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            updated_at TEXT,
+            data TEXT NOT NULL,
+            PRIMARY KEY (repo, number)
+        );
+        CREATE INDEX IF NOT EXISTS idx_issues_state ON issues (repo, state);
+        CREATE TABLE IF NOT EXISTS issue_labels (
+            repo TEXT NOT NULL,
+            number INTEGER NOT NULL,
+            label TEXT NOT NULL,
+            PRIMARY KEY (repo, number, label)
+        );
+        CREATE INDEX IF NOT EXISTS idx_issue_labels ON issue_labels (repo, label);
+        CREATE TABLE IF NOT EXISTS marks (
+            repo TEXT PRIMARY KEY,
+            updated_at TEXT
+        );
+    """
+
+    def __init__(self, db_path="skills/project-manager/data/issues.db", logger=None):
+        self.db_path = db_path
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript(self.SCHEMA)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.VERSION:
+            if version:
+                self.logger.info(f"Issue cache format changed (v{version} -> v{self.VERSION}). Rebuilding.")
+            with self.conn:
+                for table in ("issues", "issue_labels", "marks"):
+                    self.conn.execute(f"DELETE FROM {table}")
+            self.conn.execute(f"PRAGMA user_version = {self.VERSION}")
+
+    def high_water_mark(self, repo):
+        """Returns the newest `updatedAt` seen for the repo, or None if never refreshed."""
+        with self._lock:
+            row = self.conn.execute("SELECT updated_at FROM marks WHERE repo = ?", (repo,)).fetchone()
+        return row[0] if row else None
+
+    def has_repo(self, repo):
+        return self.high_water_mark(repo) is not None
+
+    def upsert(self, repo, issues):
+        """Stores a batch of normalized issues. The high-water mark is moved by `advance_mark`."""
+        with self._lock, self.conn:
+            for issue in issues:
+                number = issue["number"]
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO issues (repo, number, state, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+                    (repo, number, issue["state"], issue.get("updatedAt"), json.dumps(issue))
+                )
+                self.conn.execute("DELETE FROM issue_labels WHERE repo = ? AND number = ?", (repo, number))
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO issue_labels (repo, number, label) VALUES (?, ?, ?)",
+                    [(repo, number, l["name"]) for l in issue.get("labels", [])]
+                )
+
+    def advance_mark(self, repo, updated_at):
+        """
+        Records that every issue updated up to `updated_at` is stored: moves the repo's
+        high-water mark forward (never back). Call it only once a refresh has completed;
+        a partial walk says nothing about the issues it has not reached yet.
+        """
+        with self._lock, self.conn:
+            row = self.conn.execute("SELECT updated_at FROM marks WHERE repo = ?", (repo,)).fetchone()
+            # ISO-8601 UTC timestamps compare correctly as strings
+            mark = max(row[0] if row else "", updated_at or "")
+            self.conn.execute("INSERT OR REPLACE INTO marks (repo, updated_at) VALUES (?, ?)", (repo, mark))
+
+    def clear(self, repo):
+        """Drops everything cached for a repo (forces a full refresh next time)."""
+        with self._lock, self.conn:
+            for table in ("issues", "issue_labels", "marks"):
+                self.conn.execute(f"DELETE FROM {table} WHERE repo = ?", (repo,))
+
+    def iter_query(self, repo, state="all", labels=None, since=None):
+        """
+        Yields cached issues matching state/labels (labels are AND-ed), newest first.
+        `since` keeps only issues updated at or after that ISO-8601 time.
+        """
+        sql = "SELECT data FROM issues WHERE repo = ?"
+        params = [repo]
+        if state in ("open", "closed"):
+            sql += " AND state = ?"
+            params.append(state)
+        if since:
+            sql += " AND updated_at >= ?"
+            params.append(since)
+        labels = sorted(set(labels or []))
+        if labels:
+            sql += (
+                " AND number IN (SELECT number FROM issue_labels WHERE repo = ? AND label IN "
+                f"({', '.join('?' * len(labels))}) GROUP BY number HAVING COUNT(*) = ?)"
+            )
+            params.extend([repo, *labels, len(labels)])
+        sql += " ORDER BY number DESC"
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+import datetime
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+from src.connectors.transport import ApiResponse
+
+class FakeTransport:
+    """
+    Offline stand-in for the GitHub API, served from a local JSON fixture.
+    Implements the REST and GraphQL calls GitHubConnector makes, with optional
+    latency and error injection, so sync/launch/status can run without GitHub.
+
+    Fixture layout:
+        {"settings": {"latency_ms": 0, "error_rate": 0.0, "seed": 0},
+         "repos": {"owner/name": {"issues": [...], "labels": [...], "users": [...], "runs": [...]}}}
+    Issues use the connector's normalized shape plus "body".
+    """
+    OPERATION = re.compile(r"^\s*(query|mutation)\s+(\w+)")
+
+    def __init__(self, fixture_path=None, fixture=None, latency_ms=None, error_rate=None,
+                 seed=None, rate_limit=5000, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.fixture_path = fixture_path
+        if fixture is None:
+            fixture = {"repos": {}}
+            if fixture_path and os.path.exists(fixture_path):
+                with open(fixture_path, "r") as f:
+                    fixture = json.load(f)
+        self.fixture = fixture
+
+        settings = fixture.get("settings", {})
+        self.latency = (latency_ms if latency_ms is not None else settings.get("latency_ms", 0)) / 1000.0
+        self.error_rate = error_rate if error_rate is not None else settings.get("error_rate", 0.0)
+        self.random = random.Random(seed if seed is not None else settings.get("seed", 0))
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+
+        self.calls = {}    # Request kind -> count, for benchmarks and assertions
+        self.timings = {}  # Request kind -> seconds spent serving it (incl. latency)
+        self._lock = threading.Lock()
+        self._views = {}  # Filtered, ordered issue lists keyed by query filters
+        self._version = 0
+        self._repos = {}
+        for name, data in fixture.get("repos", {}).items():
+            self._load_repo(name, data)
+
+    def _load_repo(self, name, data):
+        data.setdefault("issues", [])
+        data.setdefault("labels", [])
+        data.setdefault("users", [])
+        data.setdefault("runs", [])
+        data["by_number"] = {i["number"]: i for i in data["issues"]}
+        data["next_number"] = max(data["by_number"], default=0) + 1
+        self._repos[name] = data
+
+    def _repo(self, name):
+        if name not in self._repos:
+            self._load_repo(name, {})
+        return self._repos[name]
+
+    @property
+    def dirty(self):
+        """True once any issue was created or modified."""
+        return self._version > 0
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def save(self, path=None):
+        """Writes the current (possibly mutated) state back as a fixture."""
+        repos = {}
+        for name, data in self._repos.items():
+            repos[name] = {k: v for k, v in data.items() if k not in ("by_number", "next_number")}
+        with open(path or self.fixture_path, "w") as f:
+            json.dump({"settings": self.fixture.get("settings", {}), "repos": repos}, f)
+
+    # --- Transport interface ---
+
+    def check_auth(self):
+        return self.request("GET", "user").ok
+
+    def request(self, method, path, body=None):
+        started = time.perf_counter()
+        kind = self._kind(method, path, body)
+        try:
+            return self._serve(method, path, body)
+        finally:
+            with self._lock:
+                self.calls[kind] = self.calls.get(kind, 0) + 1
+                self.timings[kind] = self.timings.get(kind, 0.0) + time.perf_counter() - started
+
+    def _serve(self, method, path, body):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.remaining = max(self.remaining - 1, 0)
+            headers = {
+                "x-ratelimit-limit": str(self.rate_limit),
+                "x-ratelimit-remaining": str(self.remaining),
+                "x-ratelimit-reset": str(int(time.time()) + 3600),
+            }
+            if self.error_rate and self.random.random() < self.error_rate:
+                if self.random.random() < 0.5:
+                    return ApiResponse(502, headers, {"message": "Injected server error"})
+                headers["retry-after"] = "1"
+                return ApiResponse(403, headers, {"message": "You have exceeded a secondary rate limit (injected)"})
+            try:
+                status, data = self._dispatch(method, path, body)
+            except KeyError as e:
+                status, data = 404, {"message": f"Not Found: {e}"}
+            return ApiResponse(status, headers, data)
+
+    def _kind(self, method, path, body):
+        if path == "graphql":
+            match = self.OPERATION.match((body or {}).get("query", ""))
+            return f"graphql:{match.group(2) if match else 'anonymous'}"
+        route = re.sub(r"^repos/[^/]+/[^/]+", "repos/:repo", path.split("?")[0])
+        return f"{method} {re.sub(r'/[0-9]+', '/:n', route)}"
+
+    # --- REST ---
+
+    def _dispatch(self, method, path, body):
+        if path == "graphql":
+            return self._graphql(body or {})
+        route = path.split("?")[0].strip("/")
+        if route == "user":
+            return 200, {"login": "fake-user"}
+        match = re.match(r"orgs/([^/]+)/repos$", route)
+        if match and method == "GET":
+            query = dict(p.split("=", 1) for p in path.partition("?")[2].split("&") if "=" in p)
+            per_page, page = int(query.get("per_page", 30)), int(query.get("page", 1))
+            names = sorted(n for n in self._repos if n.split("/", 1)[0] == match.group(1))
+            chunk = names[(page - 1) * per_page:page * per_page]
+            return 200, [{"full_name": n, "archived": bool(self._repos[n].get("archived"))} for n in chunk]
+
+        match = re.match(r"repos/([^/]+/[^/]+)/(.*)$", route)
+        if not match:
+            return 404, {"message": "Not Found"}
+        repo, rest = self._repo(match.group(1)), match.group(2)
+
+        if rest == "issues" and method == "POST":
+            issue = self._create(repo, body["title"], body.get("body", ""), body.get("labels", []), body.get("assignees", []))
+            return 201, issue
+        if rest == "actions/runs":
+            return 200, {"total_count": len(repo["runs"]), "workflow_runs": repo["runs"]}
+
+        match = re.match(r"issues/(\d+)(?:/(comments|assignees))?$", rest)
+        if match:
+            issue = repo["by_number"][int(match.group(1))]
+            sub = match.group(2)
+            if sub == "comments" and method == "POST":
+                issue.setdefault("comments", []).append(body["body"])
+                self._touch(issue)
+                return 201, {"body": body["body"]}
+            if sub == "assignees" and method == "POST":
+                known = set(repo["users"])
+                for login in body.get("assignees", []):
+                    if login in known and {"login": login} not in issue["assignees"]:
+                        issue["assignees"].append({"login": login})
+                self._touch(issue)
+                return 201, issue
+            if sub is None and method == "PATCH":
+                if "state" in body:
+                    issue["state"] = body["state"]
+                self._touch(issue)
+                return 200, issue
+            if sub is None and method == "GET":
+                return 200, issue
+        return 404, {"message": "Not Found"}
+
+    def _now(self):
+        return datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _touch(self, issue):
+        issue["updatedAt"] = self._now()
+        self._version += 1
+
+    def _create(self, repo, title, body, labels, assignees):
+        number = repo["next_number"]
+        repo["next_number"] += 1
+        known = set(repo["users"])
+        issue = {
+            "id": f"I_{number}",
+            "number": number,
+            "title": title,
+            "body": body,
+            "state": "open",
+            "assignees": [{"login": a} for a in assignees if a in known],
+            "labels": [{"name": l} for l in labels],
+            "milestone": None,
+            "createdAt": self._now(),
+            "updatedAt": self._now(),
+        }
+        for label in labels:
+            if label not in repo["labels"]:
+                repo["labels"].append(label)
+        repo["issues"].append(issue)
+        repo["by_number"][number] = issue
+        self._version += 1
+        return issue
+
+    # --- GraphQL ---
+
+    def _graphql(self, body):
+        match = self.OPERATION.match(body.get("query", ""))
+        operation = match.group(2) if match else None
+        variables = body.get("variables") or {}
+        handler = getattr(self, f"_gql_{operation}", None)
+        if handler is None:
+            return 200, {"errors": [{"message": f"Unsupported operation in fake backend: {operation}"}]}
+        return 200, handler(variables)
+
+    def _gql_IssuePage(self, v):
+        repo = self._repo(f"{v['owner']}/{v['name']}")
+        issues = self._view(repo, v)
+        offset = int(v.get("after") or 0)
+        first = v.get("first", 100)
+        page = issues[offset:offset + first]
+        return {"data": {"repository": {"issues": {
+            "pageInfo": {"hasNextPage": offset + first < len(issues), "endCursor": str(offset + first)},
+            "nodes": [self._node(i) for i in page]
+        }}}}
+
+    def _view(self, repo, v):
+        states = tuple(s.lower() for s in (v.get("states") or ["OPEN", "CLOSED"]))
+        labels = frozenset(v.get("labels") or ())
+        since = (v.get("filterBy") or {}).get("since")
+        key = (id(repo), states, labels, since, self._version)
+        if key not in self._views:
+            # One filtered, ordered list per distinct query; pages are then just slices
+            self._views = {k: val for k, val in self._views.items() if k[-1] == self._version}
+            self._views[key] = sorted(
+                (i for i in repo["issues"]
+                 if i["state"] in states
+                 and (not labels or labels.intersection(l["name"] for l in i["labels"]))
+                 and (not since or (i.get("updatedAt") or "") >= since)),
+                key=lambda i: i["createdAt"] or "", reverse=True
+            )
+        return self._views[key]
+
+    @staticmethod
+    def _node(issue):
+        return {
+            "id": issue.get("id"),
+            "number": issue["number"],
+            "title": issue["title"],
+            "body": issue.get("body", ""),
+            "state": issue["state"].upper(),
+            "createdAt": issue.get("createdAt"),
+            "updatedAt": issue.get("updatedAt"),
+            "assignees": {"nodes": issue.get("assignees", [])},
+            "labels": {"nodes": issue.get("labels", [])},
+            "milestone": issue.get("milestone"),
+        }
+
+    def _gql_ResolveIds(self, v):
+        repo = self._repo(f"{v['owner']}/{v['name']}")
+        repository = {"id": f"R_{v['owner']}/{v['name']}"}
+        data = {"repository": repository}
+        for key, value in v.items():
+            if re.match(r"l\d+$", key):
+                repository[key] = {"id": f"L_{value}"} if value in repo["labels"] else None
+            elif re.match(r"u\d+$", key):
+                data[key] = {"id": f"U_{value}"} if value in repo["users"] else None
+        return {"data": data}
+
+    def _gql_CreateIssues(self, v):
+        data = {}
+        for key, spec in v.items():
+            repo = self._repo(spec["repositoryId"][len("R_"):])
+            issue = self._create(
+                repo, spec["title"], spec.get("body", ""),
+                [l[len("L_"):] for l in spec.get("labelIds", [])],
+                [u[len("U_"):] for u in spec.get("assigneeIds", [])]
+            )
+            data[f"t{key[1:]}"] = {"issue": {"number": issue["number"], "url": f"https://github.com/fake/{issue['number']}"}}
+        return {"data": data}
+
+    def _gql_ResolveIssueIds(self, v):
+        name = f"{v['owner']}/{v['name']}"
+        repo = self._repo(name)
+        repository = {}
+        for key, number in v.items():
+            if re.match(r"n\d+$", key):
+                # Repo-qualified so that node IDs stay unique across fixture repos
+                repository[key] = {"id": f"I_{name}#{number}"} if number in repo["by_number"] else None
+        return {"data": {"repository": repository}}
+
+    def _gql_CloseIssues(self, v):
+        return self._set_states(v, "closed")
+
+    def _gql_ReopenIssues(self, v):
+        return self._set_states(v, "open")
+
+    def _set_states(self, v, state):
+        data = {}
+        for key, spec in v.items():
+            name, _, number = spec.get("issueId", spec.get("subjectId"))[len("I_"):].rpartition("#")
+            issue = self._repo(name)["by_number"][int(number)]
+            if key.startswith("c"):
+                issue.setdefault("comments", []).append(spec["body"])
+                data[key] = {"clientMutationId": None}
+            else:
+                issue["state"] = state
+                data[key] = {"issue": {"number": issue["number"], "state": state.upper()}}
+            self._touch(issue)
+        return {"data": data}
+
+
+class RecordingTransport:
+    """
+    Wraps a real transport and appends every request/response pair to a JSON-lines file.
+    """
+    def __init__(self, inner, path):
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+
+    def check_auth(self):
+        return self.inner.check_auth()
+
+    def request(self, method, path, body=None):
+        res = self.inner.request(method, path, body)
+        entry = {"method": method, "path": path, "body": body,
+                 "status": res.status, "headers": res.headers, "data": res.data, "error": res.error}
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        return res
+
+
+class ReplayTransport:
+    """
+    Serves responses from a RecordingTransport session. Identical requests are
+    answered in the order they were recorded; unknown requests get a 404.
+    """
+    def __init__(self, path):
+        self._responses = {}
+        self._lock = threading.Lock()
+        with open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._responses.setdefault(self._key(entry["method"], entry["path"], entry["body"]), []).append(entry)
+
+    @staticmethod
+    def _key(method, path, body):
+        return (method, path, json.dumps(body, sort_keys=True))
+
+    def check_auth(self):
+        return True
+
+    def request(self, method, path, body=None):
+        with self._lock:
+            queue = self._responses.get(self._key(method, path, body))
+            if not queue:
+                return ApiResponse(404, data={"message": f"No recorded response for {method} {path}"})
+            # Keep the last response around so repeated polls still get an answer
+            entry = queue.pop(0) if len(queue) > 1 else queue[0]
+        return ApiResponse(entry["status"], entry.get("headers"), entry.get("data"), entry.get("error"))
+
+
+def generate_fixture(repo="demo/synthetic", issues=1000, seed=0, members=20, milestones=6,
+                     closed_ratio=0.6, latency_ms=0, error_rate=0.0):
+    """
+    Builds a synthetic repo fixture: phase-labelled issues linked by `Derived from #N`
+    chains (requirement -> design -> dev -> test), with milestones and assignees.
+    """
+    rnd = random.Random(seed)
+    phases = ["requirement", "design", "dev", "test"]
+    domains = ["api", "ui", "db", "security", "ops"]
+    users = [f"dev-{n:02d}" for n in range(1, members + 1)]
+    start = datetime.datetime.combine(datetime.date.today() - datetime.timedelta(days=120), datetime.time())
+    due_dates = [(start + datetime.timedelta(days=30 * (n + 1))).date() for n in range(milestones)]
+
+    items = []
+    by_phase = {p: [] for p in phases}
+    for number in range(1, issues + 1):
+        # Roughly 10% requirements, then each later phase derives from the previous one
+        phase = "requirement" if number <= max(1, issues // 10) or not by_phase["requirement"] else rnd.choice(phases[1:])
+        parent = None
+        if phase != "requirement":
+            pool = by_phase[phases[phases.index(phase) - 1]] or by_phase["requirement"]
+            parent = rnd.choice(pool)
+
+        domain = rnd.choice(domains)
+        created = start + datetime.timedelta(days=rnd.randint(0, 110), seconds=number)
+        updated = created + datetime.timedelta(days=rnd.randint(0, 10))
+        body = "Synthetic task."
+        if parent:
+            body += f"\n\n> **Traceability**: Derived from #{parent}"
+        milestone_idx = rnd.randrange(milestones) if milestones else None
+
+        items.append({
+            "id": f"I_{number}",
+            "number": number,
+            "title": f"{phase.title()} {domain.upper()} task {number}" + (f" for #{parent}" if parent else ""),
+            "body": body,
+            "state": "closed" if rnd.random() < closed_ratio else "open",
+            "assignees": [{"login": rnd.choice(users)}] if rnd.random() < 0.85 else [],
+            "labels": [{"name": f"type:{phase}"}, {"name": f"domain:{domain}"}],
+            "milestone": {"title": f"M{milestone_idx + 1}", "dueOn": f"{due_dates[milestone_idx]}T00:00:00Z"} if milestone_idx is not None else None,
+            "createdAt": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "updatedAt": updated.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        })
+        by_phase[phase].append(number)
+
+    labels = [f"type:{p}" for p in phases] + [f"domain:{d}" for d in domains]
+    runs = [{"conclusion": "success", "status": "completed", "head_branch": "main"}]
+    return {
+        "settings": {"latency_ms": latency_ms, "error_rate": error_rate, "seed": seed},
+        "repos": {repo: {"issues": items, "labels": labels, "users": users, "runs": runs}},
+    }
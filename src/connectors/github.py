@@ -3,68 +3,481 @@ import shutil
 import subprocess
 import json
 import logging
+import re
 import time
 
+from src.connectors.issue import Issue
+from src.connectors.planner import QueryPlanner
+from src.connectors.scheduler import RequestScheduler
+from src.connectors.transport import GhCliTransport, is_idempotent
+from src.utils.tracing import tracer
+
 class GitHubConnector:
     """
     Connects to GitHub CLI (gh) with robust error handling and retries.
     """
-    def __init__(self, logger=None):
+    ISSUE_FIELDS = (
+        "number title state createdAt updatedAt "
+        "assignees(first: 10) { nodes { login } } "
+        "labels(first: 20) { nodes { name } } "
+        "milestone { title dueOn }"
+    )
+    STATE_FILTERS = {"open": ["OPEN"], "closed": ["CLOSED"], "all": ["OPEN", "CLOSED"]}
+
+    def __init__(self, logger=None, cache=None, offline=False, transport=None, scheduler=None):
         self.logger = logger or logging.getLogger(__name__)
+        # Every API request is paced, retried and (for bulk work) parallelised by the scheduler
+        self.scheduler = scheduler or RequestScheduler(logger=self.logger)
+        # Transport carrying REST/GraphQL requests: `gh api` subprocesses by default,
+        # or an in-process HttpTransport with pooled keep-alive connections
+        self.transport = transport or GhCliTransport(self.run_command, logger=self.logger)
+        self.cache = cache          # Optional IssueCache serving reads locally
+        self.offline = offline      # Serve reads from cache only, never hit the network
+        self._fresh_repos = set()   # Repos already refreshed during this process
+        # Coalesces overlapping fetch_issues() calls into one superset fetch per repo
+        self.planner = QueryPlanner(self._iter_source_issues, logger=self.logger)
         
     def check_auth(self):
-        if not shutil.which("gh"):
+        if isinstance(self.transport, GhCliTransport) and not shutil.which("gh"):
             self.logger.error("GitHub CLI (gh) not found.")
             return False
         try:
-            res = subprocess.run(["gh", "auth", "status"], capture_output=True)
-            return res.returncode == 0
+            return self.transport.check_auth()
         except Exception as e:
             self.logger.error(f"Auth check failed: {e}")
             return False
 
-    def run_command(self, cmd, check=True, retries=3):
+    def run_command(self, cmd, check=True, retries=3, input=None):
         """Execute gh command with retry logic."""
-        for attempt in range(retries):
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, check=check)
-                return result
-            except subprocess.CalledProcessError as e:
-                if attempt == retries - 1:
-                    if check: raise e
-                    return e # Return the error object if not raising
-                self.logger.warning(f"Command failed (attempt {attempt+1}/{retries}): {e.stderr.strip()}. Retrying...")
-                time.sleep(1) # Simple backoff
-            except Exception as e:
-                self.logger.error(f"System error: {e}")
-                raise e
-
-    def fetch_issues(self, repo, state="open", labels=None, limit=100):
-        cmd = ["gh", "issue", "list", "--repo", repo, "--state", state, "--json", "number,title,state,assignees,labels,milestone,createdAt", "--limit", str(limit)]
-        if labels:
-            for label in labels:
-                cmd.extend(["--label", label])
-        
+        with tracer.span(" ".join(cmd[:2]), "gh", cmd=cmd) as span:
+            for attempt in range(retries):
+                span.set(retries=attempt)
+                try:
+                    result = subprocess.run(cmd, capture_output=True, text=True, check=check, input=input)
+                    span.set(returncode=result.returncode)
+                    return result
+                except subprocess.CalledProcessError as e:
+                    if attempt == retries - 1:
+                        if check: raise e
+                        return e # Return the error object if not raising
+                    self.logger.warning(f"Command failed (attempt {attempt+1}/{retries}): {e.stderr.strip()}. Retrying...")
+                    time.sleep(self.scheduler.backoff_delay(attempt))
+                except Exception as e:
+                    self.logger.error(f"System error: {e}")
+                    raise e
+
+    def iter_issues(self, repo, state="open", labels=None, page_size=100, since=None, with_body=False):
+        """
+        Streams issues matching state/labels (no upper limit), as `Issue` records.
+        Multiple labels are AND-ed, matching `gh issue list --label a --label b`.
+        `since` (ISO-8601) keeps only issues updated at or after that time.
+        `with_body=True` also fetches issue bodies (`Issue.body`).
+        With a cache attached, the cache is refreshed incrementally once per process and
+        queries are answered from it.
+        """
+        snapshot = self.planner.covering(repo, labels, with_body)
+        if snapshot is not None:
+            for issue in self.planner.partition(snapshot, state, frozenset(labels or ())):
+                if since is None or (issue.updated_at or "") >= since:
+                    yield issue
+            return
+        yield from self._iter_source_issues(repo, state, labels, page_size, since, with_body)
+
+    def _iter_source_issues(self, repo, state="open", labels=None, page_size=100, since=None, with_body=False):
+        """Decodes issues from the cache (or straight from GitHub without one) into `Issue` records."""
+        if self.cache is None:
+            source = self.iter_remote_issues(
+                repo, state=state, labels=labels, page_size=page_size, since=since, with_body=with_body
+            )
+        else:
+            if self.offline:
+                if not self.cache.has_repo(repo):
+                    self.logger.warning(f"Offline mode: no cached issues for {repo}.")
+            elif repo not in self._fresh_repos:
+                self.refresh_cache(repo)
+            source = self.cache.iter_query(repo, state=state, labels=labels, since=since)
+
+        for data in source:
+            if not with_body:
+                # The cache always stores bodies; only keep them when asked for
+                data.pop("body", None)
+            yield Issue.from_dict(data)
+
+    @tracer.traced("cache refresh", "cache")
+    def refresh_cache(self, repo, full=False, batch_size=500):
+        """
+        Pulls issues updated since the repo's high-water mark into the cache.
+        `full=True` drops the cached copy and re-downloads everything.
+        Returns the number of issues fetched.
+        """
+        if full:
+            self.cache.clear(repo)
+        since = self.cache.high_water_mark(repo)
+        self.logger.info(f"Refreshing issue cache for {repo} (since: {since or 'beginning'})...")
+
+        count = 0
+        newest = ""
+        batch = []
+        for issue in self.iter_remote_issues(repo, state="all", since=since, with_body=True):
+            batch.append(issue)
+            newest = max(newest, issue.get("updatedAt") or "")
+            if len(batch) >= batch_size:
+                self.cache.upsert(repo, batch)
+                count += len(batch)
+                batch = []
+        self.cache.upsert(repo, batch)
+        count += len(batch)
+        # Only after the whole walk: it is ordered by creation, not by update, so an
+        # interrupted one may have missed updates older than the newest it stored.
+        # An empty repo still records its (empty) mark.
+        self.cache.advance_mark(repo, newest)
+
+        self._fresh_repos.add(repo)
+        self.logger.info(f"Issue cache refreshed: {count} updated issues.")
+        return count
+
+    def iter_remote_issues(self, repo, state="open", labels=None, page_size=100, since=None, with_body=False):
+        """
+        Streams issues straight from GitHub, page by page using GraphQL cursors.
+        Yields the normalized payload dicts the cache stores (see `iter_issues` for `Issue`s).
+        `since` (ISO-8601) restricts the walk to issues updated at or after that time.
+        `with_body=True` adds the issue body to each page (larger responses).
+        """
+        owner, name = repo.split("/", 1)
+        fields = self.ISSUE_FIELDS + (" body" if with_body else "")
+        query = (
+            "query IssuePage($owner: String!, $name: String!, $states: [IssueState!], "
+            "$labels: [String!], $filterBy: IssueFilters, $first: Int!, $after: String) { "
+            "repository(owner: $owner, name: $name) { "
+            "issues(first: $first, after: $after, states: $states, labels: $labels, filterBy: $filterBy, "
+            "orderBy: {field: CREATED_AT, direction: DESC}) { "
+            f"pageInfo {{ hasNextPage endCursor }} nodes {{ {fields} }} }} }} }}"
+        )
+        variables = {
+            "owner": owner,
+            "name": name,
+            "states": self.STATE_FILTERS.get(state, self.STATE_FILTERS["all"]),
+            "labels": list(labels) if labels else None,
+            "filterBy": {"since": since} if since else None,
+            "first": min(max(page_size, 1), 100),
+            "after": None,
+        }
+        required = set(labels or [])
+
+        while True:
+            response = self.graphql(query, variables)
+            repository = (response.get("data") or {}).get("repository")
+            if repository is None:
+                errors = "; ".join(e.get("message", "") for e in response.get("errors") or [])
+                raise RuntimeError(f"Issue query failed for {repo}: {errors or 'no data returned'}")
+
+            page = repository["issues"]
+            for node in page["nodes"]:
+                issue = self._normalize_issue(node)
+                # GraphQL ORs label filters; narrow down to issues carrying every label
+                if required and not required.issubset(l["name"] for l in issue["labels"]):
+                    continue
+                yield issue
+
+            if not page["pageInfo"]["hasNextPage"]:
+                return
+            variables["after"] = page["pageInfo"]["endCursor"]
+
+    @staticmethod
+    def _normalize_issue(node):
+        issue = {
+            "number": node["number"],
+            "title": node["title"],
+            "state": node["state"].lower(),
+            "assignees": (node.get("assignees") or {}).get("nodes", []),
+            "labels": (node.get("labels") or {}).get("nodes", []),
+            "milestone": node.get("milestone"),
+            "createdAt": node.get("createdAt"),
+            "updatedAt": node.get("updatedAt"),
+        }
+        if "body" in node:
+            issue["body"] = node["body"] or ""
+        return issue
+
+    def fetch_issues(self, repo, state="open", labels=None, limit=None, with_body=False, raise_errors=False):
+        """
+        Returns all matching issues as a list (optionally capped at `limit`).
+        Goes through the query planner, so e.g. an open and a closed query for the same
+        label cost a single round-trip.
+        Errors are logged and yield an empty list, unless `raise_errors` is set.
+        """
         try:
-            res = self.run_command(cmd)
-            return json.loads(res.stdout)
-        except Exception:
-            self.logger.error("Failed to fetch issues.")
+            return self.planner.query(repo, state=state, labels=labels, with_body=with_body)[:limit]
+        except Exception as e:
+            if raise_errors:
+                raise
+            self.logger.error(f"Failed to fetch issues: {e}")
             return []
 
+    def list_org_repos(self, org, include_archived=False, per_page=100):
+        """Returns the `owner/name` of every repository in an organization."""
+        repos = []
+        page = 1
+        while True:
+            res = self.api("GET", f"orgs/{org}/repos?per_page={per_page}&page={page}")
+            if not res.ok:
+                raise RuntimeError(f"Failed to list repositories of {org}: {res.error_message()}")
+            batch = res.data or []
+            repos.extend(r["full_name"] for r in batch if include_archived or not r.get("archived"))
+            if len(batch) < per_page:
+                return repos
+            page += 1
+
     def create_issue(self, repo, title, body, labels=None, assignees=None):
-        cmd = ["gh", "issue", "create", "--repo", repo, "--title", title, "--body", body]
-        if labels:
-            for label in labels:
-                cmd.extend(["--label", label])
-        if assignees:
-            for assignee in assignees:
-                cmd.extend(["--assignee", assignee])
-        
-        return self.run_command(cmd)
+        """Creates a single issue via REST. Returns the created issue payload."""
+        self._mark_stale(repo)
+        res = self.api("POST", f"repos/{repo}/issues", {
+            "title": title,
+            "body": body,
+            "labels": labels or [],
+            "assignees": assignees or []
+        })
+        if not res.ok:
+            raise RuntimeError(f"Failed to create issue '{title}': {res.error_message()}")
+        return res.data
 
     def close_issue(self, repo, issue_number, comment=None):
-        cmd = ["gh", "issue", "close", str(issue_number), "--repo", repo]
+        """Closes an issue (optionally commenting first). Returns True on success."""
+        self._mark_stale(repo)
         if comment:
-            cmd.extend(["--comment", comment])
-        return self.run_command(cmd, check=False)
+            res = self.api("POST", f"repos/{repo}/issues/{issue_number}/comments", {"body": comment})
+            if not res.ok:
+                self.logger.warning(f"Failed to comment on #{issue_number}: {res.error_message()}")
+        res = self.api("PATCH", f"repos/{repo}/issues/{issue_number}", {"state": "closed"})
+        if not res.ok:
+            self.logger.error(f"Failed to close #{issue_number}: {res.error_message()}")
+        return res.ok
+
+    def reopen_issue(self, repo, issue_number, comment=None):
+        """Reopens a closed issue (optionally commenting first). Returns True on success."""
+        self._mark_stale(repo)
+        if comment:
+            res = self.api("POST", f"repos/{repo}/issues/{issue_number}/comments", {"body": comment})
+            if not res.ok:
+                self.logger.warning(f"Failed to comment on #{issue_number}: {res.error_message()}")
+        res = self.api("PATCH", f"repos/{repo}/issues/{issue_number}", {"state": "open"})
+        if not res.ok:
+            self.logger.error(f"Failed to reopen #{issue_number}: {res.error_message()}")
+        return res.ok
+
+    def fetch_workflow_runs(self, repo, limit=1):
+        """Returns the latest GitHub Actions runs (newest first)."""
+        res = self.api("GET", f"repos/{repo}/actions/runs?per_page={limit}")
+        if not res.ok:
+            raise RuntimeError(f"Failed to fetch CI runs for {repo}: {res.error_message()}")
+        return (res.data or {}).get("workflow_runs", [])[:limit]
+
+    def expire(self, repo):
+        """Makes the next read check GitHub for updates again (incremental when cached)."""
+        self._mark_stale(repo)
+
+    def _mark_stale(self, repo):
+        """Forgets cached reads for a repo after a write."""
+        self._fresh_repos.discard(repo)
+        self.planner.invalidate(repo)
+
+    def api(self, method, path, body=None):
+        """Sends a REST request through the configured transport. Returns an ApiResponse."""
+        with tracer.span(f"api {method} {path.split('?')[0]}", "api") as span:
+            res = self.scheduler.execute(lambda: self.transport.request(method, path, body),
+                                         idempotent=is_idempotent(method, body))
+            span.set(status=res.status, retries=res.retries)
+            return res
+
+    def graphql(self, query, variables=None):
+        """Runs a GraphQL request through the configured transport and returns the decoded response."""
+        body = {"query": query, "variables": variables or {}}
+        operation = re.match(r"\s*(?:query|mutation)\s+(\w+)", query)
+        scalars = {k: v for k, v in (variables or {}).items() if isinstance(v, (str, int, float))}
+        with tracer.span(f"graphql {operation.group(1) if operation else 'anonymous'}", "api",
+                         variables=scalars, inputs=len(variables or {})) as span:
+            res = self.scheduler.execute(lambda: self.transport.request("POST", "graphql", body),
+                                         idempotent=is_idempotent("POST", body))
+            span.set(status=res.status, retries=res.retries)
+        if isinstance(res.data, dict) and ("data" in res.data or "errors" in res.data):
+            return res.data
+        return {"errors": [{"message": res.error_message()}]}
+
+    def resolve_node_ids(self, repo, labels=(), assignees=()):
+        """
+        Resolves repository, label and user node IDs in one aliased query.
+        Returns (repo_id, {label: id}, {login: id}); unknown names are omitted.
+        """
+        owner, name = repo.split("/", 1)
+        labels, assignees = sorted(set(labels)), sorted(set(assignees))
+
+        params = ["$owner: String!", "$name: String!"]
+        variables = {"owner": owner, "name": name}
+        label_fields, user_fields = [], []
+        for idx, label in enumerate(labels):
+            params.append(f"$l{idx}: String!")
+            variables[f"l{idx}"] = label
+            label_fields.append(f"l{idx}: label(name: $l{idx}) {{ id }}")
+        for idx, login in enumerate(assignees):
+            params.append(f"$u{idx}: String!")
+            variables[f"u{idx}"] = login
+            user_fields.append(f"u{idx}: user(login: $u{idx}) {{ id }}")
+
+        query = (
+            f"query ResolveIds({', '.join(params)}) {{ "
+            f"repository(owner: $owner, name: $name) {{ id {' '.join(label_fields)} }} "
+            f"{' '.join(user_fields)} }}"
+        )
+        data = self.graphql(query, variables).get("data") or {}
+        repository = data.get("repository") or {}
+
+        label_ids = {l: repository[f"l{i}"]["id"] for i, l in enumerate(labels) if repository.get(f"l{i}")}
+        user_ids = {u: data[f"u{i}"]["id"] for i, u in enumerate(assignees) if data.get(f"u{i}")}
+        return repository.get("id"), label_ids, user_ids
+
+    def create_issues(self, repo, tasks, batch_size=25):
+        """
+        Bulk-creates issues by packing aliased `createIssue` mutations into one GraphQL call per batch.
+        Tasks are dicts: {"title": str, "body": str, "labels": list, "assignees": list}
+        Returns one result per task (same order): {"title", "ok", "number", "url", "error"}.
+        """
+        self._mark_stale(repo)
+        batches = [tasks[start:start + batch_size] for start in range(0, len(tasks), batch_size)]
+        results = []
+        for batch_results in self.scheduler.map(lambda batch: self._create_issue_batch(repo, batch), batches):
+            results.extend(batch_results)
+        return results
+
+    def close_issues(self, repo, issue_numbers, comment=None, batch_size=25):
+        """
+        Bulk-closes issues (optionally commenting first) with aliased `addComment` +
+        `closeIssue` mutations, one GraphQL call per batch, batches run on the worker pool.
+        Returns one result per issue (same order): {"number", "ok", "error"}.
+        """
+        return self._set_issue_states(repo, issue_numbers, "closeIssue", comment, batch_size)
+
+    def reopen_issues(self, repo, issue_numbers, comment=None, batch_size=25):
+        """Bulk counterpart of `reopen_issue`; same contract as `close_issues`."""
+        return self._set_issue_states(repo, issue_numbers, "reopenIssue", comment, batch_size)
+
+    def _set_issue_states(self, repo, issue_numbers, mutation_name, comment, batch_size):
+        self._mark_stale(repo)
+        numbers = [int(n) for n in issue_numbers]
+        batches = [numbers[start:start + batch_size] for start in range(0, len(numbers), batch_size)]
+        results = []
+        for batch_results in self.scheduler.map(
+            lambda batch: self._set_issue_state_batch(repo, batch, mutation_name, comment), batches
+        ):
+            results.extend(batch_results)
+        return results
+
+    def _set_issue_state_batch(self, repo, batch, mutation_name, comment):
+        owner, name = repo.split("/", 1)
+        params = ["$owner: String!", "$name: String!"]
+        variables = {"owner": owner, "name": name}
+        fields = []
+        for idx, number in enumerate(batch):
+            params.append(f"$n{idx}: Int!")
+            variables[f"n{idx}"] = number
+            fields.append(f"n{idx}: issue(number: $n{idx}) {{ id }}")
+        query = f"query ResolveIssueIds({', '.join(params)}) {{ repository(owner: $owner, name: $name) {{ {' '.join(fields)} }} }}"
+        try:
+            response = self.graphql(query, variables)
+        except Exception as e:
+            response = {"errors": [{"message": str(e)}]}
+        repository = (response.get("data") or {}).get("repository") or {}
+        node_ids = {n: repository[f"n{i}"]["id"] for i, n in enumerate(batch) if repository.get(f"n{i}")}
+
+        results = {n: {"number": n, "ok": False, "error": f"Issue #{n} not found in {repo}."} for n in batch}
+        if not node_ids:
+            if response.get("errors"):
+                for result in results.values():
+                    result["error"] = response["errors"][0].get("message", "Unknown error")
+            return [results[n] for n in batch]
+
+        # Top-level mutation fields run in order, so each comment lands before its close
+        params, fields, variables = [], [], {}
+        for idx, number in enumerate(batch):
+            if number not in node_ids:
+                continue
+            if comment:
+                params.append(f"$c{idx}: AddCommentInput!")
+                fields.append(f"c{idx}: addComment(input: $c{idx}) {{ clientMutationId }}")
+                variables[f"c{idx}"] = {"subjectId": node_ids[number], "body": comment}
+            params.append(f"$s{idx}: {mutation_name[0].upper()}{mutation_name[1:]}Input!")
+            fields.append(f"s{idx}: {mutation_name}(input: $s{idx}) {{ issue {{ number state }} }}")
+            variables[f"s{idx}"] = {"issueId": node_ids[number]}
+        operation = "CloseIssues" if mutation_name == "closeIssue" else "ReopenIssues"
+        mutation = f"mutation {operation}({', '.join(params)}) {{ {' '.join(fields)} }}"
+
+        try:
+            response = self.graphql(mutation, variables)
+        except Exception as e:
+            response = {"errors": [{"message": str(e)}]}
+
+        data = response.get("data") or {}
+        errors = {}
+        for err in response.get("errors") or []:
+            alias = (err.get("path") or [None])[0]
+            errors.setdefault(alias, err.get("message", "Unknown error"))
+
+        for idx, number in enumerate(batch):
+            if number not in node_ids:
+                continue
+            if (data.get(f"s{idx}") or {}).get("issue"):
+                results[number].update(ok=True, error=None)
+                if f"c{idx}" in errors:
+                    self.logger.warning(f"Failed to comment on #{number}: {errors[f'c{idx}']}")
+            else:
+                results[number]["error"] = errors.get(f"s{idx}") or errors.get(None) or "Issue state was not changed."
+        return [results[n] for n in batch]
+
+    def _create_issue_batch(self, repo, batch):
+        labels = [l for t in batch for l in (t.get("labels") or [])]
+        assignees = [a for t in batch for a in (t.get("assignees") or [])]
+        try:
+            repo_id, label_ids, user_ids = self.resolve_node_ids(repo, labels, assignees)
+            error = f"Repository '{repo}' not found or not accessible."
+        except Exception as e:
+            repo_id, error = None, str(e)
+        if not repo_id:
+            return [{"title": t["title"], "ok": False, "number": None, "url": None, "error": error} for t in batch]
+
+        for missing in sorted(set(labels) - set(label_ids)):
+            self.logger.warning(f"Label '{missing}' not found in {repo}. Skipping it.")
+        for missing in sorted(set(assignees) - set(user_ids)):
+            self.logger.warning(f"User '{missing}' not found. Skipping assignment.")
+
+        params, fields, variables = [], [], {}
+        for idx, task in enumerate(batch):
+            params.append(f"$i{idx}: CreateIssueInput!")
+            fields.append(f"t{idx}: createIssue(input: $i{idx}) {{ issue {{ number url }} }}")
+            variables[f"i{idx}"] = {
+                "repositoryId": repo_id,
+                "title": task["title"],
+                "body": task.get("body", ""),
+                "labelIds": [label_ids[l] for l in (task.get("labels") or []) if l in label_ids],
+                "assigneeIds": [user_ids[a] for a in (task.get("assignees") or []) if a in user_ids],
+            }
+        mutation = f"mutation CreateIssues({', '.join(params)}) {{ {' '.join(fields)} }}"
+
+        try:
+            response = self.graphql(mutation, variables)
+        except Exception as e:
+            response = {"errors": [{"message": str(e)}]}
+
+        data = response.get("data") or {}
+        errors = {}
+        for err in response.get("errors") or []:
+            alias = (err.get("path") or [None])[0]
+            errors.setdefault(alias, err.get("message", "Unknown error"))
+
+        results = []
+        for idx, task in enumerate(batch):
+            issue = (data.get(f"t{idx}") or {}).get("issue")
+            if issue:
+                results.append({"title": task["title"], "ok": True, "number": issue["number"], "url": issue["url"], "error": None})
+            else:
+                error = errors.get(f"t{idx}") or errors.get(None) or "Issue was not created."
+                results.append({"title": task["title"], "ok": False, "number": None, "url": None, "error": error})
+        return results
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import datetime
+import sys
+
+def _ordinal(timestamp):
+    """ISO-8601 timestamp/date -> proleptic Gregorian day ordinal (None stays None)."""
+    if not timestamp:
+        return None
+    return datetime.date.fromisoformat(timestamp[:10]).toordinal()
+
+
+class Issue:
+    """
+    Compact, decoded GitHub issue. The connector builds these once from the raw
+    payload; everything downstream reads plain attributes instead of nested JSON.
+    Label names, assignee logins and milestone titles are interned (a handful of
+    distinct values shared by thousands of issues), dates are day ordinals, and
+    `phase` is the `type:` label without its prefix (None if there is none).
+    `updated_at` keeps GitHub's exact timestamp, for watermarks and change checks.
+    `body` is None unless bodies were requested.
+    """
+    __slots__ = ("number", "title", "state", "labels", "assignees", "milestone",
+                 "due", "created", "updated", "updated_at", "phase", "body")
+
+    def __init__(self, number, title="", state="open", labels=(), assignees=(), milestone=None,
+                 due=None, created=None, updated_at=None, body=None):
+        self.number = number
+        self.title = title
+        self.state = state
+        self.labels = tuple(sys.intern(l) for l in labels)
+        self.assignees = tuple(sys.intern(a) for a in assignees)
+        self.milestone = sys.intern(milestone) if milestone else None
+        self.due = due
+        self.created = created
+        self.updated_at = updated_at
+        self.updated = _ordinal(updated_at)
+        self.body = body
+        self.phase = next((sys.intern(l[5:]) for l in self.labels if l.startswith("type:")), None)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Decodes a normalized issue payload (as stored in the cache)."""
+        milestone = data.get("milestone") or {}
+        return cls(
+            number=data["number"],
+            title=data["title"],
+            state=data["state"].lower(),
+            labels=[l["name"] for l in data.get("labels") or ()],
+            assignees=[a["login"] for a in data.get("assignees") or ()],
+            milestone=milestone.get("title"),
+            due=_ordinal(milestone.get("dueOn")),
+            created=_ordinal(data.get("createdAt")),
+            updated_at=data.get("updatedAt"),
+            body=data.get("body"),
+        )
+
+    @property
+    def is_closed(self):
+        return self.state == "closed"
+
+    @property
+    def due_date(self):
+        return datetime.date.fromordinal(self.due) if self.due is not None else None
+
+    @property
+    def created_date(self):
+        return datetime.date.fromordinal(self.created) if self.created is not None else None
+
+    def has_labels(self, labels):
+        """True if the issue carries every label in `labels`."""
+        return all(l in self.labels for l in labels)
+
+    def __repr__(self):
+        return f"Issue(#{self.number} {self.title!r}, {self.state})"
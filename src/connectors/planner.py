@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import logging
+import threading
+
+class QueryPlanner:
+    """
+    Per-process query planner for issue reads.
+    Overlapping (repo, state, labels) queries are answered from a single superset
+    snapshot fetched with state=all, partitioned in memory.
+    A snapshot fetched with issue bodies also answers queries that do not need them.
+    """
+    def __init__(self, fetch, logger=None):
+        self.fetch = fetch  # fetch(repo, state, labels, with_body=...) -> iterable of issues
+        self.logger = logger or logging.getLogger(__name__)
+        self._snapshots = {}  # repo -> [(frozenset(labels), with_body, [issues])]
+        self._lock = threading.Lock()
+        self.round_trips = 0
+
+    def plan(self, repo, queries, with_body=False):
+        """
+        Pre-fetches one snapshot covering every (state, labels) query in `queries`.
+        The superset uses the labels common to all queries (none -> whole repo).
+        """
+        label_sets = [frozenset(labels or ()) for _state, labels in queries]
+        common = frozenset.intersection(*label_sets) if label_sets else frozenset()
+        if self.covering(repo, common, with_body) is None:
+            self._load(repo, common, with_body)
+
+    def covering(self, repo, labels, with_body=False):
+        """Returns a cached snapshot whose label filter is a subset of `labels`, or None."""
+        labels = frozenset(labels or ())
+        with self._lock:
+            candidates = [
+                (l, issues) for l, has_body, issues in self._snapshots.get(repo, [])
+                if l <= labels and (has_body or not with_body)
+            ]
+        if not candidates:
+            return None
+        # The most specific snapshot means the least in-memory filtering
+        return max(candidates, key=lambda c: len(c[0]))[1]
+
+    def _load(self, repo, labels, with_body=False):
+        issues = list(self.fetch(repo, "all", sorted(labels), with_body=with_body))
+        with self._lock:
+            self.round_trips += 1
+            self._snapshots.setdefault(repo, []).append((labels, with_body, issues))
+        return issues
+
+    def query(self, repo, state="open", labels=None, with_body=False):
+        """Answers a query from a covering snapshot, fetching a state=all superset if needed."""
+        labels = frozenset(labels or ())
+        issues = self.covering(repo, labels, with_body)
+        if issues is None:
+            issues = self._load(repo, labels, with_body)
+        return self.partition(issues, state, labels)
+
+    @staticmethod
+    def partition(issues, state, labels):
+        return [
+            i for i in issues
+            if (state not in ("open", "closed") or i.state == state)
+            and (not labels or i.has_labels(labels))
+        ]
+
+    def invalidate(self, repo):
+        with self._lock:
+            self._snapshots.pop(repo, None)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, bursts of up to `capacity`.
+    A rate of None disables pacing.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = float(rate) if rate else None
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Blocks until a token is available, then consumes it."""
+        if self.rate is None:
+            return
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    @property
+    def available(self):
+        if self.rate is None:
+            return self.capacity
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+
+class RequestScheduler:
+    """
+    Central rate-limit-aware scheduler for GitHub requests.
+    - Paces requests with a token bucket and a bounded worker pool.
+    - Tracks the primary limit (x-ratelimit-remaining/reset) and pauses when the budget runs out.
+    - Backs off with full jitter on 403/429 (secondary limits), and on 5xx and transport errors
+      for idempotent requests only: a failed write may still have been applied.
+    """
+    def __init__(self, max_workers=4, rate=15.0, burst=30, max_retries=4, base_delay=1.0,
+                 max_delay=60.0, secondary_delay=60.0, reserve=0, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.secondary_delay = secondary_delay
+        self.reserve = reserve  # Requests to keep in hand when the primary budget runs low
+
+        self.bucket = TokenBucket(rate, burst)
+        self.remaining = None   # Primary budget left, from the latest response headers
+        self.limit = None
+        self.reset_at = None    # Epoch seconds when the primary budget resets
+        self._pause_until = 0.0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    # --- Introspection ---
+
+    @property
+    def queue_depth(self):
+        """Number of submitted jobs that have not finished yet."""
+        return self._pending
+
+    def stats(self):
+        return {
+            "queue_depth": self._pending,
+            "remaining": self.remaining,
+            "limit": self.limit,
+            "reset_at": self.reset_at,
+            "tokens": round(self.bucket.available, 2),
+        }
+
+    # --- Throttling ---
+
+    def backoff_delay(self, attempt):
+        """Exponential backoff with full jitter for the given 0-based attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def observe(self, headers):
+        """Updates the primary rate-limit view from response headers."""
+        if not headers:
+            return
+        with self._lock:
+            if "x-ratelimit-remaining" in headers:
+                self.remaining = int(headers["x-ratelimit-remaining"])
+            if "x-ratelimit-limit" in headers:
+                self.limit = int(headers["x-ratelimit-limit"])
+            if "x-ratelimit-reset" in headers:
+                self.reset_at = int(headers["x-ratelimit-reset"])
+            if self.remaining is not None and self.remaining <= self.reserve and self.reset_at:
+                self._pause_until = max(self._pause_until, float(self.reset_at))
+
+    def _pause(self, seconds):
+        with self._lock:
+            self._pause_until = max(self._pause_until, time.time() + seconds)
+
+    def _wait_for_budget(self):
+        while True:
+            with self._lock:
+                wait = self._pause_until - time.time()
+            if wait <= 0:
+                break
+            self.logger.warning(f"Rate limit reached. Pausing requests for {wait:.1f}s...")
+            time.sleep(min(wait, self.max_delay))
+        self.bucket.acquire()
+
+    def _retry_delay(self, res, attempt, idempotent=False):
+        """Returns how long to wait before retrying `res`, or None if it should not be retried."""
+        headers = res.headers or {}
+        rate_limited = res.status == 429 or (res.status == 403 and (
+            "retry-after" in headers or headers.get("x-ratelimit-remaining") == "0"
+            or "rate limit" in res.error_message().lower()
+        ))
+        if not rate_limited and isinstance(res.data, dict):
+            # GraphQL reports rate limiting inside a 200 response
+            rate_limited = any(e.get("type") == "RATE_LIMITED" for e in res.data.get("errors") or [])
+
+        if rate_limited:
+            if "retry-after" in headers:
+                return float(headers["retry-after"])
+            if headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers:
+                return max(0.0, int(headers["x-ratelimit-reset"]) - time.time()) + 1
+            # Secondary limit without hints: wait at least the documented minimum, plus jitter
+            return self.secondary_delay + self.backoff_delay(attempt)
+        if idempotent and (res.status == 0 or res.status >= 500):
+            return self.backoff_delay(attempt)
+        return None
+
+    def execute(self, send, idempotent=False):
+        """
+        Runs `send()` (returning an ApiResponse) in the calling thread, honouring the
+        current budget and retrying throttled requests. Transient failures (transport
+        errors, 5xx) are only retried when `idempotent` says a resend cannot apply the
+        request twice; otherwise they are returned to the caller as they are.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_budget()
+            res = send()
+            res.retries = attempt
+            self.observe(res.headers)
+
+            delay = self._retry_delay(res, attempt, idempotent)
+            if delay is None or attempt == self.max_retries:
+                return res
+            self.logger.warning(f"Request throttled or failed ({res.error_message()}). "
+                                f"Retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})...")
+            if res.status in (403, 429):
+                # Hold back every worker, not just this one
+                self._pause(delay)
+            else:
+                time.sleep(delay)
+        return res
+
+    # --- Worker pool ---
+
+    def submit(self, fn, *args, **kwargs):
+        """Queues `fn(*args, **kwargs)` on the bounded worker pool. Returns a Future."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gh")
+            self._pending += 1
+        future = self._executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def map(self, fn, items):
+        """Runs `fn(item)` for every item on the pool and returns results in input order."""
+        futures = [self.submit(fn, item) for item in items]
+        return [f.result() for f in futures]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+import http.client
+import json
+import logging
+import os
+import queue
+import select
+import subprocess
+import threading
+import urllib.parse
+
+# Methods that change nothing more when sent twice (RFC 9110)
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+def is_idempotent(method, body=None):
+    """True if sending the request twice cannot apply it twice: an idempotent method or a GraphQL query."""
+    if method.upper() in IDEMPOTENT_METHODS:
+        return True
+    # GraphQL queries are POSTs too, but only mutations change anything
+    query = body.get("query", "") if isinstance(body, dict) else ""
+    return query.lstrip().startswith(("query", "{"))
+
+
+class ApiResponse:
+    """
+    Transport-neutral API response: HTTP status, lower-cased headers and decoded JSON body.
+    """
+    def __init__(self, status, headers=None, data=None, error=None):
+        self.status = status
+        self.headers = headers or {}
+        self.data = data
+        self.error = error
+        self.retries = 0  # Set by the scheduler when the request had to be retried
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    def error_message(self):
+        if self.error:
+            return self.error
+        if isinstance(self.data, dict) and self.data.get("message"):
+            return f"HTTP {self.status}: {self.data['message']}"
+        return f"HTTP {self.status}"
+
+
+class GhCliTransport:
+    """
+    Default transport: one `gh api --include` subprocess per request.
+    """
+    def __init__(self, run_command, logger=None):
+        self.run_command = run_command
+        self.logger = logger or logging.getLogger(__name__)
+
+    def check_auth(self):
+        res = self.run_command(["gh", "auth", "status"], check=False)
+        return res.returncode == 0
+
+    def request(self, method, path, body=None):
+        cmd = ["gh", "api", "--include", "-X", method, path]
+        payload = None
+        if body is not None:
+            cmd.extend(["--input", "-"])
+            payload = json.dumps(body)
+        res = self.run_command(cmd, check=False, input=payload)
+        if not res.stdout:
+            return ApiResponse(0, error=(res.stderr or "").strip() or "Empty response from gh")
+        return self.parse_included(res.stdout)
+
+    @staticmethod
+    def parse_included(output):
+        """Parses `gh api --include` output: status line, headers, blank line, body."""
+        head, sep, body = output.replace("\r\n", "\n").partition("\n\n")
+        if not sep:
+            head, body = "", output
+        lines = head.split("\n")
+        status = 0
+        if lines and lines[0].startswith("HTTP/"):
+            status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        try:
+            data = json.loads(body) if body.strip() else None
+        except ValueError:
+            data = None
+        return ApiResponse(status, headers, data)
+
+
+class HttpTransport:
+    """
+    In-process transport over pooled keep-alive `http.client` connections.
+    The token is read once (GH_TOKEN / GITHUB_TOKEN, else `gh auth token`).
+    A request that fails mid-flight is only resent when that cannot apply it twice: an
+    idempotent method or GraphQL query, or a write to a reused connection that failed
+    before the request was sent.
+    """
+    def __init__(self, token=None, base_url="https://api.github.com", pool_size=8, timeout=30, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.token = token or self._load_token()
+        self.timeout = timeout
+
+        parsed = urllib.parse.urlsplit(base_url)
+        self.scheme = parsed.scheme
+        self.host = parsed.netloc
+        self.base_path = parsed.path.rstrip("/")
+
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _load_token(self):
+        token = os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN")
+        if token:
+            return token
+        try:
+            res = subprocess.run(["gh", "auth", "token"], capture_output=True, text=True)
+            if res.returncode == 0:
+                return res.stdout.strip()
+        except OSError as e:
+            self.logger.error(f"Could not read token from gh: {e}")
+        return None
+
+    def check_auth(self):
+        if not self.token:
+            self.logger.error("No GitHub token available (set GH_TOKEN or run `gh auth login`).")
+            return False
+        return self.request("GET", "user").ok
+
+    def _url(self, path):
+        if path.startswith("/"):
+            return path
+        # GitHub Enterprise serves GraphQL at /api/graphql next to the /api/v3 REST root
+        if path == "graphql" and self.base_path.endswith("/api/v3"):
+            return self.base_path[:-len("/v3")] + "/graphql"
+        return f"{self.base_path}/{path}"
+
+    def _acquire(self):
+        """Returns (connection, reused). Pooled connections the server has since closed are discarded."""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            if self._is_dropped(conn):
+                conn.close()
+                continue
+            return conn, True
+        with self._lock:
+            self.connections_opened += 1
+        conn_cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return conn_cls(self.host, timeout=self.timeout), False
+
+    @staticmethod
+    def _is_dropped(conn):
+        """An idle keep-alive socket that is readable has hit EOF (or stray data): don't reuse it."""
+        if conn.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def request(self, method, path, body=None):
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "project-manager",
+            "Connection": "keep-alive",
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        url = self._url(path)
+        idempotent = is_idempotent(method, body)
+        # A connection may drop under us; retry once on a fresh one, unless the request may already have been applied
+        for attempt in range(2):
+            conn, reused = self._acquire()
+            sent = False
+            try:
+                conn.request(method, url, body=payload, headers=headers)
+                sent = True
+                resp = conn.getresponse()
+                raw = resp.read()
+            except (http.client.HTTPException, ConnectionError) as e:
+                conn.close()
+                if attempt == 0 and (idempotent or (reused and not sent)):
+                    continue
+                return ApiResponse(0, error=f"Connection error: {e}")
+            except OSError as e:
+                conn.close()
+                return ApiResponse(0, error=f"Connection error: {e}")
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+
+            try:
+                data = json.loads(raw) if raw else None
+            except ValueError:
+                data = None
+            return ApiResponse(resp.status, {k.lower(): v for k, v in resp.getheaders()}, data)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
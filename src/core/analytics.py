@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+import datetime
+from array import array
+
+NO_DATE = 0  # Ordinal 0 is not a valid date; marks a missing created/due date
+
+# Issue count from which `compute` vectorizes with NumPy. Importing it costs ~0.1 s, which the
+# pure-Python pass (~0.6 µs per row) only makes up on large issue sets. Best of 5 cold runs,
+# NumPy import included (pure Python / NumPy): 100k rows 0.06 / 0.13 s, 200k 0.11 / 0.16 s,
+# 300k 0.17 / 0.14 s, 500k 0.30 / 0.19 s, 1M 0.65 / 0.22 s.
+NUMPY_MIN_ROWS = 250_000
+
+_np = None  # NumPy module once imported, False when it is not installed
+
+def _numpy():
+    """NumPy, imported on first use; None when not installed (optional dependency)."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _np = numpy
+    return _np or None
+
+
+class IssueColumns:
+    """
+    An issue set loaded once into parallel column arrays (one row per issue):
+    `closed`/`done` flags, `phase` code, `created`/`due`/`updated` day ordinals and the
+    number of assignees. Assignments are a separate (row, assignee code) pair of columns, so an
+    issue with several assignees counts towards each of them.
+    Codes index into `phases` / `assignees`.
+    """
+    def __init__(self):
+        self.closed = array("b")
+        self.done = array("b")
+        self.phase = array("i")
+        self.created = array("i")
+        self.due = array("i")
+        self.updated = array("i")
+        self.n_assignees = array("b")
+        self.assign_row = array("i")
+        self.assign_code = array("i")
+        self.phases = []       # code -> phase name
+        self.assignees = []    # code -> login
+        self._phase_codes = {}
+        self._assignee_codes = {}
+
+    def __len__(self):
+        return len(self.closed)
+
+    def _code(self, codes, names, value):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+
+    def append(self, closed, phase, assignees, created=None, due=None, done=None, updated=None):
+        row = len(self.closed)
+        self.closed.append(1 if closed else 0)
+        self.done.append(1 if (closed if done is None else done) else 0)
+        self.phase.append(self._code(self._phase_codes, self.phases, phase or "Other"))
+        self.created.append(created or NO_DATE)
+        self.due.append(due or NO_DATE)
+        self.updated.append(updated or NO_DATE)
+        self.n_assignees.append(min(len(assignees), 127))
+        for login in assignees:
+            self.assign_row.append(row)
+            self.assign_code.append(self._code(self._assignee_codes, self.assignees, login))
+
+    @classmethod
+    def from_issues(cls, issues):
+        """Loads `Issue` records (see src/connectors/issue.py), a column at a time."""
+        columns = cls()
+        phase_code = columns._phase_codes
+        assignee_code = columns._assignee_codes
+        for i in issues:
+            phase = i.phase or "Other"
+            if phase not in phase_code:
+                phase_code[phase] = len(columns.phases)
+                columns.phases.append(phase)
+            for login in i.assignees:
+                if login not in assignee_code:
+                    assignee_code[login] = len(columns.assignees)
+                    columns.assignees.append(login)
+
+        columns.closed = array("b", [i.state == "closed" for i in issues])
+        columns.done = array("b", columns.closed)
+        columns.phase = array("i", [phase_code[i.phase or "Other"] for i in issues])
+        columns.created = array("i", [i.created or NO_DATE for i in issues])
+        columns.due = array("i", [i.due or NO_DATE for i in issues])
+        columns.updated = array("i", [i.updated or NO_DATE for i in issues])
+        columns.n_assignees = array("b", [min(len(i.assignees), 127) for i in issues])
+        columns.assign_row = array("i", [row for row, i in enumerate(issues) for _ in i.assignees])
+        columns.assign_code = array("i", [assignee_code[a] for i in issues for a in i.assignees])
+        return columns
+
+
+class Metrics:
+    """
+    Aggregates over an IssueColumns set. Per-phase figures are keyed by phase name,
+    `assignee_load` counts open issues per login; the `*_rows` lists are row indexes into
+    the source issue list, in input order (`stale_rows` is empty unless `stale_days` is set).
+    """
+    def __init__(self, total, closed, overdue_rows, due_soon_rows, unassigned_rows, stale_rows,
+                 phase_totals, phase_closed, phase_done, assignee_load):
+        self.total = total
+        self.closed = closed
+        self.open = total - closed
+        self.progress = int((closed / total) * 100) if total > 0 else 0
+        self.overdue_rows = overdue_rows
+        self.due_soon_rows = due_soon_rows
+        self.overdue = len(overdue_rows)
+        self.due_soon = len(due_soon_rows)
+        self.unassigned_rows = unassigned_rows
+        self.stale_rows = stale_rows
+        self.unassigned = len(unassigned_rows)
+        self.phase_totals = phase_totals
+        self.phase_closed = phase_closed
+        self.phase_done = phase_done
+        self.assignee_load = assignee_load
+
+    def summary(self):
+        """Headline numbers as a plain dict (report rollups, JSON output)."""
+        return {
+            "total": self.total,
+            "closed": self.closed,
+            "open": self.open,
+            "progress": self.progress,
+            "overdue": self.overdue,
+            "due_soon": self.due_soon,
+            "unassigned": self.unassigned,
+        }
+
+
+def compute(columns, today=None, grace_days=0, due_soon_days=2, stale_days=None):
+    """
+    Computes every aggregate in one pass over the columns (vectorized with NumPy when it
+    is installed and there are at least NUMPY_MIN_ROWS issues). An open issue is overdue
+    once `due + grace_days` is before `today`, and due soon when not overdue but due
+    within `due_soon_days`. With `stale_days`, open issues not updated for longer than
+    that are listed as stale.
+    """
+    today = (today or datetime.date.today()).toordinal()
+    if len(columns) >= NUMPY_MIN_ROWS and _numpy() is not None:
+        return _compute_numpy(columns, today, grace_days, due_soon_days, stale_days)
+    return _compute_python(columns, today, grace_days, due_soon_days, stale_days)
+
+
+def _compute_numpy(columns, today, grace_days, due_soon_days, stale_days):
+    np = _numpy()
+    n_phases, n_assignees = len(columns.phases), len(columns.assignees)
+    closed = np.frombuffer(columns.closed, dtype=np.int8).astype(bool)
+    done = np.frombuffer(columns.done, dtype=np.int8).astype(bool)
+    phase = np.frombuffer(columns.phase, dtype=np.int32)
+    due = np.frombuffer(columns.due, dtype=np.int32)
+    updated = np.frombuffer(columns.updated, dtype=np.int32)
+    n_assigned = np.frombuffer(columns.n_assignees, dtype=np.int8)
+    assign_row = np.frombuffer(columns.assign_row, dtype=np.int32)
+    assign_code = np.frombuffer(columns.assign_code, dtype=np.int32)
+
+    is_open = ~closed
+    dated = is_open & (due != NO_DATE)
+    days_left = due.astype(np.int64) + grace_days - today
+    overdue = dated & (days_left < 0)
+    due_soon = dated & (days_left >= 0) & (days_left - grace_days <= due_soon_days)
+    if stale_days is None:
+        stale_rows = []
+    else:
+        stale = is_open & (updated != NO_DATE) & (updated < today - stale_days)
+        stale_rows = np.flatnonzero(stale).tolist()
+
+    phase_totals = np.bincount(phase, minlength=n_phases)
+    phase_closed = np.bincount(phase[closed], minlength=n_phases)
+    phase_done = np.bincount(phase[done], minlength=n_phases)
+    load = np.bincount(assign_code[is_open[assign_row]], minlength=n_assignees)
+
+    return Metrics(
+        total=len(columns),
+        closed=int(closed.sum()),
+        overdue_rows=np.flatnonzero(overdue).tolist(),
+        due_soon_rows=np.flatnonzero(due_soon).tolist(),
+        unassigned_rows=np.flatnonzero(is_open & (n_assigned == 0)).tolist(),
+        stale_rows=stale_rows,
+        phase_totals=dict(zip(columns.phases, phase_totals.tolist())),
+        phase_closed=dict(zip(columns.phases, phase_closed.tolist())),
+        phase_done=dict(zip(columns.phases, phase_done.tolist())),
+        assignee_load={a: c for a, c in zip(columns.assignees, load.tolist()) if c},
+    )
+
+
+def _compute_python(columns, today, grace_days, due_soon_days, stale_days):
+    n_phases = len(columns.phases)
+    phase_totals = [0] * n_phases
+    phase_closed = [0] * n_phases
+    phase_done = [0] * n_phases
+    overdue_rows = []
+    due_soon_rows = []
+    unassigned_rows = []
+    stale_rows = []
+    closed_count = 0
+    overdue_before = today - grace_days
+    stale_before = today - stale_days if stale_days is not None else NO_DATE
+
+    for row, (closed, done, phase, due, updated, n_assigned) in enumerate(
+        zip(columns.closed, columns.done, columns.phase, columns.due, columns.updated, columns.n_assignees)
+    ):
+        phase_totals[phase] += 1
+        if done:
+            phase_done[phase] += 1
+        if closed:
+            closed_count += 1
+            phase_closed[phase] += 1
+            continue
+        if not n_assigned:
+            unassigned_rows.append(row)
+        if NO_DATE != updated < stale_before:
+            stale_rows.append(row)
+        if due != NO_DATE:
+            if due < overdue_before:
+                overdue_rows.append(row)
+            elif due - today <= due_soon_days:
+                due_soon_rows.append(row)
+
+    load = [0] * len(columns.assignees)
+    closed_col = columns.closed
+    for row, code in zip(columns.assign_row, columns.assign_code):
+        if not closed_col[row]:
+            load[code] += 1
+
+    return Metrics(
+        total=len(columns),
+        closed=closed_count,
+        overdue_rows=overdue_rows,
+        due_soon_rows=due_soon_rows,
+        unassigned_rows=unassigned_rows,
+        stale_rows=stale_rows,
+        phase_totals=dict(zip(columns.phases, phase_totals)),
+        phase_closed=dict(zip(columns.phases, phase_closed)),
+        phase_done=dict(zip(columns.phases, phase_done)),
+        assignee_load={a: c for a, c in zip(columns.assignees, load) if c},
+    )
+
+
+def analyze(issues, today=None, grace_days=0, due_soon_days=2, stale_days=None):
+    """Loads `Issue` records into columns and computes their Metrics."""
+    return compute(IssueColumns.from_issues(issues), today, grace_days, due_soon_days, stale_days)
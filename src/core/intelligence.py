@@ -5,6 +5,8 @@ import os
 import urllib.request
 import urllib.error
 
+from src.utils.tracing import tracer
+
 class IntelligenceEngine:
     """
     AI Engine supporting both Heuristics (Rule-based) and LLM (API-based).
@@ -116,8 +118,10 @@ class IntelligenceEngine:
                 }
             )
             
-            with urllib.request.urlopen(req) as response:
+            with tracer.span("llm chat/completions", "llm", model=payload["model"], prompt_chars=len(text)) as span, \
+                    urllib.request.urlopen(req) as response:
                 result = json.load(response)
+                span.set(status=response.status)
                 content = result['choices'][0]['message']['content']
                 
                 # Try to parse JSON from content (it might have markdown blocks)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import logging
+import os
+
+class SyncJournal:
+    """
+    Sidecar sync state for one markdown task file (`.<name>.sync.json` next to it).
+    Records, per linked issue, the line hash plus the local checkbox and remote state
+    agreed at the last sync, and a remote `updatedAt` watermark. This is the common
+    ancestor for three-way resolution and lets a run skip everything unchanged.
+    """
+    VERSION = 1
+
+    def __init__(self, path, repo, data=None):
+        self.path = path
+        self.repo = repo
+        data = data or {}
+        self.watermark = data.get("watermark")
+        self.file_hash = data.get("file_hash")
+        # issue number (str) -> {"hash", "local", "remote", "updatedAt"}; hash None marks a failed push
+        self.entries = data.get("entries", {})
+        # Titles of lines (without an #id) that matched no remote issue at the last sync
+        self.unmatched = set(data.get("unmatched", []))
+
+    def has_pending(self):
+        """True if an earlier run left a failed push behind (its entry has no line hash)."""
+        return any(entry.get("hash") is None for entry in self.entries.values())
+
+    @staticmethod
+    def path_for(local_path):
+        directory, name = os.path.split(os.path.abspath(local_path))
+        return os.path.join(directory, f".{name}.sync.json")
+
+    @classmethod
+    def load(cls, local_path, repo, logger=None):
+        """Loads the journal for a task file; starts fresh if missing, corrupt or for another repo."""
+        logger = logger or logging.getLogger(__name__)
+        path = cls.path_for(local_path)
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") == cls.VERSION and data.get("repo") == repo:
+                    return cls(path, repo, data)
+                logger.info(f"Sync journal {path} belongs to another repo/version. Starting fresh.")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Invalid sync journal {path}: {e}. Starting fresh.")
+        return cls(path, repo)
+
+    @staticmethod
+    def hash_line(line):
+        return hashlib.blake2b(line.rstrip("\n").encode("utf-8"), digest_size=8).hexdigest()
+
+    @staticmethod
+    def line_digest():
+        """Incremental digest matching `hash_lines` (for hashing lines as they stream past)."""
+        return hashlib.blake2b(digest_size=16)
+
+    @classmethod
+    def hash_lines(cls, lines):
+        digest = cls.line_digest()
+        for line in lines:
+            digest.update(line.encode("utf-8"))
+        return digest.hexdigest()
+
+    def advance(self, updated_at):
+        """Moves the watermark forward to `updated_at` (ISO-8601 strings compare in order)."""
+        if updated_at and (self.watermark is None or updated_at > self.watermark):
+            self.watermark = updated_at
+
+    def save(self):
+        data = {
+            "version": self.VERSION,
+            "repo": self.repo,
+            "watermark": self.watermark,
+            "file_hash": self.file_hash,
+            "entries": self.entries,
+            "unmatched": sorted(self.unmatched),
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
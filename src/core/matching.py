@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+import heapq
+
+INF = float("inf")
+
+class _Network:
+    """Residual graph in flat arrays: arc e runs to `to[e]` and its reverse is arc e ^ 1."""
+    def __init__(self, nodes):
+        self.adj = [[] for _ in range(nodes)]
+        self.to = []
+        self.cap = []
+        self.cost = []
+
+    def add(self, u, v, cap, cost):
+        e = len(self.to)
+        self.adj[u].append(e)
+        self.adj[v].append(e + 1)
+        self.to += (v, u)
+        self.cap += (cap, 0)
+        self.cost += (cost, -cost)
+        return e
+
+    def shortest_paths(self, potential, source, target):
+        """Dijkstra on reduced costs, stopping once `target` is settled. Returns dist."""
+        adj, to, cap, cost = self.adj, self.to, self.cap, self.cost
+        dist = [INF] * len(adj)
+        done = [False] * len(adj)
+        dist[source] = 0
+        heap = [(0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            if u == target:
+                break
+            pu = potential[u] + d
+            for e in adj[u]:
+                v = to[e]
+                if cap[e] > 0 and not done[v]:
+                    nd = pu + cost[e] - potential[v]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+        return dist
+
+    def max_flow(self, potential, source, target):
+        """Dinic's max flow restricted to arcs with zero reduced cost (all shortest paths)."""
+        adj, to, cap, cost = self.adj, self.to, self.cap, self.cost
+        while True:
+            level = [-1] * len(adj)
+            level[source] = 0
+            queue = [source]
+            for u in queue:
+                pu = potential[u]
+                for e in adj[u]:
+                    v = to[e]
+                    if level[v] < 0 and cap[e] > 0 and cost[e] + pu == potential[v]:
+                        level[v] = level[u] + 1
+                        queue.append(v)
+            if level[target] < 0:
+                return
+
+            current = [0] * len(adj)  # Next arc to try per node; dead arcs are never retried
+            path = []
+            u = source
+            while True:
+                if u == target:
+                    amount = min(cap[e] for e in path)
+                    for e in path:
+                        cap[e] -= amount
+                        cap[e ^ 1] += amount
+                    path = []
+                    u = source
+                    continue
+                arcs = adj[u]
+                i = current[u]
+                while i < len(arcs):
+                    e = arcs[i]
+                    v = to[e]
+                    if cap[e] > 0 and level[v] == level[u] + 1 and cost[e] + potential[u] == potential[v]:
+                        break
+                    i += 1
+                current[u] = i
+                if i < len(arcs):
+                    path.append(arcs[i])
+                    u = to[arcs[i]]
+                elif u == source:
+                    break
+                else:  # Dead end: retreat and skip the arc that led here
+                    u = to[path.pop() ^ 1]
+                    current[u] += 1
+
+
+def max_profit_transport(supply, capacity, profit):
+    """
+    Transportation problem as a min-cost flow: ships `supply[k]` units from each source k
+    to sinks j holding at most `capacity[j]`, earning `profit[k][j]` per unit (`profit[k]`
+    is a {j: profit > 0} dict; any other pair earns 0). Ships as many units as capacity
+    allows and, among those plans, earns the most.
+
+    The graph only has arcs for the profitable pairs, plus one zero-profit overflow node
+    linking every source to every sink. Each primal-dual phase runs Dijkstra on reduced
+    costs for new potentials, then a max flow over the zero reduced-cost arcs; with
+    integer profits that takes at most max(profit) + 1 phases. Returns flow[k] as {j: units}.
+    """
+    K, J = len(supply), len(capacity)
+    # Nodes: source, K sources, overflow, J sinks, target
+    source, overflow, target = 0, K + 1, K + J + 2
+    unlimited = sum(supply)
+    net = _Network(K + J + 3)
+    potential = [0] * (K + J + 3)
+    pairs = []
+    for k in range(K):
+        net.add(source, 1 + k, supply[k], 0)
+        for j, p in profit[k].items():
+            pairs.append((k, j, net.add(1 + k, K + 2 + j, unlimited, -p)))
+            # Feasible initial potentials: sink j starts at its cheapest incoming arc
+            potential[K + 2 + j] = min(potential[K + 2 + j], -p)
+    spill = [(k, net.add(1 + k, overflow, unlimited, 0)) for k in range(K)]
+    fill = [(j, net.add(overflow, K + 2 + j, unlimited, 0)) for j in range(J)]
+    for j in range(J):
+        net.add(K + 2 + j, target, capacity[j], 0)
+    potential[target] = min(potential[K + 2:K + 2 + J], default=0)
+
+    while True:
+        dist = net.shortest_paths(potential, source, target)
+        if dist[target] == INF:
+            break
+        # Nodes not settled before the target keep reduced costs non-negative with dist[target]
+        reach = dist[target]
+        for v, d in enumerate(dist):
+            potential[v] += min(d, reach)
+        net.max_flow(potential, source, target)
+
+    flow = [{} for _ in range(K)]
+    for k, j, e in pairs:
+        if net.cap[e] < unlimited:
+            flow[k][j] = unlimited - net.cap[e]
+    # Overflow units carry no profit, so any pairing of what enters and leaves it will do
+    received = [[j, unlimited - net.cap[e]] for j, e in fill if net.cap[e] < unlimited]
+    for k, e in spill:
+        units = unlimited - net.cap[e]
+        while units > 0:
+            j, count = received[-1]
+            moved = min(units, count)
+            flow[k][j] = flow[k].get(j, 0) + moved
+            units -= moved
+            if moved == count:
+                received.pop()
+            else:
+                received[-1][1] -= moved
+    return flow
+
+
+def optimal_assignment(index, tasks, loads, room):
+    """
+    Assigns `tasks` (tag lists) to the members of a SkillIndex for the highest total skill
+    score, giving member p at most `room[p]` tasks. Tasks with the same scores for every
+    member form one class and members with the same scores for every task class another,
+    so the flow problem is solved over classes, not individuals; each member class's share
+    is then handed out least-loaded member first. Deterministic for the same inputs.
+
+    Returns (picks, stats): picks[i] is (member position, score) or None when nobody has
+    room left; stats has the class counts.
+    """
+    # Tasks scoring the same for every member (same relevant tags) are interchangeable
+    by_tags = {}       # frozenset of tags -> member scores, computed once per tag set
+    task_classes = {}  # member scores -> task class
+    class_scores = []
+    task_class = []
+    for tags in tasks:
+        key = frozenset(tags)
+        scores = by_tags.get(key)
+        if scores is None:
+            scores = by_tags[key] = index.scores(key)
+        profile = tuple(sorted(scores.items()))
+        k = task_classes.setdefault(profile, len(task_classes))
+        if k == len(class_scores):
+            class_scores.append(scores)
+        task_class.append(k)
+
+    # A member's profile is its non-zero (task class, score) pairs
+    entries = [[] for _ in index.members]
+    for k, scores in enumerate(class_scores):
+        for position, score in scores.items():
+            entries[position].append((k, score))
+    member_classes = {}  # score profile -> member class
+    members_of = []
+    for position, profile in enumerate(entries):
+        if room[position] <= 0:
+            continue
+        j = member_classes.setdefault(tuple(profile), len(member_classes))
+        if j == len(members_of):
+            members_of.append([])
+        members_of[j].append(position)
+
+    supply = [0] * len(task_classes)
+    for k in task_class:
+        supply[k] += 1
+    capacity = [sum(room[p] for p in members) for members in members_of]
+    profit = [{} for _ in task_classes]
+    for j, profile in enumerate(member_classes):
+        for k, score in profile:
+            profit[k][j] = score
+    quota = max_profit_transport(supply, capacity, profit)
+
+    # Hand out each class's quota in task order, least-loaded member of the class first
+    loads = list(loads)
+    room = list(room)
+    heaps = [[(loads[p], p) for p in members] for members in members_of]
+    for heap in heaps:
+        heapq.heapify(heap)
+    picks = []
+    for k in task_class:
+        if not quota[k]:
+            picks.append(None)
+            continue
+        j = next(iter(quota[k]))
+        quota[k][j] -= 1
+        if not quota[k][j]:
+            del quota[k][j]
+        heap = heaps[j]
+        while True:
+            load, position = heap[0]
+            if room[position] <= 0:
+                heapq.heappop(heap)
+            elif load != loads[position]:
+                heapq.heapreplace(heap, (loads[position], position))
+            else:
+                break
+        loads[position] += 1
+        room[position] -= 1
+        picks.append((position, profit[k].get(j, 0)))
+    return picks, {"task_classes": len(task_classes), "member_classes": len(members_of)}
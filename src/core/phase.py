@@ -3,7 +3,8 @@ import json
 import logging
 import os
 import datetime
-import subprocess
+
+from src.utils.tracing import tracer
 
 class PhaseManager:
     """
@@ -15,6 +16,7 @@ class PhaseManager:
         self.repo = repo_name
         self.logger = logging.getLogger(__name__)
 
+    @tracer.traced("phase check_gate", "phase")
     def check_gate(self, current_phase, next_phase):
         """Validates all conditions before phase transition. Returns closed tasks for next step."""
         self.logger.info(f"Checking gate conditions: {current_phase} -> {next_phase}")
@@ -35,7 +37,7 @@ class PhaseManager:
         if open_issues:
             self.logger.error(f"Gate failed: {len(open_issues)} open tasks found in phase '{current_phase}'.")
             for i in open_issues:
-                self.logger.info(f" - #{i['number']} {i['title']}")
+                self.logger.info(f" - #{i.number} {i.title}")
             return []
         
         # 2. CI Check
@@ -53,49 +55,50 @@ class PhaseManager:
     def check_ci_status(self):
         """Checks latest GitHub Action run status."""
         try:
-            cmd = ["gh", "run", "list", "--repo", self.repo, "--limit", "1", "--json", "conclusion"]
-            res = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if res.returncode != 0:
-                self.logger.error(f"Failed to fetch CI status: {res.stderr.strip()}")
-                return False
-                
-            runs = json.loads(res.stdout)
+            runs = self.connector.fetch_workflow_runs(self.repo, limit=1)
             if not runs: return True # No runs found, assume OK or warn
             
             status = runs[0].get("conclusion")
             self.logger.info(f"Latest CI Status: {status}")
             return status == "success"
         except Exception as e:
-            self.logger.error(f"Error parsing CI status: {e}")
+            self.logger.error(f"Failed to fetch CI status: {e}")
             return False
 
-    def execute_transition(self, tasks_to_create):
+    @tracer.traced("phase execute_transition", "phase")
+    def execute_transition(self, tasks_to_create, solver="greedy"):
         """
         Executes the transition by creating new tasks for the next phase.
         Tasks should be a list of dicts: {"title": str, "body": str, "labels": list, "parent_id": int}
+        `solver` picks the bulk assignment strategy (see ResourceManager.assign_batch).
         """
-        success_count = 0
-        for task in tasks_to_create:
-            # Resource Assignment Logic
-            assignees = self.resource_mgr.find_best_assignee(task.get('labels', []))
-            
+        payloads = []
+        # Resource Assignment Logic: all tasks scored against the team's skill index at once,
+        # spread by each member's current open issues
+        self.resource_mgr.set_workload(self.connector.fetch_issues(self.repo, state="open"))
+        assignments = self.resource_mgr.assign_batch([task.get('labels', []) for task in tasks_to_create], solver=solver)
+        for task, assignees in zip(tasks_to_create, assignments):
             # Traceability: Append Parent Link to Body
             body = task.get('body', '')
             if task.get('parent_id'):
                 body += f"\n\n> **Traceability**: Derived from #{task['parent_id']}"
             
-            try:
-                self.connector.create_issue(
-                    self.repo, 
-                    title=task['title'], 
-                    body=body,
-                    labels=task.get('labels', []),
-                    assignees=assignees
-                )
+            payloads.append({
+                "title": task['title'],
+                "body": body,
+                "labels": task.get('labels', []),
+                "assignees": assignees or []
+            })
+
+        # Bulk creation: one GraphQL round-trip per batch instead of one `gh` call per task
+        results = self.connector.create_issues(self.repo, payloads)
+
+        success_count = 0
+        for task, result in zip(tasks_to_create, results):
+            if result["ok"]:
                 success_count += 1
-                self.logger.info(f"Created task: {task['title']} (Ref: #{task.get('parent_id', 'N/A')})")
-            except Exception as e:
-                self.logger.error(f"Failed to create task '{task['title']}': {e}")
+                self.logger.info(f"Created task #{result['number']}: {task['title']} (Ref: #{task.get('parent_id', 'N/A')})")
+            else:
+                self.logger.error(f"Failed to create task '{task['title']}': {result['error']}")
         
         return success_count
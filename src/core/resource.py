@@ -1,17 +1,166 @@
 #!/usr/bin/env python3
+import heapq
 import json
 import os
-import random
+import re
+import time
 import logging
 
+from src.core import analytics, matching
+from src.utils.tracing import tracer
+
+# Tags are matched on whole words: "domain:api" -> ["domain", "api"], so "java" never matches "javascript"
+TAG_DELIMITERS = re.compile(r'[:\-\s]+')
+
+class SkillIndex:
+    """
+    Inverted index over the active team: lowercased skill -> [(member position, weight)].
+    A task's score for a member is the number of (tag, skill) pairs where the skill is one
+    of the tag's words, so scoring a task only touches members sharing one of its words.
+    """
+    def __init__(self, members):
+        self.members = [m for m in members if m.get("status") == "active"]
+        self.skills = {}
+        for position, member in enumerate(self.members):
+            weights = {}
+            for skill in set(member.get("skills", [])):
+                # Distinct skills that only differ in case each count, as before
+                weights[skill.lower()] = weights.get(skill.lower(), 0) + 1
+            for skill, weight in weights.items():
+                self.skills.setdefault(skill, []).append((position, weight))
+        self._words = {}  # tag -> its distinct lowercased words
+
+    def words(self, tag):
+        words = self._words.get(tag)
+        if words is None:
+            words = self._words[tag] = tuple(set(TAG_DELIMITERS.split(tag.lower())))
+        return words
+
+    def scores(self, task_tags):
+        """{member position: score} for members matching at least one tag."""
+        scores = {}
+        for tag in set(task_tags):
+            for word in self.words(tag):
+                for position, weight in self.skills.get(word, ()):
+                    scores[position] = scores.get(position, 0) + weight
+        return scores
+
+
+class WorkloadScheduler:
+    """
+    Deterministic load-aware assignment over a SkillIndex. Each task goes to the member with
+    the highest skill score, then the fewest open tasks, then the earliest team position;
+    members at their capacity are skipped. Tasks nobody matches (or whose matching members are
+    all full) go to the least-loaded member with room. When the whole team is full, `overflow`
+    picks a member past their capacity. Returns the same picks for the same team, loads and
+    task order.
+
+    Candidates for each distinct tag set sit in a heap keyed on (-score, load, position).
+    Loads only grow during a run, so an entry whose load has moved since it was pushed is
+    re-keyed when it reaches the top, and a full member is dropped.
+    """
+    def __init__(self, index, loads, capacities):
+        self.index = index
+        self.loads = loads            # member position -> open tasks, updated as tasks are handed out
+        self.capacities = capacities  # member position -> task limit (None: no limit)
+        self._heaps = {}              # frozenset of tags -> candidate heap
+        self._fallback = None         # every member, for tasks without a skill match
+        self._overflow = {}           # frozenset of tags -> (load, -score, position) heap
+
+    def _is_full(self, position):
+        capacity = self.capacities[position]
+        return capacity is not None and self.loads[position] >= capacity
+
+    def _top(self, heap):
+        while heap:
+            neg_score, load, position = heap[0]
+            if self._is_full(position):
+                heapq.heappop(heap)
+            elif load != self.loads[position]:
+                heapq.heapreplace(heap, (neg_score, self.loads[position], position))
+            else:
+                return position, -neg_score
+        return None
+
+    def assign(self, task_tags):
+        """Returns (member, skill score) for the next task (score 0 for a fallback pick), or None if everyone is full."""
+        key = frozenset(task_tags)
+        heap = self._heaps.get(key)
+        if heap is None:
+            heap = [(-score, self.loads[p], p) for p, score in self.index.scores(key).items()]
+            heapq.heapify(heap)
+            self._heaps[key] = heap
+        pick = self._top(heap)
+        if pick is None:
+            if self._fallback is None:
+                self._fallback = [(0, load, p) for p, load in enumerate(self.loads)]
+                heapq.heapify(self._fallback)
+            pick = self._top(self._fallback)
+            if pick is None:
+                return None
+            pick = (pick[0], 0)
+        position, score = pick
+        self.loads[position] += 1
+        return self.index.members[position], score
+
+    def overflow(self, task_tags):
+        """
+        Pick for a task `assign` found no room for, ignoring capacity: the least-loaded of the
+        task's skill matches (higher score, then earlier position on ties), or the least-loaded
+        member when nobody matches. Returns (member, skill score).
+        """
+        key = frozenset(task_tags)
+        heap = self._overflow.get(key)
+        if heap is None:
+            scores = self.index.scores(key) or dict.fromkeys(range(len(self.loads)), 0)
+            heap = [(self.loads[p], -score, p) for p, score in scores.items()]
+            heapq.heapify(heap)
+            self._overflow[key] = heap
+        while heap[0][0] != self.loads[heap[0][2]]:
+            _, neg_score, position = heap[0]
+            heapq.heapreplace(heap, (self.loads[position], neg_score, position))
+        _, neg_score, position = heap[0]
+        self.loads[position] += 1
+        return self.index.members[position], -neg_score
+
+
 class ResourceManager:
     """
     Manages team resources, skill matching, and availability tracking.
+    Assignments are load-aware: `workload` holds each member's open-issue count (see
+    `set_workload`) and grows with every task handed out. Members at
+    `max_active_tasks_per_person` from the `thresholds` in config.json (or their own
+    `max_active_tasks` in team.json) are passed over while anyone else can take the task;
+    once everyone is at their limit, tasks still get an owner past it, with a warning.
     """
-    def __init__(self, config_path="skills/project-manager/data/team.json", logger=None):
+    # Bulk assignment strategies (see assign_batch)
+    SOLVERS = ("greedy", "optimal")
+
+    def __init__(self, config_path="skills/project-manager/data/team.json", logger=None,
+                 settings_path="skills/project-manager/data/config.json"):
         self.config_path = config_path
         self.logger = logger or logging.getLogger(__name__)
         self.team = self.load_team()
+        self.max_active = self._load_capacity(settings_path)  # None: no limit
+        self.workload = {}  # member id -> open tasks
+        self.last_quality = None  # Optimal vs greedy comparison from the last optimal batch
+        self._index = None  # (team, SkillIndex), rebuilt when the team changes
+
+    def _load_capacity(self, path):
+        """`thresholds.max_active_tasks_per_person` from config.json (default 3; null disables the limit)."""
+        thresholds = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    thresholds = json.load(f).get("thresholds") or {}
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Invalid config {path}: {e}. Using default task limit.")
+        return thresholds.get("max_active_tasks_per_person", 3)
+
+    def set_workload(self, issues):
+        """Sets each member's current load to their number of open issues among `issues`."""
+        self.workload = dict(analytics.analyze(issues).assignee_load)
+        self.logger.info(f"Current workload: {sum(self.workload.values())} open tasks across {len(self.workload)} assignees.")
 
     def load_team(self):
         """Loads team configuration from JSON."""
@@ -31,60 +180,138 @@ class ResourceManager:
                 {"id": "dev-02", "role": "Frontend", "skills": ["react", "ui"], "status": "active"}
             ]}
 
+    @property
+    def index(self):
+        """SkillIndex over the current team (built once, rebuilt if `team` is replaced or updated)."""
+        if self._index is None or self._index[0] is not self.team:
+            self._index = (self.team, SkillIndex(self.team.get("members", [])))
+        return self._index[1]
+
     def find_best_assignee(self, task_tags):
         """
         Finds the best assignee based on skill match and availability.
-        Returns a list of assignee IDs (e.g., ['dev-01']) or None.
+        Returns a list of assignee IDs (e.g., ['dev-01']), or None if nobody is active.
         """
-        candidates = []
-        
-        # 1. Filter by status (active only)
-        active_members = [m for m in self.team["members"] if m.get("status") == "active"]
-        if not active_members:
+        index = self.index
+        if not index.members:
             self.logger.warning("No active members found.")
             return None
 
-        # 2. Filter by skill match
-        matched_members = []
-        for member in active_members:
-            score = 0
-            member_skills = set(member.get("skills", []))
-            task_skills = set(task_tags)
-            
-            # Improved skill matching: split tag by delimiters to avoid partial matches
-            # e.g. "java" should not match "javascript"
-            # But "api" should match "domain:api"
-            import re
-            
-            for tag in task_skills:
-                # Split tag into parts (e.g., "domain:api" -> ["domain", "api"])
-                tag_parts = re.split(r'[:\-\s]+', tag.lower())
-                for skill in member_skills:
-                    if skill.lower() in tag_parts:
-                        score += 1
-            
-            if score > 0:
-                matched_members.append({"member": member, "score": score})
-        
-        # 3. Sort by score (descending)
-        matched_members.sort(key=lambda x: x["score"], reverse=True)
-        
-        if matched_members:
-            # Pick top scorer (can be random among ties)
-            best_pick = matched_members[0]["member"]["id"]
-            self.logger.info(f"Assigned {best_pick} (score: {matched_members[0]['score']}) based on skill match.")
-            return [best_pick]
-        
-        # Fallback: Random pick from active members (Round-robin ideally)
-        fallback = random.choice(active_members)["id"]
-        self.logger.info(f"Fallback assignment: {fallback} (no specific skill match).")
-        return [fallback]
+        scheduler = self._scheduler(index)
+        pick = scheduler.assign(task_tags)
+        if pick is None:
+            pick = scheduler.overflow(task_tags)
+            self.logger.warning(f"All active members are at capacity. Assigned {pick[0]['id']} past their task limit.")
+        self._record(index, scheduler.loads)
+        member, score = pick
+        if score:
+            self.logger.info(f"Assigned {member['id']} (score: {score}) based on skill match.")
+        else:
+            # Fallback: least-loaded active member
+            self.logger.info(f"Fallback assignment: {member['id']} (no specific skill match).")
+        return [member["id"]]
+
+    def assign_batch(self, tasks, solver="greedy"):
+        """
+        Assigns many tasks at once. `tasks` is a list of tag lists; returns a parallel list
+        of assignee ID lists (None for every task if nobody is active). Logs one summary line
+        instead of one line per task.
+        solver="greedy" hands tasks out in order through one WorkloadScheduler;
+        solver="optimal" maximizes the batch's total skill score (see `assign_optimal`).
+        Tasks left over once everyone is at their limit go past it (WorkloadScheduler.overflow).
+        """
+        if solver not in self.SOLVERS:
+            raise ValueError(f"Unknown assignment solver: {solver}. Choose from: {', '.join(self.SOLVERS)}")
+        index = self.index
+        if not index.members:
+            self.logger.warning("No active members found.")
+            return [None] * len(tasks)
+
+        if solver == "optimal":
+            picks = self.assign_optimal(index, tasks)
+            scheduler = self._scheduler(index)  # Loads now include the optimal picks
+        else:
+            scheduler = self._scheduler(index)
+            picks = [scheduler.assign(task_tags) for task_tags in tasks]
+        over = 0
+        for i, pick in enumerate(picks):
+            if pick is None:
+                over += 1
+                picks[i] = scheduler.overflow(tasks[i])
+        self._record(index, scheduler.loads)
+
+        results = []
+        fallbacks = 0
+        for task_tags, (member, score) in zip(tasks, picks):
+            if score:
+                self.logger.debug(f"Assigned {member['id']} (score: {score}) to tags {list(task_tags)}.")
+            else:
+                fallbacks += 1
+            results.append([member["id"]])
+        if tasks:
+            self.logger.info(f"Assigned {len(tasks)} tasks: {len(tasks) - fallbacks} by skill match, {fallbacks} by fallback.")
+        if over:
+            self.logger.warning(f"{over} tasks assigned past the per-person task limit: all active members are at capacity.")
+        return results
+
+    @tracer.traced("resource assign_optimal", "resource")
+    def assign_optimal(self, index, tasks):
+        """
+        Assigns the batch for the highest total skill score within every member's remaining
+        capacity, as a min-cost flow over task and member classes (src/core/matching.py).
+        The greedy scheduler is run on the same loads for comparison; the result is logged
+        and kept in `last_quality`. Returns [(member, score) or None] like WorkloadScheduler.
+        """
+        greedy = [pick[1] if pick else None for pick in map(self._scheduler(index).assign, tasks)]
+
+        started = time.perf_counter()
+        loads = self._loads(index)
+        room = [len(tasks) if capacity is None else max(0, capacity - load)
+                for capacity, load in zip(self._capacities(index), loads)]
+        picks, stats = matching.optimal_assignment(index, tasks, loads, room)
+        elapsed = time.perf_counter() - started
+        for pick in picks:
+            if pick:
+                loads[pick[0]] += 1
+        self._record(index, loads)
+
+        def quality(scores):
+            scores = [s for s in scores if s is not None]
+            return {"score": sum(scores), "skill_matched": sum(1 for s in scores if s), "assigned": len(scores)}
+
+        optimal = quality(pick[1] if pick else None for pick in picks)
+        baseline = quality(greedy)
+        self.last_quality = dict(optimal=optimal, greedy=baseline, seconds=round(elapsed, 3), **stats)
+        gain = (optimal["score"] / baseline["score"] - 1) * 100 if baseline["score"] else 0.0
+        self.logger.info(
+            f"Optimal assignment of {len(tasks)} tasks in {elapsed:.2f}s "
+            f"({stats['task_classes']} task classes x {stats['member_classes']} member classes): "
+            f"skill score {optimal['score']} vs {baseline['score']} greedy ({gain:+.1f}%), "
+            f"{optimal['skill_matched']} vs {baseline['skill_matched']} tasks skill-matched."
+        )
+        return [(index.members[pick[0]], pick[1]) if pick else None for pick in picks]
+
+    def _loads(self, index):
+        return [self.workload.get(m["id"], 0) for m in index.members]
+
+    def _capacities(self, index):
+        return [m.get("max_active_tasks", self.max_active) for m in index.members]
+
+    def _scheduler(self, index):
+        return WorkloadScheduler(index, self._loads(index), self._capacities(index))
+
+    def _record(self, index, loads):
+        """Carries assignment loads over to later assignments in this process."""
+        for member, load in zip(index.members, loads):
+            if load:
+                self.workload[member["id"]] = load
 
     def update_status(self, member_id, new_status):
         """Updates a member's availability status."""
         for m in self.team["members"]:
             if m["id"] == member_id:
                 m["status"] = new_status
+                self._index = None
                 self.save_team()
                 return True
         return False
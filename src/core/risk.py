@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+import datetime
+import json
+import logging
+import os
+
+from src.core import analytics
+from src.core.traceability import TraceIndex
+from src.utils.tracing import tracer
+
+# Rule name -> default severity, in report order
+RULES = {
+    "ci-failing": "high",
+    "overdue": "high",
+    "blocked-by-open-parent": "high",
+    "overloaded": "medium",
+    "due-soon": "medium",
+    "unassigned": "medium",
+    "stale": "low",
+}
+
+SEVERITY_ICONS = {"high": "🔴", "medium": "🟠", "low": "🟡"}
+
+# Used for any threshold missing from config.json
+DEFAULT_THRESHOLDS = {
+    "overdue_grace_period_days": 0,
+    "max_active_tasks_per_person": 3,
+    "due_soon_days": 2,
+    "stale_days": 14,
+}
+
+class RiskEngine:
+    """
+    Declarative project risk rules, evaluated together over one issue set.
+    Thresholds come from the `thresholds` block of config.json. An optional `risk_rules`
+    block disables rules or changes their severity, e.g.
+    `{"stale": {"enabled": false}, "due-soon": {"severity": "high"}}`.
+    """
+    def __init__(self, config_path="skills/project-manager/data/config.json", logger=None, config=None):
+        self.logger = logger or logging.getLogger(__name__)
+        if config is None:
+            config = self._load_config(config_path)
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(config.get("thresholds") or {}))
+
+        overrides = config.get("risk_rules") or {}
+        unknown = sorted(set(overrides) - set(RULES))
+        if unknown:
+            self.logger.warning(f"Ignoring unknown risk rule(s) in config: {', '.join(unknown)}")
+        self.rules = {}  # enabled rule -> severity, in report order
+        for name, severity in RULES.items():
+            rule = overrides.get(name) or {}
+            if rule.get("enabled", True):
+                self.rules[name] = rule.get("severity", severity)
+
+    def _load_config(self, path):
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Invalid config {path}: {e}. Using default risk thresholds.")
+        return {}
+
+    @property
+    def needs_bodies(self):
+        """Trace links live in issue bodies; only the blocked rule reads them."""
+        return "blocked-by-open-parent" in self.rules
+
+    @property
+    def needs_ci(self):
+        return "ci-failing" in self.rules
+
+    def settings(self):
+        """Thresholds and enabled rules, as a stable string (part of report fingerprints)."""
+        return json.dumps({"thresholds": self.thresholds, "rules": self.rules}, sort_keys=True)
+
+    @tracer.traced("risk evaluate", "risk")
+    def evaluate(self, issues, ci_runs=None, today=None, repo=None, trace=None):
+        """
+        Runs every enabled rule over `issues` (a list of `Issue` records) and the latest
+        CI runs (newest first, as returned by `fetch_workflow_runs`). Date, ownership and
+        workload rules share one analytics pass; blocked issues come from the trace index
+        (`trace`, a TraceIndex of `issues` if the caller already has one). Returns a RiskReport.
+        """
+        today = today or datetime.date.today()
+        now = today.toordinal()
+        limits = self.thresholds
+        metrics = analytics.analyze(
+            issues, today,
+            grace_days=limits["overdue_grace_period_days"],
+            due_soon_days=limits["due_soon_days"],
+            stale_days=limits["stale_days"] if "stale" in self.rules else None,
+        )
+        findings = {name: [] for name in self.rules}
+
+        def add(rule, message, issue=None, **details):
+            finding = {"rule": rule, "severity": self.rules[rule], "message": message}
+            if issue is not None:
+                finding.update(issue=issue.number, title=issue.title, assignees=list(issue.assignees))
+            finding.update(details)
+            findings[rule].append(finding)
+
+        if self.needs_ci and ci_runs:
+            run = ci_runs[0]
+            if run.get("conclusion") == "failure":
+                branch = run.get("head_branch") or run.get("headBranch") or "?"
+                add("ci-failing", f"Latest CI run failed on {branch}",
+                    branch=branch, run=run.get("name"), url=run.get("html_url") or run.get("url"))
+
+        if "overdue" in self.rules:
+            # Most overdue first, so capped listings keep the worst cases
+            for row in sorted(metrics.overdue_rows, key=lambda row: issues[row].due):
+                i = issues[row]
+                add("overdue", f"#{i.number} {i.title} (Due: {i.due_date}, {now - i.due} days late)",
+                    i, due=i.due_date.isoformat(), days_late=now - i.due)
+
+        if self.needs_bodies:
+            index = trace or TraceIndex.build(issues)
+            for i in issues:
+                if i.is_closed or i.number not in index.parents:
+                    continue
+                blockers = [p for p in index.parents[i.number]
+                            if p in index.issues and not index.issues[p].is_closed]
+                if blockers:
+                    refs = ", ".join(f"#{p}" for p in blockers)
+                    add("blocked-by-open-parent", f"#{i.number} {i.title} (waiting on {refs})",
+                        i, parents=blockers)
+
+        if "overloaded" in self.rules:
+            limit = limits["max_active_tasks_per_person"]
+            for login, count in sorted(metrics.assignee_load.items(), key=lambda item: (-item[1], item[0])):
+                if count > limit:
+                    add("overloaded", f"@{login} has {count} open tasks (limit: {limit})",
+                        assignee=login, open=count, limit=limit)
+
+        if "due-soon" in self.rules:
+            for row in sorted(metrics.due_soon_rows, key=lambda row: issues[row].due):
+                i = issues[row]
+                # Past due but still inside the overdue grace period: not late yet, not "left" either
+                when = f"{i.due - now} days left" if i.due >= now else f"{now - i.due} days overdue (within grace)"
+                add("due-soon", f"#{i.number} {i.title} (Due: {i.due_date}, {when})",
+                    i, due=i.due_date.isoformat(), days_left=i.due - now)
+
+        if "unassigned" in self.rules:
+            for row in metrics.unassigned_rows:
+                i = issues[row]
+                add("unassigned", f"#{i.number} {i.title}", i)
+
+        if "stale" in self.rules:
+            for row in sorted(metrics.stale_rows, key=lambda row: issues[row].updated):
+                i = issues[row]
+                add("stale", f"#{i.number} {i.title} (no update for {now - i.updated} days)",
+                    i, idle_days=now - i.updated)
+
+        return RiskReport(repo, today, self.thresholds, [f for name in self.rules for f in findings[name]])
+
+
+class RiskReport:
+    """Findings of one RiskEngine run, renderable as JSON or markdown."""
+    TITLES = {
+        "ci-failing": "CI Failing",
+        "overdue": "Overdue",
+        "blocked-by-open-parent": "Blocked by Open Parent",
+        "overloaded": "Overloaded Assignees",
+        "due-soon": "Due Soon",
+        "unassigned": "Unassigned",
+        "stale": "Stale",
+    }
+
+    def __init__(self, repo, today, thresholds, findings):
+        self.repo = repo
+        self.today = today
+        self.thresholds = thresholds
+        self.findings = findings  # dicts: rule, severity, message, [issue, title, assignees], details
+
+    def __len__(self):
+        return len(self.findings)
+
+    def by_rule(self):
+        """{rule: [findings]}, in report order."""
+        groups = {}
+        for finding in self.findings:
+            groups.setdefault(finding["rule"], []).append(finding)
+        return groups
+
+    def to_dict(self):
+        severities = {}
+        for finding in self.findings:
+            severities[finding["severity"]] = severities.get(finding["severity"], 0) + 1
+        return {
+            "repo": self.repo,
+            "date": self.today.isoformat(),
+            "thresholds": self.thresholds,
+            "summary": {
+                "total": len(self.findings),
+                "by_severity": severities,
+                "by_rule": {rule: len(items) for rule, items in self.by_rule().items()},
+            },
+            "findings": self.findings,
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False) + "\n"
+
+    def markdown(self, limit=10):
+        """Yields the `## ⚠️ Risks Detected` section (nothing if there are no findings), `limit` items per rule."""
+        if not self.findings:
+            return
+        yield "## ⚠️ Risks Detected\n"
+        for rule, items in self.by_rule().items():
+            icon = SEVERITY_ICONS.get(items[0]["severity"], "⚪")
+            yield f"\n### {icon} {self.TITLES.get(rule, rule)} ({len(items)})\n"
+            for finding in items[:limit]:
+                owners = " ".join(f"@{a}" for a in finding.get("assignees", ()))
+                yield f"- {finding['message']}{' ' + owners if owners else ''}\n"
+            if len(items) > limit:
+                yield f"- … and {len(items) - limit} more\n"
+        yield "\n"
+
+    def to_markdown(self, limit=10):
+        """Standalone markdown document (the `risk` command)."""
+        chunks = [f"# ⚠️ Risk Report: {self.repo}\n\n",
+                  f"_{len(self.findings)} finding(s) as of {self.today}._\n\n"]
+        chunks.extend(self.markdown(limit))
+        return "".join(chunks)
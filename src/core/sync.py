@@ -1,98 +1,450 @@
 #!/usr/bin/env python3
+import glob
 import json
 import logging
 import os
 import datetime
+import re
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.connectors.issue import Issue
+from src.core.journal import SyncJournal
+from src.core.title_index import TitleIndex
+from src.utils.files import rewrite_lines
+from src.utils.tracing import tracer
+from src.utils.watch import create_watcher
+
+class FilePass:
+    """
+    Per-file state of one sync pass: the journal, the remote updates relevant to it and
+    everything gathered while streaming the file (agreed entries, pending pushes).
+    """
+    def __init__(self, path, journal, updated):
+        self.path = path
+        self.journal = journal
+        # Only issues updated since this file's own watermark
+        if journal.watermark:
+            updated = {n: i for n, i in updated.items() if (i.updated_at or "") >= journal.watermark}
+        self.updated = updated
+        self.updated_titles = {issue.title: issue for issue in updated.values()}
+        # Updates that can affect this file: tracked issues with a new updatedAt, or
+        # issues whose title matches a line that was unmatched so far
+        self.remote_changes = {
+            n for n, issue in updated.items()
+            if (n in journal.entries and journal.entries[n].get("updatedAt") != issue.updated_at)
+            or (n not in journal.entries and issue.title in journal.unmatched)
+        }
+        self.entries = {}
+        self.unmatched = set()
+        self.pending = {}  # issue number -> (action, base entry); pushed in bulk after the pass
+        self.changes = 0
+        self.digest = SyncJournal.line_digest()
+
 
 class SyncManager:
     """
     Synchronizes tasks between local files and remote GitHub issues.
     """
+    # Regex for Markdown checkbox: - [ ] Title #123
+    TASK_PATTERN = re.compile(r'- \[([ x])\] (.*?)(?: #(\d+))?$')
+
     def __init__(self, connector, resource_mgr, repo_name):
         self.connector = connector
         self.resource_mgr = resource_mgr
         self.repo = repo_name
         self.logger = logging.getLogger(__name__)
+        self._remote_maps = None  # (by ID, by Title) over every remote issue, loaded on demand
+        self._title_index = None  # Fuzzy TitleIndex over the same issues, built on first use
+        self._maps_lock = threading.Lock()
+        self._journals = {}  # path -> SyncJournal kept in memory between watch passes
 
-    def sync(self, local_path):
+    @tracer.traced("sync", "sync")
+    def sync(self, local_path, full=False):
         """
-        Syncs local file status with remote GitHub status.
-        Priority:
-        - If Remote is Closed & Local is Open -> Update Local to [x]
-        - If Local is Closed & Remote is Open -> Close Remote Issue
+        Syncs local file status with remote GitHub status, incrementally.
+        A sidecar journal (see SyncJournal) holds the state both sides agreed on at the
+        last sync. Only lines edited since then and issues updated since the journal's
+        watermark are examined, and each difference is resolved three-way:
+        - Only Local changed -> Push (close or reopen the Remote Issue)
+        - Only Remote changed -> Pull (check or uncheck the Local line)
+        - No history, or both changed -> Closed wins:
+          Remote Closed & Local Open -> Update Local to [x];
+          Local Closed & Remote Open -> Close Remote Issue
+        `full=True` ignores the journal and examines every line.
         """
         if not os.path.exists(local_path):
             self.logger.warning(f"Local file not found: {local_path}. Skipping sync.")
             return
+        self._remote_maps = None
+        self._title_index = None
+        self._sync_files([local_path], full)
 
-        # 1. Fetch Remote Issues
-        remote_issues = self.connector.fetch_issues(self.repo, state="all")
-        if not remote_issues:
-            self.logger.warning("No remote issues fetched. Skipping sync.")
+    @tracer.traced("sync tree", "sync")
+    def sync_tree(self, directory, pattern="*.md", full=False, max_workers=8):
+        """
+        Syncs every file under `directory` (recursively) matching `pattern` against a single
+        remote snapshot: remote issues are fetched once, files are processed in parallel
+        threads, pushes from all files go out in one bulk phase. Unchanged files are skipped.
+        """
+        if not os.path.isdir(directory):
+            self.logger.warning(f"Directory not found: {directory}. Skipping sync.")
             return
+        paths = sorted(p for p in glob.glob(os.path.join(directory, "**", pattern), recursive=True) if os.path.isfile(p))
+        if not paths:
+            self.logger.warning(f"No files matching '{pattern}' under {directory}. Skipping sync.")
+            return
+        self._remote_maps = None
+        self._title_index = None
+        self._sync_files(paths, full, max_workers)
 
-        # Map by issue ID (if present in local file) or Title (less reliable)
-        remote_map_id = {str(i['number']): i for i in remote_issues}
-        remote_map_title = {i['title']: i for i in remote_issues}
-
-        # 2. Read Local File
-        with open(local_path, "r") as f:
-            lines = f.readlines()
-
-        updated_lines = []
-        changes_count = 0
-
-        # Regex for Markdown checkbox: - [ ] Title #123
-        import re
-        pattern = re.compile(r'- \[([ x])\] (.*?)(?: #(\d+))?$')
-
-        for line in lines:
-            match = pattern.search(line.strip())
-            new_line = line
-            
-            if match:
-                is_checked = match.group(1) == 'x'
-                title = match.group(2).strip()
-                issue_id = match.group(3)
-
-                remote_task = None
-                if issue_id and issue_id in remote_map_id:
-                    remote_task = remote_map_id[issue_id]
-                elif title in remote_map_title:
-                    remote_task = remote_map_title[title]
+    def watch(self, local_path=None, directory=None, pattern="*.md", debounce=0.5,
+              remote_interval=30.0, max_workers=8, poll_interval=1.0):
+        """
+        Keeps syncing until interrupted. Local edits (inotify, or polling as a fallback) are
+        debounced into one pass over just the changed files; GitHub is polled incrementally
+        every `remote_interval` seconds. The connector, remote maps and journals stay warm
+        in memory between passes.
+        """
+        if local_path and not os.path.exists(local_path):
+            self.logger.warning(f"Local file not found: {local_path}. Skipping sync.")
+            return
+        if directory and not os.path.isdir(directory):
+            self.logger.warning(f"Directory not found: {directory}. Skipping sync.")
+            return
 
-                if remote_task:
-                    remote_is_closed = remote_task['state'] == 'closed'
-                    remote_id = str(remote_task['number'])
-
-                    # Sync Logic
-                    if remote_is_closed and not is_checked:
-                        # Remote Closed -> Update Local
-                        new_line = line.replace('- [ ]', '- [x]', 1)
-                        self.logger.info(f"Sync: Remote #{remote_id} Closed -> Local Updated")
-                        changes_count += 1
-                    elif is_checked and not remote_is_closed:
-                        # Local Checked -> Close Remote
-                        try:
-                            self.connector.close_issue(self.repo, remote_id, "Closed via Local Sync")
-                            self.logger.info(f"Sync: Local Checked -> Remote #{remote_id} Closed")
-                            changes_count += 1
-                        except Exception as e:
-                            self.logger.error(f"Failed to close remote issue #{remote_id}: {e}")
-
-                    # Backfill ID if missing
-                    if not issue_id:
-                        if not re.search(r'#\d+$', new_line.strip()):
-                            new_line = new_line.rstrip() + f" #{remote_id}\n"
-                            changes_count += 1
-            
-            updated_lines.append(new_line)
-
-        # 3. Write Back
-        if changes_count > 0:
-            with open(local_path, "w") as f:
-                f.writelines(updated_lines)
+        watcher = create_watcher(local_path, directory, pattern, poll_interval, self.logger)
+        self._remote_maps = None
+        self._title_index = None
+        self._journals = {}
+        self.logger.info(
+            f"Watching {local_path or os.path.join(directory, '**', pattern)} "
+            f"({type(watcher).__name__}, remote poll every {remote_interval:g}s). Press Ctrl+C to stop."
+        )
+        try:
+            paths = self._watch_targets(local_path, directory, pattern)
+            next_remote = time.monotonic()
+            while True:
+                if time.monotonic() >= next_remote:
+                    # Remote poll: every file, against issues updated since the last poll
+                    self.connector.expire(self.repo)
+                    paths = self._watch_targets(local_path, directory, pattern)
+                    next_remote = time.monotonic() + remote_interval
+                if paths:
+                    with tracer.span("watch pass", "sync", files=len(paths)):
+                        self._sync_files(sorted(paths), max_workers=max_workers, keep_warm=True)
+
+                changed = watcher.wait(max(next_remote - time.monotonic(), 0), debounce)
+                paths = [p for p in changed if os.path.isfile(p)]
+                if paths:
+                    self.logger.info(f"Watch: {len(paths)} file(s) changed.")
+        except KeyboardInterrupt:
+            self.logger.info("Watch stopped.")
+        finally:
+            watcher.close()
+
+    @staticmethod
+    def _watch_targets(local_path, directory, pattern):
+        if local_path:
+            return [os.path.abspath(local_path)]
+        return [
+            os.path.abspath(p) for p in glob.glob(os.path.join(directory, "**", pattern), recursive=True)
+            if os.path.isfile(p)
+        ]
+
+    def _sync_files(self, paths, full=False, max_workers=1, keep_warm=False):
+        journals = {}
+        for path in paths:
+            if keep_warm and path in self._journals:
+                journals[path] = self._journals[path]
+                continue
+            journal = SyncJournal.load(path, self.repo, self.logger)
+            journals[path] = SyncJournal(journal.path, self.repo) if full else journal
+            if keep_warm:
+                self._journals[path] = journals[path]
+
+        # 1. Remote Issues updated since the oldest watermark (everything on a first run), fetched once
+        watermarks = [j.watermark for j in journals.values()]
+        since = None if None in watermarks else min(watermarks)
+        try:
+            updated = {
+                str(issue.number): issue
+                for issue in self.connector.iter_issues(self.repo, state="all", since=since)
+            }
+        except Exception as e:
+            self.logger.error(f"Failed to fetch remote issues: {e}")
+            return
+        if self._remote_maps is not None:
+            # Keep maps loaded by an earlier pass current
+            remote_map_id, remote_map_title = self._remote_maps
+            for number, issue in updated.items():
+                remote_map_id[number] = issue
+                remote_map_title[issue.title] = issue
+                if self._title_index is not None:
+                    self._title_index.add(issue)
+
+        # 2. Stream each Local File through the sync logic
+        workers = max(1, min(max_workers, len(paths)))
+        if workers == 1:
+            passes = [self._sync_file(path, journals[path], updated) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync") as pool:
+                passes = list(pool.map(lambda p: self._sync_file(p, journals[p], updated), paths))
+        passes = [p for p in passes if p is not None]
+
+        # 3. Push local changes from all files to Remote in one bulk phase
+        pending = self._gather_pushes(passes)
+        with tracer.span("bulk push", "sync", issues=len(pending)):
+            pushed = self._push_remote(pending)
+
+        # 4. Persist the agreed state; only confirmed pushes enter the journals
+        changes_count = sum(1 for _action, ok in pushed.values() if ok)
+        for file_pass in passes:
+            retry = self._apply_pushes(file_pass, pushed)
+            changes_count += file_pass.changes
+            journal = file_pass.journal
+            journal.entries = file_pass.entries
+            journal.unmatched = file_pass.unmatched
+            # A failed push must be retried next run, so the unchanged-file fast path may not skip it
+            journal.file_hash = None if retry else file_pass.digest.hexdigest()
+            for issue in file_pass.updated.values():
+                journal.advance(issue.updated_at)
+            journal.save()
+
+        skipped = len(paths) - len(passes)
+        if len(paths) > 1:
+            self.logger.info(
+                f"Sync completed for {len(paths)} files ({skipped} unchanged or skipped). "
+                f"Updated {changes_count} items."
+            )
+        elif changes_count > 0:
             self.logger.info(f"Sync completed. Updated {changes_count} items.")
         else:
             self.logger.info("Sync completed. No changes detected.")
+
+    def _sync_file(self, path, journal, updated):
+        """
+        Streams one file through the sync logic (atomic rewrite, only if a line changed).
+        Returns its FilePass, or None when the file was unchanged on both sides or failed.
+        """
+        with tracer.span("file hash", "io", path=path), open(path, "r") as f:
+            file_hash = SyncJournal.hash_lines(f)
+
+        file_pass = FilePass(path, journal, updated)
+        if file_hash == journal.file_hash and not file_pass.remote_changes and not journal.has_pending():
+            # Nothing relevant happened since the watermark, so it can safely move forward
+            watermark = journal.watermark
+            for issue in file_pass.updated.values():
+                journal.advance(issue.updated_at)
+            if journal.watermark != watermark:
+                journal.save()
+            return None
+
+        def process(_idx, line):
+            new_line = self._process_line(line, file_pass)
+            if new_line != line:
+                file_pass.changes += 1
+            file_pass.digest.update(new_line.encode("utf-8"))
+            return new_line
+
+        try:
+            with tracer.span("file rewrite", "io", path=path) as span:
+                span.set(changed=rewrite_lines(path, process))
+        except Exception as e:
+            self.logger.error(f"Sync of {path} aborted, file left unchanged: {e}")
+            return None
+        return file_pass
+
+    def _process_line(self, line, file_pass):
+        """Syncs one line; records its agreed state in the FilePass and returns the new line."""
+        match = self.TASK_PATTERN.search(line.strip())
+        if not match:
+            return line
+
+        journal = file_pass.journal
+        is_checked = match.group(1) == 'x'
+        title = match.group(2).strip()
+        issue_id = match.group(3)
+        entry = journal.entries.get(issue_id) if issue_id else None
+
+        # Untouched on both sides since the last sync
+        if issue_id:
+            if entry and entry["hash"] == SyncJournal.hash_line(line) and issue_id not in file_pass.remote_changes:
+                file_pass.entries[issue_id] = entry
+                return line
+        elif title in journal.unmatched and title not in file_pass.updated_titles:
+            file_pass.unmatched.add(title)
+            return line
+
+        # Map by issue ID (if present in local file) or Title (less reliable)
+        remote_task = None
+        if issue_id and issue_id in file_pass.updated and (
+            not entry or entry["updatedAt"] != file_pass.updated[issue_id].updated_at
+        ):
+            remote_task = file_pass.updated[issue_id]
+        elif entry:
+            # Not updated since the journal saw it (which includes our own pushes), so its state is current
+            remote_task = Issue(int(issue_id), state=entry["remote"], updated_at=entry["updatedAt"])
+        elif not issue_id and title in file_pass.updated_titles:
+            remote_task = file_pass.updated_titles[title]
+        else:
+            remote_map_id, remote_map_title = self._load_remote_maps()
+            if issue_id and issue_id in remote_map_id:
+                remote_task = remote_map_id[issue_id]
+            elif title in remote_map_title:
+                remote_task = remote_map_title[title]
+            elif not issue_id:
+                # Edited punctuation, tags or @assignee: link to the closest existing title
+                remote_task, score = self._load_title_index().match(title)
+                if remote_task:
+                    self.logger.info(
+                        f"Sync: '{title}' matched Remote #{remote_task.number} "
+                        f"'{remote_task.title}' (similarity {score:.2f})"
+                    )
+
+        if not remote_task:
+            if not issue_id:
+                file_pass.unmatched.add(title)
+            return line
+
+        remote_id = str(remote_task.number)
+        remote_is_closed = remote_task.is_closed
+        base = journal.entries.get(remote_id)
+        local_checked = is_checked
+        new_line = line
+
+        # Sync Logic
+        action = self._resolve(is_checked, remote_is_closed, base)
+        if action == "check":
+            # Remote Closed -> Update Local
+            new_line = line.replace('- [ ]', '- [x]', 1)
+            local_checked = True
+            self.logger.info(f"Sync: Remote #{remote_id} Closed -> Local Updated")
+        elif action == "uncheck":
+            # Remote Reopened -> Update Local
+            new_line = line.replace('- [x]', '- [ ]', 1)
+            local_checked = False
+            self.logger.info(f"Sync: Remote #{remote_id} Reopened -> Local Updated")
+        elif action in ("close", "reopen"):
+            # Local Changed -> Update Remote (gathered, pushed in one bulk phase)
+            file_pass.pending.setdefault(remote_id, (action, base))
+
+        # Backfill ID if missing
+        if not issue_id:
+            if not re.search(r'#\d+$', new_line.strip()):
+                new_line = new_line.rstrip() + f" #{remote_id}\n"
+
+        file_pass.entries[remote_id] = {
+            "hash": SyncJournal.hash_line(new_line),
+            "local": local_checked,
+            "remote": remote_task.state,
+            "updatedAt": remote_task.updated_at,
+        }
+        return new_line
+
+    def _gather_pushes(self, passes):
+        """
+        Merges the pending pushes of all files into {number: action}. An issue one file closes
+        and another reopens is not pushed: it is reported once, and since its entries count as
+        failed pushes the files keep retrying (and reporting) until they agree.
+        """
+        actions = {}  # issue number -> {action: [paths]}
+        for file_pass in passes:
+            for remote_id, (action, _base) in file_pass.pending.items():
+                actions.setdefault(remote_id, {}).setdefault(action, []).append(file_pass.path)
+        pending = {}
+        for remote_id, by_action in actions.items():
+            if len(by_action) == 1:
+                pending[remote_id] = next(iter(by_action))
+                continue
+            sides = "; ".join(f"{action} in {', '.join(paths)}" for action, paths in sorted(by_action.items()))
+            self.logger.error(f"Sync conflict on Remote #{remote_id}: {sides}. Not pushed; make the files agree.")
+        return pending
+
+    def _push_remote(self, pending):
+        """
+        Closes/reopens the gathered issues ({number: action}) with batched GraphQL mutations
+        and reports each result. Returns {number: (action, confirmed)}.
+        """
+        pushed = {}
+        for action, verb, push, comment in (
+            ("close", "Closed", self.connector.close_issues, "Closed via Local Sync"),
+            ("reopen", "Reopened", self.connector.reopen_issues, "Reopened via Local Sync"),
+        ):
+            numbers = [n for n, a in pending.items() if a == action]
+            if not numbers:
+                continue
+            try:
+                results = push(self.repo, numbers, comment=comment)
+            except Exception as e:
+                results = [{"number": int(n), "ok": False, "error": str(e)} for n in numbers]
+
+            for result in results:
+                remote_id = str(result["number"])
+                pushed[remote_id] = (action, result["ok"])
+                if result["ok"]:
+                    self.logger.info(f"Sync: Local Changed -> Remote #{remote_id} {verb}")
+                else:
+                    self.logger.error(f"Failed to {action} remote issue #{remote_id}: {result['error']}")
+            ok = sum(1 for r in results if r["ok"])
+            self.logger.info(f"Sync: {verb} {ok}/{len(numbers)} remote issues.")
+        return pushed
+
+    @staticmethod
+    def _apply_pushes(file_pass, pushed):
+        """
+        Records confirmed pushes; failed ones keep their old journal base so they are retried.
+        Returns True if any push of this file failed.
+        """
+        failed = False
+        for remote_id, (action, base) in file_pass.pending.items():
+            if pushed.get(remote_id) == (action, True):
+                file_pass.entries[remote_id]["remote"] = "closed" if action == "close" else "open"
+                continue
+            failed = True
+            if base:
+                file_pass.entries[remote_id] = dict(base, hash=None)
+            else:
+                file_pass.entries.pop(remote_id, None)
+        return failed
+
+    @staticmethod
+    def _resolve(local_checked, remote_closed, base):
+        """
+        Three-way resolution of one task against its last synced state (`base`).
+        Returns "check"/"uncheck" (update Local), "close"/"reopen" (update Remote) or None.
+        """
+        if local_checked == remote_closed:
+            return None
+        if base is not None:
+            local_changed = local_checked != base["local"]
+            remote_changed = remote_closed != (base["remote"] == "closed")
+            if local_changed and not remote_changed:
+                return "close" if local_checked else "reopen"
+            if remote_changed and not local_changed:
+                return "check" if remote_closed else "uncheck"
+        return "check" if remote_closed else "close"
+
+    def _load_remote_maps(self):
+        """Streams every remote issue into lookup maps by ID and by Title, once per run (thread-safe)."""
+        with self._maps_lock:
+            if self._remote_maps is None:
+                remote_map_id = {}
+                remote_map_title = {}
+                for issue in self.connector.iter_issues(self.repo, state="all"):
+                    remote_map_id[str(issue.number)] = issue
+                    remote_map_title[issue.title] = issue
+                if not remote_map_id:
+                    self.logger.warning("No remote issues fetched.")
+                self._remote_maps = (remote_map_id, remote_map_title)
+                self._title_index = None
+            return self._remote_maps
+
+    def _load_title_index(self):
+        remote_map_id, _remote_map_title = self._load_remote_maps()
+        with self._maps_lock:
+            if self._title_index is None:
+                self._title_index = TitleIndex.build(remote_map_id.values())
+            return self._title_index
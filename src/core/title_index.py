@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+import math
+import re
+import sys
+import unicodedata
+
+# Tags in brackets "(type:dev)" / "[WIP]" and @mentions do not identify a task
+_TAGS = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_MENTION = re.compile(r"(?<![\w@])@[\w-]+")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+def normalize_title(title):
+    """
+    Canonical form used for matching: NFKC, lower-case, without bracketed tags or
+    @mentions, punctuation folded to single spaces. Issue refs (`#12`) are kept, as they
+    tell apart e.g. `Design for #12: Login` and `Design for #13: Login`.
+    """
+    title = unicodedata.normalize("NFKC", title).lower()
+    title = _MENTION.sub(" ", _TAGS.sub(" ", title))
+    return " ".join(_SEPARATORS.sub(" ", title).split())
+
+def trigrams(text):
+    # Interned: a large index holds each distinct trigram once, not once per title
+    padded = f"  {text} "
+    return frozenset([sys.intern(padded[i:i + 3]) for i in range(len(padded) - 2)])
+
+
+class TitleIndex:
+    """
+    Fuzzy title lookup over issues: an exact map of normalized titles plus a trigram
+    index scored by Jaccard similarity.
+    Lookups use prefix filtering: a title scoring >= threshold must share at least one of
+    the query's rarest `n - ceil(threshold * n) + 1` trigrams, so only those (short) posting
+    lists are read, and candidates are length-filtered before scoring.
+    """
+    DEFAULT_THRESHOLD = 0.8
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._issues = {}    # number -> issue
+        self._exact = {}     # normalized title -> {numbers}
+        self._grams = {}     # number -> its trigrams (a tuple: a third the size of a frozenset)
+        self._postings = {}  # trigram -> {numbers}
+
+    @classmethod
+    def build(cls, issues, threshold=DEFAULT_THRESHOLD):
+        index = cls(threshold)
+        for issue in issues:
+            index.add(issue)
+        return index
+
+    def __len__(self):
+        return len(self._issues)
+
+    def add(self, issue):
+        """Indexes an issue (re-indexes it if its number is already known)."""
+        number = issue.number
+        if number in self._issues:
+            self.remove(number)
+        norm = normalize_title(issue.title)
+        grams = trigrams(norm)
+        self._issues[number] = issue
+        self._exact.setdefault(norm, set()).add(number)
+        self._grams[number] = tuple(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(number)
+
+    def remove(self, number):
+        issue = self._issues.pop(number, None)
+        if issue is None:
+            return
+        norm = normalize_title(issue.title)
+        self._exact[norm].discard(number)
+        if not self._exact[norm]:
+            del self._exact[norm]
+        for gram in self._grams.pop(number):
+            self._postings[gram].discard(number)
+            if not self._postings[gram]:
+                del self._postings[gram]
+
+    def search(self, title, threshold=None, limit=5):
+        """Returns up to `limit` (issue, score) pairs scoring >= threshold, best first."""
+        threshold = self.threshold if threshold is None else threshold
+        norm = normalize_title(title)
+        if not norm:
+            return []
+        exact = self._exact.get(norm)
+        if exact:
+            return [(self._issues[n], 1.0) for n in sorted(exact)[:limit]]
+
+        grams = trigrams(norm)
+        size = len(grams)
+        need = max(1, math.ceil(threshold * size))
+        rarest = sorted(grams, key=lambda g: len(self._postings.get(g, ())))
+        candidates = set()
+        for gram in rarest[:size - need + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        # Jaccard >= t implies t*|A| <= |B| <= |A|/t
+        min_size = threshold * size
+        max_size = size / threshold if threshold > 0 else float("inf")
+        index_grams = self._grams
+        scored = []
+        for number in candidates:
+            other = index_grams[number]
+            other_size = len(other)
+            if other_size < min_size or other_size > max_size:
+                continue
+            shared = len(grams.intersection(other))
+            score = shared / (size + other_size - shared)
+            if score >= threshold:
+                scored.append((score, number))
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        return [(self._issues[n], round(score, 3)) for score, n in scored[:limit]]
+
+    def match(self, title, threshold=None):
+        """
+        Returns (issue, score) for the single best match, or (None, 0.0) when nothing
+        clears the threshold or the best score is shared by several issues (ambiguous).
+        """
+        results = self.search(title, threshold, limit=2)
+        if not results or (len(results) == 2 and results[0][1] == results[1][1]):
+            return None, 0.0
+        return results[0]
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+import re
+
+# `Derived from #12` (added by phase transitions) and `Ref: #12` link a task to its parent
+TRACE_LINK = re.compile(r"(?:Derived from|Ref:)\s*#(\d+)", re.IGNORECASE)
+
+class TraceIndex:
+    """
+    Parent/child DAG over issues, built from the trace links in their bodies.
+    Bodies are parsed once; every lookup afterwards is a dict access, so walking the
+    whole graph is O(issues + links).
+    """
+    def __init__(self):
+        self.issues = {}    # number -> issue
+        self.parents = {}   # number -> [parent numbers], in body order
+        self.children = {}  # number -> [child numbers], in issue order
+
+    @classmethod
+    def build(cls, issues):
+        index = cls()
+        for issue in issues:
+            index.issues[issue.number] = issue
+        for issue in index.issues.values():
+            number = issue.number
+            seen = set()
+            for match in TRACE_LINK.finditer(issue.body or ""):
+                parent = int(match.group(1))
+                if parent == number or parent in seen:
+                    continue
+                seen.add(parent)
+                index.parents.setdefault(number, []).append(parent)
+                index.children.setdefault(parent, []).append(number)
+        return index
+
+    def __len__(self):
+        return len(self.issues)
+
+    def roots(self):
+        """
+        Requirements at the top of a chain: parents that link to nothing themselves.
+        A parent that is not among the indexed issues (deleted, other repo) is a root too.
+        """
+        return sorted(n for n in self.children if not self.parents.get(n))
+
+    def edges_by_root(self):
+        """
+        Yields (root, [(parent, child), ...]) with every link listed exactly once, under
+        the first root it is reachable from (depth-first, so chains read top to bottom).
+        Links only reachable through a cycle are grouped under the cycle's lowest number.
+        """
+        visited = set()
+
+        def walk(root):
+            edges = []
+            stack = [root]
+            visited.add(root)
+            while stack:
+                node = stack.pop()
+                kids = self.children.get(node, ())
+                for child in kids:
+                    edges.append((node, child))
+                # Reversed so the first child is expanded first
+                for child in reversed(kids):
+                    if child not in visited:
+                        visited.add(child)
+                        stack.append(child)
+            return edges
+
+        for root in self.roots():
+            yield root, walk(root)
+        for node in sorted(self.children):
+            if node not in visited:
+                yield node, walk(node)
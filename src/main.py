@@ -15,11 +15,21 @@ if parent_dir not in sys.path:
 
 # Import custom modules
 from src.connectors.github import GitHubConnector
+from src.connectors.cache import IssueCache
+from src.connectors.transport import HttpTransport
+from src.connectors.fake import FakeTransport, RecordingTransport, ReplayTransport
+from src.connectors.issue import Issue
+from src.connectors.scheduler import RequestScheduler
 from src.core.resource import ResourceManager
+from src.core.risk import RiskEngine
 from src.core.phase import PhaseManager
 from src.core.sync import SyncManager
+from src.core.title_index import TitleIndex
+from src.reports.portfolio import PortfolioReport, read_repos_file
 from src.reports.report import ReportGenerator
+from src.reports.writer import ReportWriter
 from src.core.intelligence import IntelligenceEngine
+from src.utils.tracing import tracer
 
 # Setup Logger
 logging.basicConfig(
@@ -29,53 +39,152 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def main():
+def main(argv=None):
+    """CLI entry point. Returns the GitHub connector used (handy for embedding and benchmarks)."""
     parser = argparse.ArgumentParser(description="Project Control Center 2.0")
     subparsers = parser.add_subparsers(dest="command")
 
+    # Shared options: tracing (all commands)
+    trace_parser = argparse.ArgumentParser(add_help=False)
+    trace_parser.add_argument("--trace", metavar="OUT_JSON", help="Record spans of external calls and write a Chrome trace-event file")
+
+    # Shared options: GitHub transport and local issue cache
+    connector_parser = argparse.ArgumentParser(add_help=False, parents=[trace_parser])
+    connector_parser.add_argument("--transport", choices=["cli", "http", "fake", "replay"], default="cli",
+                                  help="cli: one `gh` process per request; http: pooled in-process HTTPS connections; "
+                                       "fake: offline backend from --fixture; replay: serve a --record session")
+    connector_parser.add_argument("--fixture", help="Fake backend fixture (JSON) or recorded session (JSON lines)")
+    connector_parser.add_argument("--record", help="Append every API request/response to this session file")
+    cache_group = connector_parser.add_mutually_exclusive_group()
+    cache_group.add_argument("--refresh", action="store_true", help="Discard the local issue cache and re-download all issues")
+    cache_group.add_argument("--offline", action="store_true", help="Serve issue queries from the local cache only")
+
     # Command: Init (Create Repo + Config)
-    init_parser = subparsers.add_parser("init", help="Initialize a new project")
+    init_parser = subparsers.add_parser("init", help="Initialize a new project", parents=[trace_parser])
     init_parser.add_argument("--repo", required=True, help="GitHub repository name (owner/repo)")
     init_parser.add_argument("--desc", required=False, help="Project description")
 
     # Command: Scaffold (Generate Requirements)
-    scaffold_parser = subparsers.add_parser("scaffold", help="Generate requirements using AI/Template")
+    scaffold_parser = subparsers.add_parser("scaffold", help="Generate requirements using AI/Template", parents=[trace_parser])
     scaffold_parser.add_argument("--req", required=True, help="Raw requirement description")
     scaffold_parser.add_argument("--out", required=True, help="Output markdown file path")
 
     # Command: Import (Markdown -> GitHub Issues)
-    import_parser = subparsers.add_parser("import", help="Import tasks from local file to GitHub")
+    import_parser = subparsers.add_parser("import", help="Import tasks from local file to GitHub", parents=[connector_parser])
     import_parser.add_argument("--file", required=True, help="Local markdown file")
     import_parser.add_argument("--repo", required=True, help="Target repository")
+    import_parser.add_argument("--assign", choices=ResourceManager.SOLVERS, default="greedy",
+                               help="greedy: best free match per task, in order; optimal: best total skill coverage for the batch")
 
     # Command: Launch Phase (Transition Gate)
-    launch_parser = subparsers.add_parser("launch", help="Transition to next phase")
+    launch_parser = subparsers.add_parser("launch", help="Transition to next phase", parents=[connector_parser])
     launch_parser.add_argument("--repo", required=True, help="Repository name")
     launch_parser.add_argument("--from", dest="from_phase", required=True, choices=["requirement", "design", "dev"])
     launch_parser.add_argument("--to", dest="to_phase", required=True, choices=["design", "dev", "test"])
+    launch_parser.add_argument("--assign", choices=ResourceManager.SOLVERS, default="greedy",
+                               help="greedy: best free match per task, in order; optimal: best total skill coverage for the batch")
 
     # Command: Sync (Bi-directional)
-    sync_parser = subparsers.add_parser("sync", help="Sync local file status with GitHub")
+    sync_parser = subparsers.add_parser("sync", help="Sync local file status with GitHub", parents=[connector_parser])
     sync_parser.add_argument("--repo", required=True, help="Repository name")
-    sync_parser.add_argument("--file", required=True, help="Local markdown file")
+    sync_target = sync_parser.add_mutually_exclusive_group(required=True)
+    sync_target.add_argument("--file", help="Local markdown file")
+    sync_target.add_argument("--dir", help="Directory of markdown files (searched recursively)")
+    sync_parser.add_argument("--glob", default="*.md", help="File pattern used with --dir (default: *.md)")
+    sync_parser.add_argument("--workers", type=int, default=8, help="Files processed in parallel with --dir")
+    sync_parser.add_argument("--watch", action="store_true", help="Keep running: sync on file changes and poll GitHub periodically")
+    sync_parser.add_argument("--remote-interval", type=float, default=30.0, help="Seconds between GitHub polls in --watch mode (default: 30)")
+    sync_parser.add_argument("--debounce", type=float, default=0.5, help="Quiet seconds that end a burst of edits in --watch mode (default: 0.5)")
+    sync_parser.add_argument("--full", action="store_true", help="Ignore the sync journal and re-examine every line")
 
     # Command: Status (Generate Report)
-    status_parser = subparsers.add_parser("status", help="Generate project status report")
-    status_parser.add_argument("--repo", required=True, help="Repository name")
-    status_parser.add_argument("--out", required=False, default="REPORT.md", help="Output report file")
+    status_parser = subparsers.add_parser("status", help="Generate project status report", parents=[connector_parser])
+    status_target = status_parser.add_mutually_exclusive_group(required=True)
+    status_target.add_argument("--repo", help="Repository name")
+    status_target.add_argument("--repos-file", help="Portfolio report over the repositories listed in this file (one owner/name per line)")
+    status_target.add_argument("--org", help="Portfolio report over every (non-archived) repository of this organization")
+    status_parser.add_argument("--out", required=False, default="REPORT.md", help="Output report file ('-' streams to stdout)")
+    status_parser.add_argument("--sections", help=f"Comma-separated report sections to include "
+                                                  f"({','.join(ReportGenerator.SECTIONS)}; default: all)")
+
+    # Command: Risk (Evaluate risk rules)
+    risk_parser = subparsers.add_parser("risk", help="Evaluate project risk rules (thresholds from config.json)", parents=[connector_parser])
+    risk_parser.add_argument("--repo", required=True, help="Repository name")
+    risk_parser.add_argument("--format", choices=["markdown", "json"], default="markdown", help="Output format (default: markdown)")
+    risk_parser.add_argument("--out", default="-", help="Output file (default: '-' for stdout)")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
         return
 
+    if args.trace:
+        tracer.enable()
+
+    if args.command == "status":
+        try:
+            args.sections = ReportGenerator.parse_sections(args.sections)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.command in ("status", "risk"):
+        if args.out == "-":
+            # The report owns stdout; keep log lines out of it
+            for handler in logging.getLogger().handlers:
+                if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+                    handler.setStream(sys.stderr)
+
     # Initialize Components
-    connector = GitHubConnector(logger=logger)
-    resource_mgr = ResourceManager(logger=logger)
-    intelligence = IntelligenceEngine(logger=logger)
+    with tracer.span("setup", "cli"):
+        transport, connector = build_connector(args, parser)
+        resource_mgr = ResourceManager(logger=logger)
+        intelligence = IntelligenceEngine(logger=logger)
 
-    # Dispatch Commands
+    # Dispatch Commands (one top-level span per subcommand when tracing)
+    try:
+        with tracer.span(f"command {args.command}", "cli", argv=sys.argv[1:] if argv is None else argv):
+            dispatch(args, connector, resource_mgr, intelligence)
+    finally:
+        if args.trace:
+            count = tracer.export_chrome(args.trace)
+            logger.info(f"Trace written to {args.trace} ({count} spans).")
+
+    # Persist writes made against the offline backend so later commands see them
+    if isinstance(transport, FakeTransport) and transport.dirty:
+        transport.save()
+    return connector
+
+def build_connector(args, parser):
+    """Builds the GitHub connector (transport, cache, scheduler) for the parsed options."""
+    transport = None
+    if hasattr(args, "offline"):
+        if args.transport in ("fake", "replay") and not args.fixture:
+            parser.error(f"--transport {args.transport} requires --fixture")
+        if args.transport == "http":
+            transport = HttpTransport(logger=logger)
+        elif args.transport == "fake":
+            transport = FakeTransport(args.fixture, logger=logger)
+        elif args.transport == "replay":
+            transport = ReplayTransport(args.fixture)
+        # Keep offline backends from mixing their issues into the real cache
+        if args.transport in ("fake", "replay"):
+            cache = IssueCache(f"{args.fixture}.cache.db", logger=logger)
+        else:
+            cache = IssueCache(logger=logger)
+        # Offline backends have no rate limit worth pacing for
+        scheduler = RequestScheduler(rate=None, logger=logger) if args.transport in ("fake", "replay") else None
+        connector = GitHubConnector(logger=logger, cache=cache, offline=args.offline, transport=transport, scheduler=scheduler)
+        if args.record:
+            connector.transport = RecordingTransport(connector.transport, args.record)
+        # Portfolio reports refresh each repo in its own fetch job
+        if args.refresh and getattr(args, "repo", None):
+            connector.refresh_cache(args.repo, full=True)
+    else:
+        connector = GitHubConnector(logger=logger)
+    return transport, connector
+
+def dispatch(args, connector, resource_mgr, intelligence):
+    """Runs the selected subcommand."""
     if args.command == "init":
         # Init Logic
         logger.info(f"Initializing project: {args.repo}...")
@@ -113,13 +222,13 @@ def main():
         if not suggestions:
             content += "- [ ] Define Core Requirement (AI could not infer details)\n"
         else:
-            for task in suggestions:
+            # Assignee prediction for all suggestions in one pass
+            assignments = resource_mgr.assign_batch([task['labels'] for task in suggestions])
+            for task, assignees in zip(suggestions, assignments):
                 # Basic context mapping
                 task_title = task['title']
                 labels = ",".join(task['labels'])
                 
-                # Assignee prediction
-                assignees = resource_mgr.find_best_assignee(task['labels'])
                 assignee_str = f" @{assignees[0]}" if assignees else ""
                 
                 content += f"- [ ] {task_title} ({labels}){assignee_str}\n"
@@ -146,6 +255,10 @@ def main():
         # Group 4: #issue_id (optional, ignore for import creation)
         pattern = re.compile(r'- \[([ x])\] (.*?)(?: @([\w-]+))?(?: #(\d+))?$')
 
+        pending = []
+        auto_assign = []  # (pending position, tags) for tasks without a manual @assignee
+        title_index = None  # Existing and queued issues, for linking instead of creating duplicates
+        linked = duplicates = 0
         for line in lines:
             line_stripped = line.strip()
             if not line_stripped.startswith("- ["): continue
@@ -160,6 +273,20 @@ def main():
                 if existing_id:
                     logger.info(f"Skipping existing issue #{existing_id}: {title_raw}")
                     continue
+
+                # Same task already on GitHub (modulo punctuation, tags, @assignee)?
+                if title_index is None:
+                    # Through the planner, so the workload query below reuses this snapshot
+                    title_index = TitleIndex.build(connector.fetch_issues(args.repo, state="all", raise_errors=True))
+                existing, score = title_index.match(title_raw)
+                if existing and existing.number < 0:
+                    logger.info(f"Skipping duplicate of '{existing.title}' (similarity {score:.2f}): {title_raw}")
+                    duplicates += 1
+                    continue
+                if existing:
+                    logger.info(f"Linked to existing issue #{existing.number} (similarity {score:.2f}): {title_raw}")
+                    linked += 1
+                    continue
                 
                 # Assignee Logic: Manual Override > Auto Skill Match
                 assignees = []
@@ -180,16 +307,38 @@ def main():
                             parts = [t.strip() for t in match.split(',')]
                             tags.extend(parts)
                     
-                    assignees = resource_mgr.find_best_assignee(tags)
+                    auto_assign.append((len(pending), tags))
                 
-                # Create Issue
-                logger.info(f"Creating: {title_raw}")
+                # Queue Issue
                 # Clean labels: if tags found, use them as GitHub labels too? Yes ideally.
                 # For now, stick to type:requirement as base
                 final_labels = ["type:requirement"]
-                
-                connector.create_issue(args.repo, title_raw, "Imported Task", labels=final_labels, assignees=assignees)
-                logger.info(f"Imported: {title_raw} -> Assigned to {assignees}")
+                pending.append({"title": title_raw, "body": "Imported Task", "labels": final_labels, "assignees": assignees or []})
+                # Indexed under a negative placeholder number, so a later duplicate line is not queued again
+                title_index.add(Issue(-len(pending), title_raw))
+
+        # Skill-match the tasks without a manual assignee in one batch, spread by current open issues
+        if auto_assign:
+            resource_mgr.set_workload(connector.fetch_issues(args.repo, state="open"))
+            assignments = resource_mgr.assign_batch([tags for _, tags in auto_assign], solver=args.assign)
+            for (position, _), assignees in zip(auto_assign, assignments):
+                pending[position]["assignees"] = assignees or []
+
+        # Create all queued issues in bulk (batched GraphQL mutations)
+        if linked:
+            logger.info(f"{linked} tasks already exist on GitHub and were not re-created.")
+        if duplicates:
+            logger.info(f"{duplicates} lines repeat a task listed earlier in {args.file} and were skipped.")
+        logger.info(f"Creating {len(pending)} issues...")
+        failed = 0
+        for task, result in zip(pending, connector.create_issues(args.repo, pending)):
+            if result["ok"]:
+                logger.info(f"Imported: {task['title']} -> #{result['number']} Assigned to {task['assignees']}")
+            else:
+                failed += 1
+                logger.error(f"Failed to import '{task['title']}': {result['error']}")
+        if failed:
+            logger.warning(f"{failed} of {len(pending)} issues failed to import.")
 
     elif args.command == "launch":
         phase_mgr = PhaseManager(connector, resource_mgr, args.repo)
@@ -206,27 +355,56 @@ def main():
         # 2. Generate Next Phase Tasks (Linked)
         next_tasks = []
         for parent in closed_parent_tasks:
-            new_title = f"{args.to_phase.title()} for #{parent['number']}: {parent['title']}"
+            new_title = f"{args.to_phase.title()} for #{parent.number}: {parent.title}"
             new_task = {
                 "title": new_title,
                 "body": f"Transitioned from Phase: {args.from_phase}",
                 "labels": [f"type:{args.to_phase}"],
-                "parent_id": parent['number']
+                "parent_id": parent.number
             }
             next_tasks.append(new_task)
             
         # 3. Execute Creation
         logger.info(f"Creating {len(next_tasks)} linked tasks for phase '{args.to_phase}'...")
-        count = phase_mgr.execute_transition(next_tasks)
+        count = phase_mgr.execute_transition(next_tasks, solver=args.assign)
         logger.info(f"Transition Complete. {count} tasks created.")
 
     elif args.command == "sync":
         sync_mgr = SyncManager(connector, resource_mgr, args.repo)
-        sync_mgr.sync(args.file)
+        if args.watch:
+            sync_mgr.watch(args.file, args.dir, args.glob, debounce=args.debounce,
+                           remote_interval=args.remote_interval, max_workers=args.workers)
+        elif args.dir:
+            sync_mgr.sync_tree(args.dir, args.glob, full=args.full, max_workers=args.workers)
+        else:
+            sync_mgr.sync(args.file, full=args.full)
 
     elif args.command == "status":
-        report_gen = ReportGenerator(connector, resource_mgr, args.repo)
-        report_gen.generate(args.out)
+        if args.repo:
+            report_gen = ReportGenerator(connector, resource_mgr, args.repo)
+            report_gen.generate(args.out, sections=args.sections)
+            return
+        if args.repos_file:
+            repos = read_repos_file(args.repos_file)
+        else:
+            repos = connector.list_org_repos(args.org)
+        if not repos:
+            logger.error("No repositories to report on.")
+            return
+        logger.info(f"Generating portfolio report for {len(repos)} repositories...")
+        PortfolioReport(connector, resource_mgr, repos).generate(args.out, sections=args.sections, refresh=args.refresh)
+
+    elif args.command == "risk":
+        engine = RiskEngine(logger=logger)
+        report_gen = ReportGenerator(connector, resource_mgr, args.repo, risk_engine=engine)
+        issues = connector.fetch_issues(args.repo, state="all", with_body=engine.needs_bodies)
+        if engine.needs_ci:
+            report_gen.ci_runs = report_gen.fetch_ci_runs()
+        risks = report_gen.analyze_risks(issues)
+        with ReportWriter(args.out) as writer:
+            writer.write(risks.to_json() if args.format == "json" else risks.to_markdown())
+        if not writer.to_stdout:
+            logger.info(f"{len(risks)} risk finding(s) for {args.repo} written to {args.out}")
 
 if __name__ == "__main__":
     main()
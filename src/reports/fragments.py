@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import logging
+import os
+
+class SectionCache:
+    """
+    Rendered report sections from the previous run, kept in a sidecar next to the report
+    (`.<name>.sections.json`). Each fragment is stored with the fingerprint of the inputs
+    it was rendered from; an unchanged fingerprint means the fragment can be reused as is.
+    """
+    VERSION = 1
+
+    def __init__(self, path, repo, data=None):
+        self.path = path
+        self.repo = repo
+        data = data or {}
+        self.sections = data.get("sections", {})  # name -> {"fingerprint", "fragment"}
+        self.dirty = False
+
+    @staticmethod
+    def path_for(report_path):
+        directory, name = os.path.split(os.path.abspath(report_path))
+        return os.path.join(directory, f".{name}.sections.json")
+
+    @classmethod
+    def load(cls, report_path, repo, logger=None):
+        """Loads the fragments for a report; starts empty if missing, corrupt or for another repo."""
+        logger = logger or logging.getLogger(__name__)
+        path = cls.path_for(report_path)
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") == cls.VERSION and data.get("repo") == repo:
+                    return cls(path, repo, data)
+                logger.info(f"Section cache {path} belongs to another repo/version. Starting fresh.")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Invalid section cache {path}: {e}. Starting fresh.")
+        return cls(path, repo)
+
+    @staticmethod
+    def fingerprint(keys, *extra):
+        """Digest of an iterable of per-issue key tuples, plus any extra inputs (e.g. today's date)."""
+        digest = hashlib.blake2b(digest_size=16)
+        for value in extra:
+            digest.update(f"{value}\x1e".encode("utf-8"))
+        for key in keys:
+            digest.update("\x1f".join(map(str, key)).encode("utf-8"))
+            digest.update(b"\n")
+        return digest.hexdigest()
+
+    def get(self, name, fingerprint):
+        """Returns the cached fragment for section `name` if it was rendered from `fingerprint`."""
+        entry = self.sections.get(name)
+        if entry and entry.get("fingerprint") == fingerprint:
+            return entry["fragment"]
+        return None
+
+    def put(self, name, fingerprint, fragment):
+        self.sections[name] = {"fingerprint": fingerprint, "fragment": fragment}
+        self.dirty = True
+
+    def prune(self, keep):
+        """Drops fragments whose key fails `keep(key)` (e.g. repos no longer reported on)."""
+        stale = [key for key in self.sections if not keep(key)]
+        for key in stale:
+            del self.sections[key]
+        self.dirty = self.dirty or bool(stale)
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {"version": self.VERSION, "repo": self.repo, "sections": self.sections}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+import logging
+
+from src.core.risk import RiskEngine
+from src.reports.fragments import SectionCache
+from src.reports.report import ReportGenerator
+from src.reports.writer import ReportWriter
+from src.utils.tracing import tracer
+
+def read_repos_file(path):
+    """Reads `owner/name` lines (blank lines and `#` comments ignored), without duplicates."""
+    repos = []
+    with open(path, "r") as f:
+        for line in f:
+            repo = line.split("#", 1)[0].strip()
+            if repo and repo not in repos:
+                repos.append(repo)
+    return repos
+
+
+class PortfolioReport:
+    """
+    One status report across many repositories: a portfolio rollup followed by a
+    `ReportGenerator` section per repo. Issues for all repos are fetched concurrently on
+    the connector's worker pool; a repo that fails to load is reported as such and the
+    rest of the portfolio is still rendered.
+    """
+    def __init__(self, connector, resource_mgr, repos, risk_engine=None):
+        self.connector = connector
+        self.resource_mgr = resource_mgr
+        self.repos = repos
+        self.logger = logging.getLogger(__name__)
+        self.risk_engine = risk_engine or RiskEngine(logger=self.logger)
+        self.ci_runs = {}  # repo -> latest CI runs, when the risks section needs them
+
+    def _generator(self, repo):
+        return ReportGenerator(self.connector, self.resource_mgr, repo,
+                               risk_engine=self.risk_engine, ci_runs=self.ci_runs.get(repo))
+
+    def _fetch(self, repo, with_body, with_ci, refresh):
+        with tracer.span("portfolio fetch", "report", repo=repo):
+            if refresh:
+                self.connector.refresh_cache(repo, full=True)
+            issues = self.connector.fetch_issues(repo, state="all", with_body=with_body, raise_errors=True)
+            if with_ci:
+                self.ci_runs[repo] = self._generator(repo).fetch_ci_runs()
+            return issues
+
+    def fetch_all(self, with_body=False, with_ci=False, refresh=False):
+        """Returns {repo: issues or the exception that stopped its fetch}, in input order."""
+        futures = {
+            repo: self.connector.scheduler.submit(self._fetch, repo, with_body, with_ci, refresh)
+            for repo in self.repos
+        }
+        results = {}
+        for repo, future in futures.items():
+            try:
+                results[repo] = future.result()
+            except Exception as e:
+                self.logger.error(f"Failed to fetch issues for {repo}: {e}")
+                results[repo] = e
+        return results
+
+    @tracer.traced("portfolio generate", "report")
+    def generate(self, output_path, sections=None, refresh=False):
+        """Writes the portfolio report (a file, or stdout for None/"-")."""
+        sections = sections or list(ReportGenerator.SECTIONS)
+        risks = "risks" in sections
+        results = self.fetch_all(with_body="matrix" in sections or (risks and self.risk_engine.needs_bodies),
+                                 with_ci=risks and self.risk_engine.needs_ci, refresh=refresh)
+        failed = [repo for repo, issues in results.items() if isinstance(issues, Exception)]
+
+        cache = None
+        if output_path not in (None, "-"):
+            cache = SectionCache.load(output_path, "portfolio", logger=self.logger)
+            prefixes = tuple(f"{repo}:" for repo in self.repos)
+            cache.prune(lambda key: key.startswith(prefixes))
+
+        # One generator per repo, shared by the rollup and the repo's sections (risks are evaluated once)
+        generators = {repo: self._generator(repo) for repo, issues in results.items() if not isinstance(issues, Exception)}
+        with ReportWriter(output_path) as writer:
+            writer.write_all(self.section_rollup(results, generators))
+            for repo, issues in results.items():
+                if isinstance(issues, Exception):
+                    writer.write(f"# 📊 Project Report: {repo}\n\n> ❌ Could not load issues: {issues}\n\n")
+                    continue
+                generators[repo].render(writer, issues, sections, cache, key_prefix=f"{repo}:")
+
+        if cache is not None:
+            cache.save()
+        if failed:
+            self.logger.warning(f"{len(failed)} of {len(results)} repositories could not be loaded: {', '.join(failed)}")
+        if writer.to_stdout:
+            return
+        if writer.changed:
+            self.logger.info(f"Portfolio report for {len(results)} repositories generated at {output_path}")
+        else:
+            self.logger.info(f"Portfolio report at {output_path} is up to date.")
+
+    def section_rollup(self, results, generators):
+        """Portfolio table and at-risk list; counts come from each repo's RiskEngine findings."""
+        summaries = {repo: generators[repo].summarize(results[repo]) for repo in generators}
+        yield f"# 📁 Portfolio Report ({len(results)} repositories)\n\n"
+        yield "| Repository | Progress | Total | Open | Overdue | Unassigned |\n|---|---|---|---|---|---|\n"
+        totals = {"total": 0, "closed": 0, "open": 0, "overdue": 0, "unassigned": 0}
+        for repo in results:
+            stats = summaries.get(repo)
+            if stats is None:
+                yield f"| {repo} | ❌ failed | - | - | - | - |\n"
+                continue
+            for key in totals:
+                totals[key] += stats[key]
+            yield (f"| {repo} | {stats['progress']}% | {stats['total']} | {stats['open']} "
+                   f"| {stats['overdue']} | {stats['unassigned']} |\n")
+        progress = int((totals['closed'] / totals['total']) * 100) if totals['total'] > 0 else 0
+        yield (f"| **Portfolio** | **{progress}%** | **{totals['total']}** | **{totals['open']}** "
+               f"| **{totals['overdue']}** | **{totals['unassigned']}** |\n\n")
+
+        at_risk = sorted(
+            (repo for repo, stats in summaries.items() if stats['overdue'] or stats['unassigned']),
+            key=lambda repo: (-(summaries[repo]['overdue'] + summaries[repo]['unassigned']), repo),
+        )
+        if at_risk:
+            yield "## ⚠️ Repositories at Risk\n"
+            for repo in at_risk[:10]:
+                yield f"- {repo}: {summaries[repo]['overdue']} overdue, {summaries[repo]['unassigned']} unassigned\n"
+            yield "\n"
@@ -4,111 +4,230 @@ import logging
 import os
 import datetime
 import subprocess
+import time
+
+from src.core import analytics
+from src.core.risk import RiskEngine
+from src.core.traceability import TraceIndex
+from src.reports.fragments import SectionCache
+from src.reports.writer import ReportWriter
+from src.utils.tracing import tracer
 
 class ReportGenerator:
     """
     Generates markdown reports and charts.
     """
-    def __init__(self, connector, resource_mgr, repo_name):
+    def __init__(self, connector, resource_mgr, repo_name, risk_engine=None, ci_runs=None):
         self.connector = connector
         self.resource_mgr = resource_mgr
         self.repo = repo_name
         self.logger = logging.getLogger(__name__)
+        self.risk_engine = risk_engine or RiskEngine(logger=self.logger)
+        self.ci_runs = ci_runs  # Latest CI runs (newest first) for the ci-failing rule
+        self._metrics = None  # (issues, Metrics) for the issue list being rendered
+        self._risks = None    # (issues, RiskReport), likewise
+        self._trace = None    # (issues, TraceIndex), shared by the matrix and the blocked rule
 
-    def generate(self, output_path):
-        """Generates a full status report."""
-        issues = self.connector.fetch_issues(self.repo, state="all", limit=500)
-        
-        # Calculate Stats
-        total = len(issues)
-        closed = len([i for i in issues if i['state'] == 'closed'])
-        progress = int((closed / total) * 100) if total > 0 else 0
-        
-        # Risk Analysis
-        risks = self.analyze_risks(issues)
-        
-        # Gantt Chart Data
-        gantt_data = self.generate_gantt(issues)
-        
-        # Markdown Content
-        content = f"# 📊 Project Report: {self.repo}\n\n"
-        content += f"## Status: {progress}% Complete\n"
-        content += f"- **Total Tasks**: {total}\n"
-        content += f"- **Closed**: {closed}\n"
-        content += f"- **Open**: {total - closed}\n\n"
-        
-        if risks:
-            content += "## ⚠️ Risks Detected\n"
-            for risk in risks:
-                content += f"- {risk}\n"
-            content += "\n"
-        
-        # Traceability Matrix
-        content += "## 🔗 Traceability Matrix\n"
-        content += "| Parent Task | Derived Task | Status |\n|---|---|---|\n"
-        
-        # Simple heuristic mapping based on body content
-        for i in issues:
-            if "Derived from #" in i.get('body', ''):
-                import re
-                match = re.search(r"Derived from #(\d+)", i['body'])
-                if match:
-                    parent_id = match.group(1)
-                    # Find parent info
-                    parent = next((p for p in issues if str(p['number']) == parent_id), None)
-                    parent_title = parent['title'] if parent else "Unknown"
-                    content += f"| #{parent_id} {parent_title} | #{i['number']} {i['title']} | {i['state']} |\n"
-        content += "\n"
-
-        content += "## 📅 Schedule (Gantt)\n"
-        content += "```mermaid\n" + gantt_data + "\n```\n"
-        
-        with open(output_path, "w") as f:
-            f.write(content)
-        
-        self.logger.info(f"Report generated at {output_path}")
+    # Section name -> generator method, in document order
+    SECTIONS = {
+        "stats": "section_stats",
+        "risks": "section_risks",
+        "matrix": "section_matrix",
+        "gantt": "section_gantt",
+    }
+
+    @classmethod
+    def parse_sections(cls, spec):
+        """Parses a `--sections risks,matrix,gantt` value; None/empty selects all sections."""
+        if not spec:
+            return list(cls.SECTIONS)
+        names = [n.strip() for n in spec.split(",") if n.strip()]
+        unknown = [n for n in names if n not in cls.SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown report section(s): {', '.join(unknown)}. Choose from: {', '.join(cls.SECTIONS)}")
+        # Document order, regardless of the order given
+        return [n for n in cls.SECTIONS if n in names]
+
+    @tracer.traced("report generate", "report")
+    def generate(self, output_path, sections=None):
+        """
+        Generates a status report. Sections are generators streamed one by one into the
+        output (a file, or stdout for None/"-"), so nothing holds the whole document.
+        `sections` restricts the report to the named sections (default: all).
+        For a report file, each rendered section is cached with a fingerprint of its
+        inputs and reused while the fingerprint holds; an identical report is not rewritten.
+        """
+        sections = sections or list(self.SECTIONS)
+        issues = self.connector.fetch_issues(self.repo, state="all", with_body=self.needs_bodies(sections))
+        if "risks" in sections and self.risk_engine.needs_ci:
+            self.ci_runs = self.fetch_ci_runs()
+        cache = None
+        if output_path not in (None, "-"):
+            cache = SectionCache.load(output_path, self.repo, logger=self.logger)
+
+        with ReportWriter(output_path) as writer:
+            reused = self.render(writer, issues, sections, cache)
+
+        if cache is not None:
+            cache.save()
+        if writer.to_stdout:
+            return
+        if reused:
+            self.logger.info(f"Reused cached section(s): {', '.join(reused)}.")
+        if writer.changed:
+            self.logger.info(f"Report generated at {output_path}")
+        else:
+            self.logger.info(f"Report at {output_path} is up to date.")
+
+    def render(self, writer, issues, sections, cache=None, key_prefix=""):
+        """
+        Streams this repo's report for `issues` into `writer`. With a SectionCache,
+        fragments are stored under `key_prefix + section name` and reused while their
+        fingerprint holds. Returns the names of the sections served from the cache.
+        """
+        reused = []
+        writer.write_all(self.section_header(issues))
+        for name in sections:
+            with tracer.span(f"report section {name}", "report", repo=self.repo, issues=len(issues)) as span:
+                started = time.perf_counter()
+                chars = writer.chars
+                if cache is None:
+                    writer.write_all(getattr(self, self.SECTIONS[name])(issues))
+                else:
+                    key = key_prefix + name
+                    fingerprint = self.section_fingerprint(name, issues)
+                    fragment = cache.get(key, fingerprint)
+                    if fragment is None:
+                        fragment = "".join(getattr(self, self.SECTIONS[name])(issues))
+                        cache.put(key, fingerprint, fragment)
+                    else:
+                        reused.append(name)
+                    writer.write(fragment)
+                span.set(chars=writer.chars - chars, cached=name in reused)
+            self.logger.debug(f"Section '{name}' of {self.repo} rendered in {time.perf_counter() - started:.3f}s")
+        return reused
+
+    def needs_bodies(self, sections):
+        """Bodies are only fetched for sections that follow trace links."""
+        return "matrix" in sections or ("risks" in sections and self.risk_engine.needs_bodies)
+
+    def fetch_ci_runs(self):
+        """Latest CI run, or None if it cannot be fetched (the report is produced regardless)."""
+        try:
+            return self.connector.fetch_workflow_runs(self.repo, limit=1)
+        except Exception as e:
+            self.logger.warning(f"Could not fetch CI status for {self.repo}: {e}")
+            return None
+
+    def metrics(self, issues):
+        """Analytics for `issues`, computed once per issue list and shared by all sections."""
+        if self._metrics is None or self._metrics[0] is not issues:
+            self._metrics = (issues, analytics.analyze(issues))
+        return self._metrics[1]
+
+    def trace_index(self, issues):
+        """Trace links of `issues`, built once per issue list."""
+        if self._trace is None or self._trace[0] is not issues:
+            self._trace = (issues, TraceIndex.build(issues))
+        return self._trace[1]
+
+    def summarize(self, issues):
+        """
+        Headline numbers for a repo: totals and progress, plus the overdue, due-soon and
+        unassigned counts of the risk rules (same thresholds as the risks section).
+        """
+        summary = self.metrics(issues).summary()
+        by_rule = self.analyze_risks(issues).by_rule()
+        for key, rule in (("overdue", "overdue"), ("due_soon", "due-soon"), ("unassigned", "unassigned")):
+            summary[key] = len(by_rule.get(rule, ()))
+        return summary
+
+    def section_fingerprint(self, name, issues):
+        """
+        Fingerprint of what section `name` is rendered from: per-issue number and state,
+        plus updatedAt where titles/bodies/labels matter. Date-dependent sections also
+        fold in today's date; overdue checks also use milestone due dates, which can change
+        without touching the issue. Risks also depend on the rule thresholds and CI status.
+        """
+        today = datetime.date.today().isoformat()
+        if name == "stats":
+            return SectionCache.fingerprint((i.number, i.state) for i in issues)
+        if name == "risks":
+            ci = self.ci_runs[0].get("conclusion") if self.ci_runs else None
+            return SectionCache.fingerprint(((i.number, i.state, i.updated_at, i.due) for i in issues),
+                                            today, self.risk_engine.settings(), ci)
+        if name == "gantt":
+            return SectionCache.fingerprint(((i.number, i.state, i.updated_at) for i in issues), today)
+        return SectionCache.fingerprint((i.number, i.state, i.updated_at) for i in issues)
 
+    def section_header(self, issues):
+        yield f"# 📊 Project Report: {self.repo}\n\n"
+
+    def section_stats(self, issues):
+        metrics = self.metrics(issues)
+        yield f"## Status: {metrics.progress}% Complete\n"
+        yield f"- **Total Tasks**: {metrics.total}\n"
+        yield f"- **Closed**: {metrics.closed}\n"
+        yield f"- **Open**: {metrics.open}\n\n"
+
+    def section_risks(self, issues):
+        yield from self.analyze_risks(issues).markdown()
+
+    def section_matrix(self, issues):
+        """Traceability matrix, one table per root requirement."""
+        index = self.trace_index(issues)
+        yield "## 🔗 Traceability Matrix\n"
+        if not index.children:
+            yield "_No trace links found._\n"
+
+        def label(number):
+            issue = index.issues.get(number)
+            return f"#{number} {issue.title}" if issue else f"#{number} Unknown"
+
+        for root, edges in index.edges_by_root():
+            yield f"\n### {label(root)}\n"
+            yield "| Parent Task | Derived Task | Status |\n|---|---|---|\n"
+            for parent, child in edges:
+                yield f"| {label(parent)} | {label(child)} | {index.issues[child].state} |\n"
+        yield "\n"
+
+    def section_gantt(self, issues):
+        yield "## 📅 Schedule (Gantt)\n"
+        yield "```mermaid\n"
+        yield self.generate_gantt(issues)
+        yield "\n```\n"
+
+    @tracer.traced("report analyze_risks", "report")
     def analyze_risks(self, issues):
-        """Analyzes overdue, overloaded, and unassigned tasks."""
-        risks = []
-        today = datetime.date.today()
-        
-        # Check overdue
-        for i in issues:
-            if i['state'] == 'open' and i.get('milestone') and i['milestone'].get('dueOn'):
-                due = datetime.datetime.strptime(i['milestone']['dueOn'].split('T')[0], "%Y-%m-%d").date()
-                if due < today:
-                    risks.append(f"OVERDUE: #{i['number']} {i['title']} (Due: {due})")
-        
-        # Check unassigned
-        unassigned = [i for i in issues if i['state'] == 'open' and not i['assignees']]
-        if unassigned:
-            risks.append(f"UNASSIGNED: {len(unassigned)} open tasks found without owner.")
-            
-        return risks
+        """Runs the risk rules (see src/core/risk.py) over `issues`. Returns a RiskReport."""
+        if self._risks is None or self._risks[0] is not issues:
+            trace = self.trace_index(issues) if self.risk_engine.needs_bodies else None
+            self._risks = (issues, self.risk_engine.evaluate(issues, self.ci_runs, repo=self.repo, trace=trace))
+        return self._risks[1]
 
+    @tracer.traced("report generate_gantt", "report")
     def generate_gantt(self, issues):
         """Generates Mermaid Gantt chart syntax."""
-        chart = "gantt\n    dateFormat YYYY-MM-DD\n    title Project Schedule\n"
-        today = datetime.date.today().strftime("%Y-%m-%d")
-        
-        # Group by label (Phase)
+        return "".join(self._gantt_lines(issues))
+
+    def _gantt_lines(self, issues):
+        yield "gantt\n    dateFormat YYYY-MM-DD\n    title Project Schedule\n"
+        today = datetime.date.today().toordinal()
+
+        # Group by phase (`type:` label)
         phases = {}
         for i in issues:
-            labels = [l['name'] for l in i.get('labels', [])]
-            phase = next((l for l in labels if l.startswith('type:')), 'Other')
+            phase = i.phase or 'Other'
             if phase not in phases: phases[phase] = []
             phases[phase].append(i)
-            
+
         for phase, items in phases.items():
-            section_name = phase.replace('type:', '').title()
-            chart += f"    section {section_name}\n"
+            yield f"    section {phase.title()}\n"
             for item in items[:10]: # Limit to avoid chart clutter
-                status = "done" if item['state'] == 'closed' else "active"
-                start = item.get('createdAt', today).split('T')[0]
+                status = "done" if item.is_closed else "active"
+                start = item.created if item.created is not None else today
                 # End date approximation (created + 7 days)
-                end = (datetime.datetime.strptime(start, "%Y-%m-%d") + datetime.timedelta(days=7)).strftime("%Y-%m-%d")
-                
-                chart += f"    {item['title'].replace(':', '')} : {status}, {start}, {end}\n"
-                
-        return chart
+                start_date = datetime.date.fromordinal(start)
+                end_date = datetime.date.fromordinal(start + 7)
+
+                yield f"    {item.title.replace(':', '')} : {status}, {start_date}, {end_date}\n"
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import filecmp
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+class ReportWriter:
+    """
+    Buffered sink for report chunks. Writes either to stdout (`path` of None or "-"),
+    flushing as it goes so the first sections show up while later ones are computed,
+    or to a temp file next to `path` that replaces it on `close()`, so readers never
+    see a half-written report. A report identical to the existing file is discarded
+    instead, leaving the file (and its mtime) untouched; `changed` tells which happened.
+    """
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(self, path=None):
+        self.path = None if path in (None, "-") else path
+        self.chars = 0
+        self.changed = True
+        self._tmp_path = None
+        if self.path is None:
+            self._out = sys.stdout
+            return
+        directory, name = os.path.split(os.path.abspath(self.path))
+        fd, self._tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+        self._out = io.open(fd, "w", encoding="utf-8", buffering=self.BUFFER_SIZE)
+
+    @property
+    def to_stdout(self):
+        return self.path is None
+
+    def write(self, text):
+        self._out.write(text)
+        self.chars += len(text)
+
+    def write_all(self, chunks):
+        """Writes an iterable of chunks (e.g. a section generator)."""
+        for chunk in chunks:
+            self.write(chunk)
+        if self.to_stdout:
+            self._out.flush()
+
+    def close(self):
+        """Finishes the report (swaps the temp file in place)."""
+        if self.to_stdout:
+            self._out.flush()
+            return
+        self._out.flush()
+        if os.path.exists(self.path) and filecmp.cmp(self.path, self._tmp_path, shallow=False):
+            self.changed = False
+            self.abort()
+            return
+        os.fsync(self._out.fileno())
+        self._out.close()
+        if os.path.exists(self.path):
+            shutil.copymode(self.path, self._tmp_path)
+        else:
+            # mkstemp creates 0600 files; give a new report the usual umask-based mode
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(self._tmp_path, 0o666 & ~umask)
+        os.replace(self._tmp_path, self.path)
+        self._tmp_path = None
+
+    def abort(self):
+        """Drops a partially written report, leaving any previous one untouched."""
+        if self.to_stdout:
+            return
+        if not self._out.closed:
+            self._out.close()
+        if self._tmp_path is not None and os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+        self._tmp_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import itertools
+import os
+import shutil
+import tempfile
+
+def rewrite_lines(path, transform):
+    """
+    Streams a text file through `transform(index, line) -> line` and atomically swaps
+    in the result: output goes to a temp file in the same directory, which replaces
+    the original with `os.replace`, so a crash never leaves a truncated file.
+    Nothing is written until the first line actually changes; an unchanged file is
+    never rewritten. If `transform` raises, the original file is left as it was.
+    Returns the number of changed lines.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    changed = 0
+    dst = None
+    tmp_path = None
+    try:
+        with open(path, "r") as src:
+            for idx, line in enumerate(src):
+                new_line = transform(idx, line)
+                if new_line == line and dst is None:
+                    continue
+                if dst is None:
+                    # First change: copy the unchanged prefix, then stream the rest
+                    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+                    dst = os.fdopen(fd, "w")
+                    with open(path, "r") as prefix:
+                        dst.writelines(itertools.islice(prefix, idx))
+                if new_line != line:
+                    changed += 1
+                dst.write(new_line)
+
+        if dst is None:
+            return 0
+        dst.flush()
+        os.fsync(dst.fileno())
+        dst.close()
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+        tmp_path = None
+        return changed
+    finally:
+        if dst is not None and not dst.closed:
+            dst.close()
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
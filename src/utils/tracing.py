@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+class Span:
+    """
+    A timed region. Extra details (status, retries, counts) can be attached with `set()`.
+    """
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = time.perf_counter()
+
+    def set(self, **kwargs):
+        self.args.update(kwargs)
+
+
+class _NullSpan:
+    def set(self, **kwargs):
+        pass
+
+
+class Tracer:
+    """
+    Lightweight span recorder for external calls and command phases.
+    Spans nest per thread and are exported in Chrome trace-event format
+    (open in chrome://tracing or https://ui.perfetto.dev).
+    Disabled by default: a disabled tracer costs one attribute check per span.
+    """
+    MAX_ARG_LENGTH = 120
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self):
+        self.enabled = True
+        self._origin = time.perf_counter()
+        self.events = []
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @classmethod
+    def summarize(cls, value):
+        """Shortens an argument for display (lists of argv, long strings)."""
+        if isinstance(value, (list, tuple)):
+            value = " ".join(str(v) for v in value)
+        if isinstance(value, str) and len(value) > cls.MAX_ARG_LENGTH:
+            return value[:cls.MAX_ARG_LENGTH - 3] + "..."
+        return value
+
+    @contextmanager
+    def span(self, name, category="app", **args):
+        if not self.enabled:
+            yield _NullSpan()
+            return
+
+        span = Span(name, category, {k: self.summarize(v) for k, v in args.items()})
+        stack = self._stack()
+        if stack:
+            span.args.setdefault("parent", stack[-1].name)
+        stack.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.set(error=self.summarize(str(e)))
+            raise
+        finally:
+            stack.pop()
+            end = time.perf_counter()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((span.start - self._origin) * 1e6, 1),
+                "dur": round((end - span.start) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": span.args,
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def traced(self, name=None, category="app"):
+        """Decorator form of `span()`."""
+        def decorator(fn):
+            label = name or fn.__qualname__
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(label, category):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def export_chrome(self, path):
+        """Writes recorded spans as a Chrome trace-event JSON file."""
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e["ts"])
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+    def totals(self):
+        """Total milliseconds per span name, slowest first."""
+        totals = {}
+        with self._lock:
+            for e in self.events:
+                totals[e["name"]] = totals.get(e["name"], 0.0) + e["dur"] / 1000.0
+        return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)
+
+
+# Process-wide tracer used by connectors, core managers and the CLI
+tracer = Tracer()
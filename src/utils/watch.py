@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+import abc
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import logging
+import os
+import select
+import struct
+import time
+
+class FileWatcher(abc.ABC):
+    """
+    Watches task files for changes. `poll(timeout)` returns the set of changed paths
+    (empty on timeout); `wait()` adds debouncing on top of it.
+    Targets are either one file, or every file matching `pattern` under a directory tree.
+    """
+    def __init__(self, path=None, directory=None, pattern="*.md"):
+        if (path is None) == (directory is None):
+            raise ValueError("Watch exactly one of `path` or `directory`.")
+        self.path = os.path.abspath(path) if path else None
+        self.directory = os.path.abspath(directory) if directory else None
+        self.pattern = pattern
+
+    def matches(self, path):
+        if self.path:
+            return path == self.path
+        return fnmatch.fnmatch(os.path.basename(path), self.pattern)
+
+    @abc.abstractmethod
+    def poll(self, timeout):
+        """Blocks up to `timeout` seconds for changes to the targets; returns the changed paths."""
+
+    def wait(self, timeout, debounce=0.5, max_delay=5.0):
+        """
+        Blocks up to `timeout` seconds for a change, then keeps collecting until the files
+        have been quiet for `debounce` seconds (at most `max_delay`), so a burst of saves
+        becomes one batch. Returns the changed paths (empty on timeout).
+        """
+        changed = self.poll(timeout)
+        if not changed:
+            return changed
+        deadline = time.monotonic() + max_delay
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return changed
+            more = self.poll(min(debounce, remaining))
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(FileWatcher):
+    """
+    Linux inotify through ctypes (no third-party dependency). Directories are watched
+    rather than files, so atomic replaces (rename over the file) are seen too.
+    """
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (then `len` bytes of name)
+
+    def __init__(self, path=None, directory=None, pattern="*.md"):
+        super().__init__(path, directory, pattern)
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}  # watch descriptor -> directory
+        if self.path:
+            self._watch(os.path.dirname(self.path), recursive=False)
+        else:
+            self._watch(self.directory, recursive=True)
+
+    def _watch(self, directory, recursive):
+        wd = self._add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch failed for {directory}: {os.strerror(err)}")
+        self._dirs[wd] = directory
+        if recursive:
+            for entry in os.scandir(directory):
+                if entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."):
+                    self._watch(entry.path, recursive=True)
+
+    def poll(self, timeout):
+        # Events for unrelated files (editor swap files, our own temp files) do not end the wait
+        deadline = time.monotonic() + max(timeout, 0)
+        while True:
+            ready, _, _ = select.select([self.fd], [], [], max(deadline - time.monotonic(), 0))
+            if not ready:
+                return set()
+            changed = self._read_events()
+            if changed or time.monotonic() >= deadline:
+                return changed
+
+    def _read_events(self):
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + self.EVENT.size <= len(data):
+            wd, mask, _cookie, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & self.IN_ISDIR:
+                # New subdirectories of a watched tree are picked up as they appear
+                if self.directory and mask & (self.IN_CREATE | self.IN_MOVED_TO) and not name.startswith("."):
+                    try:
+                        self._watch(path, recursive=True)
+                    except OSError as e:
+                        if e.errno != errno.ENOENT:
+                            raise
+                continue
+            if self.matches(path):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher(FileWatcher):
+    """Portable fallback: compares (mtime, size) of the targets every `interval` seconds."""
+    def __init__(self, path=None, directory=None, pattern="*.md", interval=1.0):
+        super().__init__(path, directory, pattern)
+        self.interval = interval
+        self._state = self._snapshot()
+
+    def _targets(self):
+        if self.path:
+            return [self.path]
+        targets = []
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            targets.extend(os.path.join(root, f) for f in files if self.matches(f))
+        return targets
+
+    def _snapshot(self):
+        state = {}
+        for path in self._targets():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def poll(self, timeout):
+        deadline = time.monotonic() + max(timeout, 0)
+        while True:
+            current = self._snapshot()
+            changed = {p for p in current.keys() | self._state.keys() if current.get(p) != self._state.get(p)}
+            self._state = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+
+def create_watcher(path=None, directory=None, pattern="*.md", poll_interval=1.0, logger=None):
+    """Returns an inotify watcher where available, else a polling one."""
+    logger = logger or logging.getLogger(__name__)
+    try:
+        return InotifyWatcher(path, directory, pattern)
+    except (OSError, AttributeError) as e:
+        logger.info(f"inotify unavailable ({e}). Falling back to polling every {poll_interval}s.")
+        return PollingWatcher(path, directory, pattern, interval=poll_interval)
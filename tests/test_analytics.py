@@ -0,0 +1,44 @@
+import datetime
+import subprocess
+import sys
+
+import pytest
+
+from src.connectors.issue import Issue
+from src.core import analytics
+
+TODAY = datetime.date(2026, 3, 1)
+
+
+def make_issues(n):
+    day = TODAY.toordinal()
+    return [
+        Issue(number, title=f"Task {number}", state="closed" if number % 3 == 0 else "open",
+              labels=[f"type:{('Design', 'Build', 'Test')[number % 3]}"],
+              assignees=[f"dev{number % 7}"] * (number % 2),
+              due=day + number % 20 - 10 if number % 4 else None,
+              updated_at=(TODAY - datetime.timedelta(days=number % 30)).isoformat())
+        for number in range(1, n + 1)
+    ]
+
+
+def test_cli_import_does_not_load_numpy():
+    code = "import sys, src.main; print('numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_numpy_and_python_agree():
+    if analytics._numpy() is None:
+        pytest.skip("numpy not installed")
+    columns = analytics.IssueColumns.from_issues(make_issues(500))
+    today = TODAY.toordinal()
+    fast = analytics._compute_numpy(columns, today, 1, 3, 14)
+    slow = analytics._compute_python(columns, today, 1, 3, 14)
+    assert vars(fast) == vars(slow)
+
+
+def test_small_sets_skip_numpy(monkeypatch):
+    monkeypatch.setattr(analytics, "_compute_numpy", None)  # would fail if called
+    metrics = analytics.analyze(make_issues(50), TODAY)
+    assert metrics.total == 50 and metrics.overdue > 0
@@ -0,0 +1,116 @@
+import datetime
+import logging
+
+import pytest
+
+from src.connectors.cache import IssueCache
+from src.connectors.fake import FakeTransport
+from src.connectors.github import GitHubConnector
+from src.connectors.scheduler import RequestScheduler
+from src.connectors.transport import ApiResponse
+
+REPO = "demo/cache"
+START = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+def stamp(minutes):
+    return (START + datetime.timedelta(minutes=minutes)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def make_fixture(count):
+    issues = [{
+        "id": f"I_{n}", "number": n, "title": f"Task {n}", "body": "", "state": "open",
+        "assignees": [], "labels": [], "milestone": None,
+        "createdAt": stamp(n), "updatedAt": stamp(n),
+    } for n in range(1, count + 1)]
+    return {"repos": {REPO: {"issues": issues}}}
+
+
+class FailingPages:
+    """Fails every IssuePage request for the page after cursor `after` while `failing` is set."""
+    def __init__(self, inner, after):
+        self.inner = inner
+        self.after = after
+        self.failing = True
+
+    def request(self, method, path, body=None):
+        variables = (body or {}).get("variables") or {}
+        if self.failing and "IssuePage" in (body or {}).get("query", "") and variables.get("after") == self.after:
+            return ApiResponse(502, {}, {"message": "Injected server error"})
+        return self.inner.request(method, path, body)
+
+
+@pytest.fixture
+def backend(tmp_path):
+    def make(count, fail_after=None):
+        fake = FakeTransport(fixture=make_fixture(count))
+        transport = FailingPages(fake, fail_after) if fail_after else fake
+        logger = logging.getLogger("test")
+        cache = IssueCache(str(tmp_path / "cache.db"), logger=logger)
+        connector = GitHubConnector(logger=logger, cache=cache, transport=transport,
+                                    scheduler=RequestScheduler(rate=None, base_delay=0, max_retries=1, logger=logger))
+        return fake, transport, cache, connector
+    return make
+
+
+def touch(fake, numbers, minutes):
+    for number in numbers:
+        fake._repo(REPO)["by_number"][number]["updatedAt"] = stamp(minutes)
+    fake._version += 1  # Drop the fake's cached page views
+
+
+def cached(cache, state="all"):
+    return {i["number"]: i for i in cache.iter_query(REPO, state=state)}
+
+
+def test_incremental_refresh_fetches_only_updates(backend):
+    fake, _, cache, connector = backend(250)
+    assert connector.refresh_cache(REPO) == 250
+    assert cache.high_water_mark(REPO) == stamp(250)
+
+    fake._repo(REPO)["by_number"][3]["state"] = "closed"
+    touch(fake, [3], 1000)
+    # `since` is inclusive: the issue at the mark comes back too
+    assert connector.refresh_cache(REPO) == 2
+    assert cache.high_water_mark(REPO) == stamp(1000)
+    assert cached(cache)[3]["state"] == "closed"
+    assert len(cached(cache)) == 250
+
+
+def test_empty_repo_records_a_mark(backend):
+    _, _, cache, connector = backend(0)
+    assert connector.refresh_cache(REPO) == 0
+    assert cache.has_repo(REPO)
+
+
+def test_interrupted_first_refresh_keeps_no_mark(backend):
+    # 7 pages of 100, newest created first; the last one fails after 500 were stored
+    _, transport, cache, connector = backend(700, fail_after="600")
+    with pytest.raises(RuntimeError):
+        connector.refresh_cache(REPO)
+    assert len(cached(cache)) == 500
+    assert cache.high_water_mark(REPO) is None
+
+    transport.failing = False
+    connector.refresh_cache(REPO)
+    assert len(cached(cache)) == 700
+    assert cache.high_water_mark(REPO) == stamp(700)
+
+
+def test_interrupted_incremental_refresh_keeps_the_old_mark(backend):
+    fake, transport, cache, connector = backend(300, fail_after="100")
+    transport.failing = False
+    connector.refresh_cache(REPO)
+
+    # 150 updates; the 50 oldest-created ones are on the second page, which fails
+    updated = range(1, 151)
+    for number in updated:
+        fake._repo(REPO)["by_number"][number]["title"] = f"Task {number} (renamed)"
+    touch(fake, updated, 1000)
+    transport.failing = True
+    with pytest.raises(RuntimeError):
+        connector.refresh_cache(REPO, batch_size=100)
+    assert cache.high_water_mark(REPO) == stamp(300)
+
+    transport.failing = False
+    assert connector.refresh_cache(REPO) == 151  # Plus the issue at the old mark
+    assert all(cached(cache)[n]["title"].endswith("(renamed)") for n in updated)
+    assert cache.high_water_mark(REPO) == stamp(1000)
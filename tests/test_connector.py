@@ -0,0 +1,61 @@
+import logging
+
+import pytest
+
+from src.connectors.github import GitHubConnector
+from src.connectors.scheduler import RequestScheduler
+from src.connectors.transport import ApiResponse
+
+REPO = "demo/connector"
+
+
+class ScriptedTransport:
+    """Answers every request with the next scripted (status, headers, data), repeating the last one."""
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, path, body=None):
+        self.requests.append((method, path, body))
+        status, headers, data = self.responses[min(len(self.requests), len(self.responses)) - 1]
+        return ApiResponse(status, headers, data, error="Connection reset" if status == 0 else None)
+
+
+def make_connector(transport):
+    logger = logging.getLogger("test")
+    scheduler = RequestScheduler(rate=None, base_delay=0, secondary_delay=0, logger=logger)
+    return GitHubConnector(logger=logger, transport=transport, scheduler=scheduler)
+
+
+@pytest.mark.parametrize("status", [0, 502])
+def test_failed_mutation_is_sent_once(status):
+    transport = ScriptedTransport((status, {}, None))
+    result = make_connector(transport).graphql("mutation CreateIssues { x }")
+    assert "errors" in result
+    assert len(transport.requests) == 1
+
+
+@pytest.mark.parametrize("status", [0, 502])
+def test_failed_rest_create_is_sent_once(status):
+    transport = ScriptedTransport((status, {}, None))
+    with pytest.raises(RuntimeError):
+        make_connector(transport).create_issue(REPO, "Task", "Body")
+    assert len(transport.requests) == 1
+
+
+def test_failed_reads_are_retried():
+    transport = ScriptedTransport((0, {}, None), (502, {}, None), (200, {}, {"data": {"viewer": {}}}))
+    assert make_connector(transport).graphql("query Viewer { viewer { login } }") == {"data": {"viewer": {}}}
+    assert len(transport.requests) == 3
+
+    transport = ScriptedTransport((503, {}, None), (200, {}, []))
+    assert make_connector(transport).api("GET", f"repos/{REPO}/issues").ok
+    assert len(transport.requests) == 2
+
+
+def test_throttled_mutation_is_retried():
+    # A rate-limited request was rejected, not applied: resending it is safe
+    throttled = (429, {"retry-after": "0"}, {"message": "rate limit"})
+    transport = ScriptedTransport(throttled, (200, {}, {"data": {"createIssue": {}}}))
+    assert make_connector(transport).graphql("mutation CreateIssues { x }") == {"data": {"createIssue": {}}}
+    assert len(transport.requests) == 2
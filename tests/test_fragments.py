@@ -0,0 +1,132 @@
+import datetime
+import logging
+import types
+
+import pytest
+
+from src.connectors.issue import Issue
+from src.core.risk import RiskEngine
+from src.reports import report
+from src.reports.fragments import SectionCache
+from src.reports.report import ReportGenerator
+from src.reports.writer import ReportWriter
+
+REPO = "demo/report"
+SECTIONS = list(ReportGenerator.SECTIONS)
+DAY = datetime.date(2026, 3, 10)
+
+
+@pytest.fixture
+def today(monkeypatch):
+    """Sets the report's idea of today; returns a setter."""
+    class FakeDate(datetime.date):
+        current = DAY
+
+        @classmethod
+        def today(cls):
+            return cls.current
+
+    monkeypatch.setattr(report, "datetime", types.SimpleNamespace(date=FakeDate))
+
+    def set_today(day):
+        FakeDate.current = day
+    return set_today
+
+
+def make_issues():
+    return [Issue(n, title=f"Task {n}", state="closed" if n == 1 else "open", labels=["type:dev"],
+                  assignees=["dev-01"], due=DAY.toordinal() + n, updated_at="2026-03-01T00:00:00Z")
+            for n in (1, 2, 3)]
+
+
+def generator(config=None, ci_runs=None):
+    engine = RiskEngine(config=config or {}, logger=logging.getLogger("test"))
+    return ReportGenerator(connector=None, resource_mgr=None, repo_name=REPO, risk_engine=engine, ci_runs=ci_runs)
+
+
+def fingerprints(gen, issues):
+    return {name: gen.section_fingerprint(name, issues) for name in SECTIONS}
+
+
+def changed(before, after):
+    return sorted(name for name in SECTIONS if before[name] != after[name])
+
+
+def test_date_invalidates_date_dependent_sections(today):
+    issues = make_issues()
+    gen = generator()
+    before = fingerprints(gen, issues)
+    assert fingerprints(gen, issues) == before
+    today(DAY + datetime.timedelta(days=1))
+    assert changed(before, fingerprints(gen, issues)) == ["gantt", "risks"]
+
+
+def test_ci_status_and_risk_settings_invalidate_risks(today):
+    issues = make_issues()
+    before = fingerprints(generator(), issues)
+    passing = [{"conclusion": "success"}]
+    failing = [{"conclusion": "failure"}, {"conclusion": "success"}]
+    assert changed(before, fingerprints(generator(ci_runs=passing), issues)) == ["risks"]
+    assert fingerprints(generator(ci_runs=failing), issues)["risks"] != fingerprints(generator(ci_runs=passing), issues)["risks"]
+    assert changed(before, fingerprints(generator({"thresholds": {"stale_days": 7}}), issues)) == ["risks"]
+    assert changed(before, fingerprints(generator({"risk_rules": {"stale": {"enabled": False}}}), issues)) == ["risks"]
+
+
+def test_issue_changes_invalidate_the_sections_that_read_them(today):
+    issues = make_issues()
+    gen = generator()
+    before = fingerprints(gen, issues)
+    # A milestone due date moves without touching the issue
+    issues[1].due += 7
+    assert changed(before, fingerprints(gen, issues)) == ["risks"]
+    issues = make_issues()
+    issues[2].state = "closed"
+    assert changed(before, fingerprints(gen, issues)) == sorted(SECTIONS)
+    issues = make_issues()
+    issues[2].updated_at = "2026-03-02T00:00:00Z"
+    assert changed(before, fingerprints(gen, issues)) == ["gantt", "matrix", "risks"]
+
+
+def render(gen, issues, path):
+    cache = SectionCache.load(str(path), REPO)
+    with ReportWriter(str(path)) as writer:
+        reused = gen.render(writer, issues, SECTIONS, cache)
+    cache.save()
+    return reused
+
+
+def test_render_reuses_fragments_until_an_input_changes(tmp_path, today):
+    issues = make_issues()
+    path = tmp_path / "REPORT.md"
+    assert render(generator(), issues, path) == []
+    first = path.read_text()
+    assert render(generator(), issues, path) == SECTIONS
+    assert path.read_text() == first
+
+    failing = [{"conclusion": "failure", "head_branch": "main"}]
+    assert render(generator(ci_runs=failing), issues, path) == ["stats", "matrix", "gantt"]
+    assert "Latest CI run failed on main" in path.read_text()
+
+
+def test_cache_file_is_scoped_to_repo_and_survives_corruption(tmp_path):
+    path = tmp_path / "REPORT.md"
+    cache = SectionCache.load(str(path), REPO)
+    assert cache.path == str(tmp_path / ".REPORT.md.sections.json")
+    cache.put("stats", "f1", "## Stats\n")
+    cache.save()
+    assert SectionCache.load(str(path), REPO).get("stats", "f1") == "## Stats\n"
+    assert SectionCache.load(str(path), REPO).get("stats", "f2") is None
+    assert SectionCache.load(str(path), "other/repo").sections == {}
+
+    with open(cache.path, "w") as f:
+        f.write("{not json")
+    assert SectionCache.load(str(path), REPO).sections == {}
+
+
+def test_prune_drops_unwanted_fragments(tmp_path):
+    cache = SectionCache(str(tmp_path / "cache.json"), REPO)
+    for key in ("a/x::stats", "b/y::stats"):
+        cache.put(key, "f", "")
+    cache.save()
+    cache.prune(lambda key: key.startswith("a/x::"))
+    assert list(cache.sections) == ["a/x::stats"] and cache.dirty
@@ -0,0 +1,30 @@
+import json
+
+import src.main
+
+REPO = "demo/import"
+
+
+def test_import_creates_each_task_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Default team and config: no data files here
+    fixture = tmp_path / "repo.json"
+    fixture.write_text(json.dumps({"repos": {REPO: {"issues": [{
+        "id": "I_1", "number": 1, "title": "Existing task", "body": "", "state": "open",
+        "assignees": [], "labels": [], "milestone": None,
+        "createdAt": "2026-01-01T00:00:00Z", "updatedAt": "2026-01-01T00:00:00Z",
+    }]}}}))
+    tasks = tmp_path / "tasks.md"
+    tasks.write_text(
+        "- [ ] Build login (type:dev)\n"
+        "- [ ] Write docs\n"
+        "- [ ] Build login (type:dev)\n"
+        "- [ ] Build login! @dev-02\n"
+        "- [ ] Existing task\n"
+        "- [ ] Write docs\n"
+    )
+
+    connector = src.main.main(["import", "--file", str(tasks), "--repo", REPO,
+                               "--transport", "fake", "--fixture", str(fixture)])
+
+    titles = sorted(i["title"] for i in connector.transport._repo(REPO)["by_number"].values())
+    assert titles == ["Build login (type:dev)", "Existing task", "Write docs"]
@@ -0,0 +1,49 @@
+import itertools
+import random
+
+from src.core import matching
+from src.core.resource import SkillIndex
+
+SKILLS = ["python", "react", "api", "db", "ops", "ui"]
+
+
+def brute_force(index, tasks, room):
+    """Best (assigned, score) over every way of giving each task to a member or nobody."""
+    scores = [index.scores(set(tags)) for tags in tasks]
+    best = (0, 0)
+    for choice in itertools.product(range(-1, len(index.members)), repeat=len(tasks)):
+        used = [0] * len(index.members)
+        for p in choice:
+            if p >= 0:
+                used[p] += 1
+        if all(u <= r for u, r in zip(used, room)):
+            picked = [(p, s) for p, s in zip(choice, scores) if p >= 0]
+            best = max(best, (len(picked), sum(s.get(p, 0) for p, s in picked)))
+    return best
+
+
+def test_optimal_assignment_matches_brute_force():
+    rnd = random.Random(7)
+    for _ in range(150):
+        members = [{"id": f"dev-{n}", "skills": rnd.sample(SKILLS, rnd.randint(0, 3)), "status": "active"}
+                   for n in range(rnd.randint(1, 3))]
+        index = SkillIndex(members)
+        tasks = [[f"domain:{s}" for s in rnd.sample(SKILLS, rnd.randint(0, 2))] for _ in range(rnd.randint(1, 5))]
+        room = [rnd.randint(0, 3) for _ in members]
+        picks, _ = matching.optimal_assignment(index, tasks, [0] * len(members), room)
+
+        used = [0] * len(members)
+        for pick, tags in zip(picks, tasks):
+            if pick:
+                used[pick[0]] += 1
+                assert pick[1] == index.scores(set(tags)).get(pick[0], 0)
+        assert all(u <= r for u, r in zip(used, room))
+        assigned = [pick for pick in picks if pick]
+        assert (len(assigned), sum(score for _, score in assigned)) == brute_force(index, tasks, room)
+
+
+def test_sparse_profits_use_overflow_for_unmatched_units():
+    # Source 1 earns nothing anywhere but must still ship through the overflow node
+    flow = matching.max_profit_transport([2, 2], [2, 3], [{0: 5}, {}])
+    assert flow[0] == {0: 2}
+    assert sum(flow[1].values()) == 2 and flow[1].get(0, 0) == 0
@@ -0,0 +1,111 @@
+import logging
+
+import pytest
+
+from src.connectors.cache import IssueCache
+from src.connectors.fake import FakeTransport
+from src.connectors.github import GitHubConnector
+from src.connectors.scheduler import RequestScheduler
+from src.core.risk import RiskEngine
+from src.reports.fragments import SectionCache
+from src.reports.portfolio import PortfolioReport, read_repos_file
+
+REPOS = ["demo/alpha", "demo/beta"]
+
+
+def make_issues(count, closed):
+    return [{
+        "id": f"I_{n}", "number": n, "title": f"Task {n}", "body": "", "state": "closed" if n in closed else "open",
+        "assignees": [{"login": "dev-01"}], "labels": [{"name": "type:dev"}], "milestone": None,
+        "createdAt": "2026-01-01T00:00:00Z", "updatedAt": "2026-01-01T00:00:00Z",
+    } for n in range(1, count + 1)]
+
+
+@pytest.fixture
+def backend(tmp_path):
+    # Both repos number their issues from #1, so only the key prefix keeps their fragments apart
+    transport = FakeTransport(fixture={"repos": {
+        "demo/alpha": {"issues": make_issues(3, closed={1})},
+        "demo/beta": {"issues": make_issues(4, closed={1, 2, 3})},
+    }})
+    logger = logging.getLogger("test")
+
+    def connect():
+        """A connector as one CLI run builds it (fresh query snapshot, shared issue cache)."""
+        return GitHubConnector(logger=logger, cache=IssueCache(str(tmp_path / "cache.db"), logger=logger),
+                               transport=transport, scheduler=RequestScheduler(rate=None, logger=logger))
+    return transport, connect
+
+
+@pytest.fixture
+def puts(monkeypatch):
+    """Keys of the fragments rendered (not reused) during a run."""
+    keys = []
+    put = SectionCache.put
+    monkeypatch.setattr(SectionCache, "put", lambda self, key, *args: keys.append(key) or put(self, key, *args))
+    return keys
+
+
+def portfolio(connector, repos=REPOS):
+    engine = RiskEngine(config={"risk_rules": {"ci-failing": {"enabled": False}}}, logger=logging.getLogger("test"))
+    return PortfolioReport(connector, None, repos, risk_engine=engine)
+
+
+def test_sections_are_cached_per_repo(backend, tmp_path, puts):
+    transport, connect = backend
+    path = tmp_path / "PORTFOLIO.md"
+    portfolio(connect()).generate(str(path))
+    assert sorted(puts) == sorted(f"{repo}:{name}" for repo in REPOS for name in ("stats", "risks", "matrix", "gantt"))
+    cache = SectionCache.load(str(path), "portfolio")
+    assert cache.sections["demo/alpha:stats"]["fragment"] != cache.sections["demo/beta:stats"]["fragment"]
+    text = path.read_text()
+    assert "| demo/alpha | 33% | 3 |" in text and "| demo/beta | 75% | 4 |" in text
+
+    # Nothing changed: every fragment is reused and the report is left alone
+    mtime = path.stat().st_mtime_ns
+    puts.clear()
+    portfolio(connect()).generate(str(path))
+    assert puts == [] and path.stat().st_mtime_ns == mtime
+
+    # Closing #2 and #4 in beta only re-renders beta's sections, even though alpha has a #2 too
+    issue = transport._repo("demo/beta")["by_number"][2]
+    issue.update(state="closed", updatedAt="2026-01-02T00:00:00Z")
+    issue = transport._repo("demo/beta")["by_number"][4]
+    issue.update(state="closed", updatedAt="2026-01-02T00:00:00Z")
+    transport._version += 1
+    puts.clear()
+    portfolio(connect()).generate(str(path))
+    assert sorted(puts) == sorted(f"demo/beta:{name}" for name in ("stats", "risks", "matrix", "gantt"))
+    assert "| demo/beta | 100% | 4 |" in path.read_text()
+
+
+def test_dropped_repos_are_pruned_from_the_cache(backend, tmp_path):
+    _transport, connect = backend
+    path = tmp_path / "PORTFOLIO.md"
+    portfolio(connect()).generate(str(path))
+    portfolio(connect(), repos=["demo/beta"]).generate(str(path))
+    keys = SectionCache.load(str(path), "portfolio").sections
+    assert keys and all(key.startswith("demo/beta:") for key in keys)
+
+
+def test_failed_repo_does_not_stop_the_portfolio(backend, tmp_path, monkeypatch):
+    _transport, connect = backend
+    connector = connect()
+    fetch = connector.fetch_issues
+
+    def failing(repo, *args, **kwargs):
+        if repo == "demo/alpha":
+            raise RuntimeError("boom")
+        return fetch(repo, *args, **kwargs)
+    monkeypatch.setattr(connector, "fetch_issues", failing)
+    path = tmp_path / "PORTFOLIO.md"
+    portfolio(connector).generate(str(path))
+    text = path.read_text()
+    assert "| demo/alpha | ❌ failed |" in text and "Could not load issues: boom" in text
+    assert "# 📊 Project Report: demo/beta" in text
+
+
+def test_read_repos_file(tmp_path):
+    path = tmp_path / "repos.txt"
+    path.write_text("# portfolio\ndemo/alpha\n\ndemo/beta  # second\ndemo/alpha\n")
+    assert read_repos_file(str(path)) == REPOS
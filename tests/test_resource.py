@@ -0,0 +1,118 @@
+import json
+import logging
+from collections import Counter
+
+import pytest
+
+from src.core.resource import ResourceManager, SkillIndex, WorkloadScheduler
+
+TEAM = {"members": [
+    {"id": "pm", "skills": ["manage"], "status": "active"},
+    {"id": "back-1", "skills": ["python", "api"], "status": "active"},
+    {"id": "back-2", "skills": ["python"], "status": "active"},
+    {"id": "front", "skills": ["react"], "status": "active"},
+    {"id": "away", "skills": ["python", "api"], "status": "inactive"},
+]}
+
+
+def manager(tmp_path, team=TEAM, thresholds=None):
+    team_path = tmp_path / "team.json"
+    team_path.write_text(json.dumps(team))
+    settings_path = tmp_path / "config.json"
+    if thresholds is not None:
+        settings_path.write_text(json.dumps({"thresholds": thresholds}))
+    return ResourceManager(config_path=str(team_path), settings_path=str(settings_path),
+                           logger=logging.getLogger("test"))
+
+
+def ids(picks):
+    return [pick[0]["id"] if pick else None for pick in picks]
+
+
+def test_scheduler_orders_by_score_then_load_then_position():
+    index = SkillIndex(TEAM["members"])
+    scheduler = WorkloadScheduler(index, [0, 0, 0, 0], [None] * 4)
+    # back-1 matches both tags; after one task each, back-1 and back-2 tie on load for "python"
+    picks = [scheduler.assign(tags) for tags in (["python", "api"], ["python"], ["python"], ["python"])]
+    assert ids(picks) == ["back-1", "back-2", "back-1", "back-2"]
+    assert [pick[1] for pick in picks] == [2, 1, 1, 1]
+    # Nobody matches: the least-loaded member, earliest position first
+    assert ids([scheduler.assign(["docs"]), scheduler.assign(["docs"])]) == ["pm", "front"]
+    assert scheduler.loads == [1, 2, 2, 1]
+
+
+def test_scheduler_is_deterministic():
+    index = SkillIndex(TEAM["members"])
+    tasks = [["python"], ["react", "api"], [], ["domain:api"], ["python", "react"]] * 5
+
+    def run():
+        scheduler = WorkloadScheduler(index, [2, 0, 1, 0], [4, None, 3, 5])
+        return [scheduler.assign(tags) or scheduler.overflow(tags) for tags in tasks]
+
+    assert run() == run()
+
+
+def test_scheduler_skips_members_at_capacity():
+    index = SkillIndex(TEAM["members"])
+    scheduler = WorkloadScheduler(index, [0, 1, 0, 0], [1, 1, 1, 1])
+    # back-1 is full, so back-2 takes the python task; then every python member is full
+    assert ids([scheduler.assign(["python"]), scheduler.assign(["python"])]) == ["back-2", "pm"]
+    assert scheduler.assign(["python"])[0]["id"] == "front"
+    assert scheduler.assign(["python"]) is None
+
+
+def test_overflow_picks_least_loaded_skill_match():
+    index = SkillIndex(TEAM["members"])
+    scheduler = WorkloadScheduler(index, [1, 3, 2, 1], [1, 1, 1, 1])
+    assert scheduler.assign(["python"]) is None
+    picks = [scheduler.overflow(["python"]) for _ in range(3)]
+    assert ids(picks) == ["back-2", "back-1", "back-2"]
+    # No match at all: least-loaded member
+    assert scheduler.overflow(["docs"])[0]["id"] in ("pm", "front")
+    assert scheduler.loads[1:3] == [4, 4]
+
+
+def test_batch_past_capacity_assigns_every_task(tmp_path, caplog):
+    mgr = manager(tmp_path, thresholds={"max_active_tasks_per_person": 3})
+    with caplog.at_level(logging.WARNING, logger="test"):
+        results = mgr.assign_batch([["python"]] * 30)
+    assert all(results)
+    loads = Counter(r[0] for r in results)
+    # Room first (3 each across the team), then spread over the python members
+    assert loads["pm"] == loads["front"] == 3
+    assert loads["back-1"] + loads["back-2"] == 24 and abs(loads["back-1"] - loads["back-2"]) <= 1
+    assert "18 tasks assigned past the per-person task limit" in caplog.text
+
+
+@pytest.mark.parametrize("solver", ResourceManager.SOLVERS)
+def test_both_solvers_respect_capacity_before_overflowing(tmp_path, solver):
+    mgr = manager(tmp_path, thresholds={"max_active_tasks_per_person": 2})
+    mgr.workload = {"back-1": 2}
+    results = mgr.assign_batch([["python"]] * 4, solver=solver)
+    assert "back-1" not in [r[0] for r in results]
+    assert Counter(r[0] for r in results) == {"back-2": 2, "pm": 1, "front": 1}
+    assert mgr.workload == {"back-1": 2, "back-2": 2, "pm": 1, "front": 1}
+
+
+def test_member_limit_overrides_team_limit(tmp_path):
+    team = {"members": [dict(TEAM["members"][1], max_active_tasks=1), TEAM["members"][2]]}
+    mgr = manager(tmp_path, team=team, thresholds={"max_active_tasks_per_person": 5})
+    results = mgr.assign_batch([["python", "api"]] * 3)
+    assert [r[0] for r in results] == ["back-1", "back-2", "back-2"]
+
+
+def test_null_limit_disables_capacity(tmp_path, caplog):
+    mgr = manager(tmp_path, thresholds={"max_active_tasks_per_person": None})
+    with caplog.at_level(logging.WARNING, logger="test"):
+        results = mgr.assign_batch([["python", "api"]] * 10)
+    assert [r[0] for r in results] == ["back-1"] * 10
+    assert "past the per-person task limit" not in caplog.text
+
+
+def test_find_best_assignee_goes_past_capacity_with_warning(tmp_path, caplog):
+    mgr = manager(tmp_path)  # No config: default limit of 3
+    mgr.workload = {"pm": 3, "back-1": 3, "back-2": 4, "front": 3}
+    with caplog.at_level(logging.WARNING, logger="test"):
+        assert mgr.find_best_assignee(["api"]) == ["back-1"]
+    assert "past their task limit" in caplog.text
+    assert mgr.workload["back-1"] == 4
@@ -0,0 +1,87 @@
+import datetime
+import json
+import logging
+
+from src.connectors.issue import Issue
+from src.core.risk import RULES, RiskEngine
+
+TODAY = datetime.date(2026, 3, 10)
+NOW = TODAY.toordinal()
+
+
+def issue(number, due_in=None, assignees=("dev-01",), state="open", idle=0, body=None):
+    updated = (TODAY - datetime.timedelta(days=idle)).isoformat() + "T00:00:00Z"
+    return Issue(number, title=f"Task {number}", state=state, assignees=assignees,
+                 due=None if due_in is None else NOW + due_in, updated_at=updated, body=body)
+
+
+def engine(thresholds=None, rules=None):
+    config = {"thresholds": thresholds or {}}
+    if rules is not None:
+        config["risk_rules"] = rules
+    return RiskEngine(config=config, logger=logging.getLogger("test"))
+
+
+def messages(report, rule):
+    return [f["message"] for f in report.by_rule().get(rule, [])]
+
+
+def test_due_dates_with_grace_period():
+    issues = [issue(1, due_in=-5), issue(2, due_in=-1), issue(3, due_in=0), issue(4, due_in=2),
+              issue(5, due_in=3), issue(6, due_in=-9, state="closed")]
+    report = engine({"overdue_grace_period_days": 2, "due_soon_days": 2}).evaluate(issues, today=TODAY)
+    assert messages(report, "overdue") == ["#1 Task 1 (Due: 2026-03-05, 5 days late)"]
+    assert messages(report, "due-soon") == [
+        "#2 Task 2 (Due: 2026-03-09, 1 days overdue (within grace))",
+        "#3 Task 3 (Due: 2026-03-10, 0 days left)",
+        "#4 Task 4 (Due: 2026-03-12, 2 days left)",
+    ]
+    assert [f["days_left"] for f in report.by_rule()["due-soon"]] == [-1, 0, 2]
+
+
+def test_workload_ownership_and_staleness_rules():
+    issues = [issue(n, assignees=("busy",)) for n in range(1, 5)]
+    issues += [issue(5, assignees=()), issue(6, idle=20), issue(7, idle=20, state="closed")]
+    report = engine({"max_active_tasks_per_person": 3, "stale_days": 14}).evaluate(issues, today=TODAY)
+    assert messages(report, "overloaded") == ["@busy has 4 open tasks (limit: 3)"]
+    assert messages(report, "unassigned") == ["#5 Task 5"]
+    assert messages(report, "stale") == ["#6 Task 6 (no update for 20 days)"]
+
+
+def test_blocked_and_ci_rules():
+    issues = [issue(1), issue(2, body="Derived from #1"), issue(3, body="Derived from #4"), issue(4, state="closed")]
+    runs = [{"conclusion": "failure", "head_branch": "main", "name": "CI"}, {"conclusion": "success"}]
+    report = engine().evaluate(issues, ci_runs=runs, today=TODAY)
+    assert messages(report, "blocked-by-open-parent") == ["#2 Task 2 (waiting on #1)"]
+    assert messages(report, "ci-failing") == ["Latest CI run failed on main"]
+    assert engine().evaluate(issues, ci_runs=runs[1:], today=TODAY).by_rule().get("ci-failing") is None
+
+
+def test_disabled_rules_and_severity_overrides(caplog):
+    issues = [issue(1, due_in=1, assignees=(), idle=30)]
+    with caplog.at_level(logging.WARNING, logger="test"):
+        eng = engine(rules={"stale": {"enabled": False}, "due-soon": {"severity": "high"}, "bogus": {}})
+    assert "bogus" in caplog.text
+    assert "stale" not in eng.rules and eng.rules["due-soon"] == "high"
+    report = eng.evaluate(issues, today=TODAY)
+    assert list(report.by_rule()) == ["due-soon", "unassigned"]
+    assert [f["severity"] for f in report.findings] == ["high", "medium"]
+
+
+def test_by_rule_follows_report_order_and_summary_counts():
+    issues = [issue(1, due_in=-3, idle=30), issue(2, due_in=1, assignees=()), issue(3, assignees=())]
+    report = engine().evaluate(issues, today=TODAY, repo="demo/repo")
+    groups = report.by_rule()
+    assert list(groups) == [rule for rule in RULES if rule in groups]
+    assert {rule: len(items) for rule, items in groups.items()} == {"overdue": 1, "due-soon": 1, "unassigned": 2, "stale": 1}
+    summary = json.loads(report.to_json())["summary"]
+    assert summary["total"] == len(report) == 5
+    assert summary["by_rule"] == {"overdue": 1, "due-soon": 1, "unassigned": 2, "stale": 1}
+    assert summary["by_severity"] == {"high": 1, "medium": 3, "low": 1}
+
+
+def test_settings_change_with_thresholds_and_rules():
+    base = engine().settings()
+    assert engine().settings() == base
+    assert engine({"due_soon_days": 5}).settings() != base
+    assert engine(rules={"stale": {"enabled": False}}).settings() != base
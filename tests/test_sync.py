@@ -0,0 +1,172 @@
+import logging
+
+import pytest
+
+from src.connectors.cache import IssueCache
+from src.connectors.fake import FakeTransport
+from src.connectors.github import GitHubConnector
+from src.connectors.scheduler import RequestScheduler
+from src.core.journal import SyncJournal
+from src.core.sync import SyncManager
+
+REPO = "demo/sync"
+
+def make_fixture(count=3):
+    issues = [{
+        "id": f"I_{n}", "number": n, "title": f"Task {n}", "body": "", "state": "open",
+        "assignees": [], "labels": [], "milestone": None,
+        "createdAt": "2026-01-01T00:00:00Z", "updatedAt": "2026-01-01T00:00:00Z",
+    } for n in range(1, count + 1)]
+    return {"repos": {REPO: {"issues": issues}}}
+
+
+@pytest.fixture
+def backend(tmp_path):
+    transport = FakeTransport(fixture=make_fixture())
+    logger = logging.getLogger("test")
+    connector = GitHubConnector(logger=logger, cache=IssueCache(str(tmp_path / "cache.db"), logger=logger),
+                                transport=transport, scheduler=RequestScheduler(rate=None, logger=logger))
+    return transport, connector
+
+
+def remote_state(transport, number):
+    return transport._repo(REPO)["by_number"][number]["state"]
+
+
+def write_tasks(path, checked):
+    path.write_text("".join(f"- [{'x' if n in checked else ' '}] Task {n} #{n}\n" for n in (1, 2, 3)))
+
+
+def test_failed_close_is_retried_next_run(backend, tmp_path, monkeypatch):
+    transport, connector = backend
+    tasks = tmp_path / "tasks.md"
+    write_tasks(tasks, checked=())
+    SyncManager(connector, None, REPO).sync(str(tasks))
+
+    write_tasks(tasks, checked=(2,))
+    failing = lambda repo, numbers, comment=None: [
+        {"number": int(n), "ok": False, "error": "boom"} for n in numbers
+    ]
+    monkeypatch.setattr(connector, "close_issues", failing)
+    SyncManager(connector, None, REPO).sync(str(tasks))
+    assert remote_state(transport, 2) == "open"
+    assert SyncJournal.load(str(tasks), REPO).has_pending()
+
+    # File bytes are unchanged and nothing changed remotely: the push must still be retried
+    monkeypatch.undo()
+    SyncManager(connector, None, REPO).sync(str(tasks))
+    assert remote_state(transport, 2) == "closed"
+    assert not SyncJournal.load(str(tasks), REPO).has_pending()
+
+
+class PartialFailureTransport:
+    """Serves the fake backend but fails the closeIssue mutation for `fail` issue numbers, like a partial GraphQL error."""
+    def __init__(self, inner, fail):
+        self.inner = inner
+        self.fail = set(fail)
+
+    def check_auth(self):
+        return self.inner.check_auth()
+
+    def request(self, method, path, body=None):
+        if path != "graphql" or "mutation CloseIssues" not in body["query"]:
+            return self.inner.request(method, path, body)
+        variables, failed = {}, []
+        for key, spec in body["variables"].items():
+            number = int(spec.get("issueId", spec.get("subjectId")).rpartition("#")[2])
+            if number in self.fail:
+                if key.startswith("s"):
+                    failed.append(key)
+                continue
+            variables[key] = spec
+        res = self.inner.request(method, path, dict(body, variables=variables))
+        res.data.setdefault("data", {}).update({key: None for key in failed})
+        res.data["errors"] = [{"path": [key], "message": "Could not close issue"} for key in failed]
+        return res
+
+
+def test_partially_failed_bulk_close_is_retried(backend, tmp_path):
+    transport, connector = backend
+    tasks = tmp_path / "tasks.md"
+    write_tasks(tasks, checked=())
+    SyncManager(connector, None, REPO).sync(str(tasks))
+
+    # One batched mutation closes #1 and #3; GraphQL reports an error for #3 only
+    write_tasks(tasks, checked=(1, 3))
+    connector.transport = PartialFailureTransport(transport, fail={3})
+    SyncManager(connector, None, REPO).sync(str(tasks))
+    assert remote_state(transport, 1) == "closed"
+    assert remote_state(transport, 3) == "open"
+    journal = SyncJournal.load(str(tasks), REPO)
+    assert journal.entries["1"]["remote"] == "closed"
+    assert journal.entries["3"]["hash"] is None
+
+    connector.transport = transport
+    SyncManager(connector, None, REPO).sync(str(tasks))
+    assert remote_state(transport, 3) == "closed"
+    assert not SyncJournal.load(str(tasks), REPO).has_pending()
+
+
+def test_tree_sync_retries_failed_push_per_file(backend, tmp_path):
+    transport, connector = backend
+    docs = tmp_path / "docs"
+    (docs / "sub").mkdir(parents=True)
+    first, second = docs / "a.md", docs / "sub" / "b.md"
+    first.write_text("- [ ] Task 1 #1\n- [ ] Task 2 #2\n")
+    second.write_text("- [ ] Task 3 #3\n")
+    SyncManager(connector, None, REPO).sync_tree(str(docs), max_workers=2)
+
+    first.write_text("- [x] Task 1 #1\n- [ ] Task 2 #2\n")
+    second.write_text("- [x] Task 3 #3\n")
+    connector.transport = PartialFailureTransport(transport, fail={1})
+    SyncManager(connector, None, REPO).sync_tree(str(docs), max_workers=2)
+    assert (remote_state(transport, 1), remote_state(transport, 3)) == ("open", "closed")
+    assert SyncJournal.load(str(first), REPO).file_hash is None
+    assert SyncJournal.load(str(second), REPO).file_hash is not None
+
+    connector.transport = transport
+    SyncManager(connector, None, REPO).sync_tree(str(docs), max_workers=2)
+    assert remote_state(transport, 1) == "closed"
+    assert not SyncJournal.load(str(first), REPO).has_pending()
+
+
+def test_tree_sync_reports_cross_file_conflict_without_pushing(backend, tmp_path, caplog):
+    transport, connector = backend
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    first, second = docs / "a.md", docs / "b.md"
+    first.write_text("- [ ] Task 1 #1\n")
+    second.write_text("- [ ] Task 1 #1\n")
+    SyncManager(connector, None, REPO).sync_tree(str(docs))
+
+    # b.md's journal last saw the line checked and #1 closed (e.g. restored from an older copy)
+    checked = "- [x] Task 1 #1\n"
+    journal = SyncJournal.load(str(second), REPO)
+    journal.entries["1"].update(hash=SyncJournal.hash_line(checked), local=True, remote="closed")
+    journal.file_hash = SyncJournal.hash_lines([checked])
+    journal.save()
+    # a.md now closes #1 while b.md reopens it
+    first.write_text("- [x] Task 1 #1\n")
+    pushes = []
+    for name in ("close_issues", "reopen_issues"):
+        push = getattr(connector, name)
+        setattr(connector, name, lambda repo, numbers, comment=None, push=push, name=name:
+                pushes.append((name, list(numbers))) or push(repo, numbers, comment=comment))
+
+    for _ in range(2):
+        caplog.clear()
+        with caplog.at_level(logging.ERROR):
+            SyncManager(connector, None, REPO).sync_tree(str(docs))
+        conflicts = [r.getMessage() for r in caplog.records if "conflict" in r.getMessage()]
+        assert len(conflicts) == 1
+        assert "close in" in conflicts[0] and "reopen in" in conflicts[0]
+        assert pushes == []
+        assert remote_state(transport, 1) == "open"
+        assert first.read_text() == "- [x] Task 1 #1\n" and second.read_text() == "- [ ] Task 1 #1\n"
+
+    # Once the files agree, the push goes out and the conflict is gone
+    first.write_text("- [ ] Task 1 #1\n")
+    SyncManager(connector, None, REPO).sync_tree(str(docs))
+    assert pushes == [("reopen_issues", ["1"])]
+    assert not SyncJournal.load(str(first), REPO).has_pending()
+    assert not SyncJournal.load(str(second), REPO).has_pending()
@@ -0,0 +1,34 @@
+from src.connectors.issue import Issue
+from src.core.title_index import TitleIndex
+
+
+def make_index():
+    return TitleIndex.build([
+        Issue(1, "Design login page (type:design)"),
+        Issue(2, "Implement REST API for orders"),
+        Issue(3, "Write docs"),
+        Issue(4, "Write docs!"),
+    ])
+
+
+def test_exact_match_ignores_tags_and_punctuation():
+    issue, score = make_index().match("design login page (type:dev) @alice")
+    assert issue.number == 1 and score == 1.0
+
+
+def test_fuzzy_match_scores_trigram_similarity():
+    issue, score = make_index().match("Implement REST APIs for orders")
+    assert issue.number == 2 and 0.8 <= score < 1.0
+    assert make_index().match("Deploy monitoring") == (None, 0.0)
+
+
+def test_ambiguous_match_is_rejected():
+    assert make_index().match("write docs") == (None, 0.0)
+
+
+def test_reindexing_an_issue_replaces_its_title():
+    index = make_index()
+    index.add(Issue(2, "Ship mobile app"))
+    assert index.match("Implement REST API for orders") == (None, 0.0)
+    assert index.match("Ship mobile app")[0].number == 2
+    assert len(index) == 4
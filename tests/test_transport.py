@@ -0,0 +1,143 @@
+import json
+import logging
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.connectors.github import GitHubConnector
+from src.connectors.scheduler import RequestScheduler
+from src.connectors.transport import GhCliTransport, HttpTransport
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Echoes each request as JSON. `server.behavior` can close idle connections or drop requests."""
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        server = self.server
+        with server.lock:
+            server.requests.append({
+                "method": self.command, "path": self.path, "client": self.client_address,
+                "headers": dict(self.headers), "body": json.loads(body) if body else None,
+            })
+        if server.behavior == "drop":
+            # Request received, connection lost before any response
+            self.close_connection = True
+            return
+        payload = json.dumps({"ok": True, "path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        if server.behavior == "close-idle":
+            # Like an idle keep-alive timeout: close without announcing `Connection: close`
+            self.close_connection = True
+
+    do_GET = do_POST = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.behavior = None
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def transport(server):
+    host, port = server.server_address
+    transport = HttpTransport(token="test-token", base_url=f"http://{host}:{port}")
+    yield transport
+    transport.close()
+
+
+def test_requests_reuse_one_connection(server, transport):
+    for n in range(3):
+        res = transport.request("GET", f"repos/o/r/issues/{n}")
+        assert res.ok and res.data["path"] == f"/repos/o/r/issues/{n}"
+    assert transport.connections_opened == 1
+    assert len({r["client"] for r in server.requests}) == 1
+
+
+def test_auth_and_content_headers(server, transport):
+    transport.request("POST", "graphql", {"query": "query Viewer { viewer { login } }"})
+    request = server.requests[0]
+    assert request["headers"]["Authorization"] == "Bearer test-token"
+    assert request["headers"]["Accept"] == "application/vnd.github+json"
+    assert request["headers"]["Content-Type"] == "application/json"
+    assert request["body"]["query"].startswith("query Viewer")
+
+
+def test_reconnects_after_server_closes_idle_connection(server, transport):
+    server.behavior = "close-idle"
+    assert transport.request("GET", "user").ok
+    # Wait until the server's close reaches the pooled socket (idle timeouts happen long before the next call)
+    pooled = transport._pool.queue[-1]
+    deadline = time.monotonic() + 5
+    while not HttpTransport._is_dropped(pooled) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # The next write goes out on a fresh connection, not the dead one
+    assert transport.request("POST", "graphql", {"query": "mutation CloseIssues { x }"}).ok
+    assert transport.connections_opened == 2
+    assert len(server.requests) == 2
+
+
+def test_dropped_mutation_is_not_resent(server, transport):
+    server.behavior = "drop"
+    res = transport.request("POST", "graphql", {"query": "mutation CreateIssues { x }"})
+    assert not res.ok and res.status == 0
+    assert len(server.requests) == 1
+
+
+def test_dropped_read_is_retried_once(server, transport):
+    server.behavior = "drop"
+    res = transport.request("GET", "user")
+    assert not res.ok
+    assert len(server.requests) == 2
+
+
+def make_connector(transport):
+    logger = logging.getLogger("test")
+    return GitHubConnector(logger=logger, transport=transport,
+                           scheduler=RequestScheduler(rate=None, base_delay=0, logger=logger))
+
+
+def test_dropped_mutation_is_delivered_once_through_connector(server, transport):
+    server.behavior = "drop"
+    result = make_connector(transport).graphql("mutation CreateIssues { x }")
+    assert "errors" in result
+    assert len(server.requests) == 1
+
+    server.requests.clear()
+    with pytest.raises(RuntimeError):
+        make_connector(transport).create_issue("o/r", "Task", "Body")
+    assert [r["method"] for r in server.requests] == ["POST"]
+
+
+def test_failed_gh_mutation_is_run_once():
+    calls = []
+
+    def run_command(cmd, check=True, input=None):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 1, stdout="", stderr="connection reset")
+
+    connector = make_connector(GhCliTransport(run_command))
+    result = connector.graphql("mutation CloseIssues { x }")
+    assert result == {"errors": [{"message": "connection reset"}]}
+    assert len(calls) == 1
@@ -0,0 +1,65 @@
+import pytest
+
+from src.utils import watch
+from src.utils.watch import FileWatcher, PollingWatcher, create_watcher
+
+
+class ScriptedWatcher(FileWatcher):
+    """Returns queued change sets from `poll`, then nothing (a quiet period)."""
+    def __init__(self, batches):
+        super().__init__(path="tasks.md")
+        self.batches = list(batches)
+        self.timeouts = []
+
+    def poll(self, timeout):
+        self.timeouts.append(timeout)
+        return set(self.batches.pop(0)) if self.batches else set()
+
+
+def test_file_watcher_requires_poll():
+    with pytest.raises(TypeError):
+        FileWatcher(path="tasks.md")
+
+
+def test_wait_merges_a_burst_until_quiet():
+    watcher = ScriptedWatcher([{"a.md"}, {"b.md"}, {"a.md", "c.md"}])
+    assert watcher.wait(10, debounce=0.25) == {"a.md", "b.md", "c.md"}
+    assert watcher.timeouts == [10, 0.25, 0.25, 0.25]
+    assert watcher.wait(0.1) == set()
+
+
+def test_wait_stops_collecting_after_max_delay():
+    watcher = ScriptedWatcher([{"a.md"}, {"b.md"}])
+    assert watcher.wait(10, debounce=0.25, max_delay=0) == {"a.md"}
+    assert watcher.batches == [{"b.md"}]
+
+
+def test_polling_watcher_reports_tree_changes(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / ".hidden").mkdir()
+    tasks = tmp_path / "tasks.md"
+    tasks.write_text("- [ ] Task 1\n")
+    watcher = PollingWatcher(directory=str(tmp_path), interval=0.01)
+    assert watcher.poll(0) == set()
+
+    tasks.write_text("- [x] Task 1\n- [ ] Task 2\n")
+    (tmp_path / "sub" / "new.md").write_text("- [ ] Task 3\n")
+    (tmp_path / "notes.txt").write_text("ignored\n")
+    (tmp_path / ".hidden" / "skip.md").write_text("ignored\n")
+    assert watcher.poll(1) == {str(tasks), str(tmp_path / "sub" / "new.md")}
+
+    tasks.unlink()
+    assert watcher.poll(1) == {str(tasks)}
+    assert watcher.poll(0.05) == set()
+
+
+def test_create_watcher_falls_back_to_polling(tmp_path, monkeypatch):
+    def unavailable(self, *args, **kwargs):
+        raise OSError("inotify not supported")
+    monkeypatch.setattr(watch.InotifyWatcher, "__init__", unavailable)
+    tasks = tmp_path / "tasks.md"
+    tasks.write_text("- [ ] Task 1\n")
+    watcher = create_watcher(path=str(tasks), poll_interval=0.01)
+    assert isinstance(watcher, PollingWatcher) and watcher.interval == 0.01
+    tasks.write_text("- [x] Task 1\n")
+    assert watcher.wait(1, debounce=0.05) == {str(tasks)}
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from src.reports.writer import ReportWriter
+
+
+def leftovers(directory):
+    return [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+
+def test_report_appears_only_on_close(tmp_path):
+    report = tmp_path / "REPORT.md"
+    report.write_text("old\n")
+    with ReportWriter(str(report)) as writer:
+        writer.write_all(["# Report\n", "section\n"])
+        assert report.read_text() == "old\n"
+        assert len(leftovers(tmp_path)) == 1
+    assert report.read_text() == "# Report\nsection\n"
+    assert writer.changed and writer.chars == len("# Report\nsection\n")
+    assert leftovers(tmp_path) == []
+
+
+def test_failed_report_leaves_previous_one(tmp_path):
+    report = tmp_path / "REPORT.md"
+    report.write_text("old\n")
+    with pytest.raises(RuntimeError):
+        with ReportWriter(str(report)) as writer:
+            writer.write("# Half a rep")
+            raise RuntimeError("section failed")
+    assert report.read_text() == "old\n"
+    assert leftovers(tmp_path) == []
+
+
+def test_unchanged_report_is_not_rewritten(tmp_path):
+    report = tmp_path / "REPORT.md"
+    with ReportWriter(str(report)) as writer:
+        writer.write("# Report\n")
+    os.utime(report, ns=(1_000_000_000, 1_000_000_000))
+    inode = report.stat().st_ino
+
+    with ReportWriter(str(report)) as writer:
+        writer.write("# Report\n")
+    assert not writer.changed
+    assert report.stat().st_mtime_ns == 1_000_000_000 and report.stat().st_ino == inode
+    assert leftovers(tmp_path) == []
+
+    with ReportWriter(str(report)) as writer:
+        writer.write("# Report v2\n")
+    assert writer.changed and report.read_text() == "# Report v2\n"
+
+
+def test_replacing_keeps_the_file_mode(tmp_path):
+    report = tmp_path / "REPORT.md"
+    report.write_text("old\n")
+    report.chmod(0o640)
+    with ReportWriter(str(report)) as writer:
+        writer.write("new\n")
+    assert report.stat().st_mode & 0o777 == 0o640
+
+
+def test_stdout_writer(capsys):
+    with ReportWriter("-") as writer:
+        writer.write_all(["a", "b\n"])
+    assert writer.to_stdout and capsys.readouterr().out == "ab\n"